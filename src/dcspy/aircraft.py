@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Mapping, Sequence
 from itertools import cycle
 from logging import getLogger
 from pathlib import Path
@@ -16,10 +16,11 @@ except ImportError:
 
 from PIL import Image, ImageDraw, ImageFont
 
-from dcspy import default_yaml, load_yaml
-from dcspy.models import (DEFAULT_FONT_NAME, NO_OF_LCD_SCREENSHOTS, AircraftKwargs, AnyButton, ApacheAllDrawModesKwargs, ApacheEufdMode, BiosValue, LcdButton,
-                          LcdInfo, RequestModel, RequestType)
-from dcspy.utils import KeyRequest, replace_symbols, substitute_symbols
+from dcspy import default_yaml
+from dcspy.log import TRACE
+from dcspy.models import (DEFAULT_FONT_NAME, NO_OF_LCD_SCREENSHOTS, AircraftKwargs, AnyButton, ApacheAllDrawModesKwargs, ApacheEufdMode, BiosValue,
+                          ButtonCommand, CockpitStore, LcdButton, LcdInfo, RequestModel, RequestType, TraceEvent)
+from dcspy.utils import KeyRequest, replace_symbols, substitute_symbols, yaml_cache
 
 LOG = getLogger(__name__)
 
@@ -61,11 +62,28 @@ class BasicAircraft:
         :param lcd_type: LCD type
         """
         self.lcd = lcd_type
-        self.cfg = load_yaml(full_path=default_yaml)
-        self.bios_data: dict[str, BiosValue] = {}
+        self.cfg = yaml_cache.load(full_path=default_yaml)
+        self.bios_data = CockpitStore()
         if self.bios_name:
             self.key_req = KeyRequest(yaml_path=default_yaml.parent / f'{self.bios_name}.yaml', get_bios_fn=self.get_bios)
-            self.bios_data.update(self.key_req.cycle_button_ctrl_name)
+
+    @property
+    def bios_data(self) -> CockpitStore:
+        """
+        Get decoded DCS-BIOS values of aircraft.
+
+        :return: CockpitStore instance
+        """
+        return self._bios_data
+
+    @bios_data.setter
+    def bios_data(self, value: Mapping[str, BiosValue]) -> None:
+        """
+        Set decoded DCS-BIOS values of aircraft.
+
+        :param value: any mapping of selectors and values
+        """
+        self._bios_data = value if isinstance(value, CockpitStore) else CockpitStore(value)
 
     def button_request(self, button: AnyButton) -> RequestModel:
         """
@@ -79,6 +97,24 @@ class BasicAircraft:
         LOG.debug(f'Request: {request}')
         return request
 
+    def button_command(self, button: AnyButton) -> ButtonCommand:
+        """
+        Get precompiled DCS-BIOS request for pressed button for specific aircraft.
+
+        :param button: LcdButton, Gkey or MouseButton
+        :return: ButtonCommand object
+        """
+        return self.key_req.get_command(button)
+
+    def command_by_code(self, code: int) -> ButtonCommand:
+        """
+        Get precompiled DCS-BIOS request for integer key code of pressed G-Key or mouse button.
+
+        :param code: key code of Gkey or MouseButton
+        :return: ButtonCommand object
+        """
+        return self.key_req.get_command_by_code(code)
+
     def set_bios(self, selector: str, value: BiosValue) -> None:
         """
         Set value for DCS-BIOS selector.
@@ -87,7 +123,7 @@ class BasicAircraft:
         :param value:
         """
         self.bios_data[selector] = value
-        LOG.debug(f'{type(self).__name__} {selector} value: "{value}" ({type(value).__name__})')
+        TRACE.record(TraceEvent.SET_BIOS, selector, value)
 
     def get_bios(self, selector: str, default: BiosValue = '') -> BiosValue:
         """
@@ -96,10 +132,7 @@ class BasicAircraft:
         :param selector: A name of selector
         :param default: When fetch of value failed, this value will be returned
         """
-        try:
-            return type(default)(self.bios_data[selector])
-        except (KeyError, ValueError):
-            return default
+        return self._bios_data.read(selector=selector, default=default)
 
     def __repr__(self) -> str:
         return f'{super().__repr__()} with: {pformat(self.__dict__)}'
@@ -181,11 +214,14 @@ class FA18Chornet(AdvancedAircraft):
             'UFC_OPTION_CUEING_5': '',
             'IFEI_FUEL_DOWN': '',
             'IFEI_FUEL_UP': '',
-            'HUD_ATT_SW': int(),
-            'IFEI_DWN_BTN': int(),
-            'IFEI_UP_BTN': int(),
         }
         super().__init__(lcd_type=lcd_type, **kwargs)
+        read = self.bios_data.reader
+        self._scratchpad = [read(f'UFC_SCRATCHPAD_{field}_DISPLAY') for field in ('STRING_1', 'STRING_2', 'NUMBER')]
+        self._comm = [read(f'UFC_COMM{i}_DISPLAY') for i in (1, 2)]
+        self._options = [(read(f'UFC_OPTION_CUEING_{i}'), read(f'UFC_OPTION_DISPLAY_{i}')) for i in range(1, 6)]
+        self._fuel_up = read('IFEI_FUEL_UP')
+        self._fuel_down = read('IFEI_FUEL_DOWN')
 
     def _draw_common_data(self, draw: ImageDraw.ImageDraw, scale: int) -> ImageDraw.ImageDraw:
         """
@@ -195,26 +231,22 @@ class FA18Chornet(AdvancedAircraft):
         :param scale: scaling factor (Mono 1, Color 2)
         :return: updated image to draw
         """
-        scratch_1 = self.get_bios('UFC_SCRATCHPAD_STRING_1_DISPLAY')
-        scratch_2 = self.get_bios('UFC_SCRATCHPAD_STRING_2_DISPLAY')
-        scratch_num = self.get_bios('UFC_SCRATCHPAD_NUMBER_DISPLAY')
         draw.text(xy=(0, 0), fill=self.lcd.foreground, font=self.lcd.font_l,
-                  text=f'{scratch_1}{scratch_2}{scratch_num}')
+                  text=''.join(str(scratch()) for scratch in self._scratchpad))
         draw.line(xy=(0, 20 * scale, 115 * scale, 20 * scale), fill=self.lcd.foreground, width=1)
 
         draw.rectangle(xy=(0, 29 * scale, 20 * scale, 42 * scale), fill=self.lcd.background, outline=self.lcd.foreground)
-        draw.text(xy=(2 * scale, 29 * scale), text=str(self.get_bios('UFC_COMM1_DISPLAY')), fill=self.lcd.foreground, font=self.lcd.font_l)
+        draw.text(xy=(2 * scale, 29 * scale), text=str(self._comm[0]()), fill=self.lcd.foreground, font=self.lcd.font_l)
 
         offset = 44 * scale
         draw.rectangle(xy=(139 * scale - offset, 29 * scale, 159 * scale - offset, 42 * scale), fill=self.lcd.background, outline=self.lcd.foreground)
-        draw.text(xy=(140 * scale - offset, 29 * scale), text=str(self.get_bios('UFC_COMM2_DISPLAY')), fill=self.lcd.foreground, font=self.lcd.font_l)
+        draw.text(xy=(140 * scale - offset, 29 * scale), text=str(self._comm[1]()), fill=self.lcd.foreground, font=self.lcd.font_l)
 
-        for i in range(1, 6):
+        for i, (cueing, option) in enumerate(self._options, start=1):
             offset = (i - 1) * 8 * scale
-            draw.text(xy=(120 * scale, offset), fill=self.lcd.foreground, font=self.lcd.font_s,
-                      text=f'{i}{self.get_bios(f"UFC_OPTION_CUEING_{i}")}{self.get_bios(f"UFC_OPTION_DISPLAY_{i}")}')
+            draw.text(xy=(120 * scale, offset), fill=self.lcd.foreground, font=self.lcd.font_s, text=f'{i}{cueing()}{option()}')
 
-        draw.text(xy=(36 * scale, 29 * scale), text=str(self.get_bios('IFEI_FUEL_UP')), fill=self.lcd.foreground, font=self.lcd.font_l)
+        draw.text(xy=(36 * scale, 29 * scale), text=str(self._fuel_up()), fill=self.lcd.foreground, font=self.lcd.font_l)
         return draw
 
     def draw_for_lcd_mono(self, img: Image.Image) -> None:
@@ -224,7 +256,7 @@ class FA18Chornet(AdvancedAircraft):
     def draw_for_lcd_color(self, img: Image.Image) -> None:
         """Prepare image for F/A-18C Hornet for Color LCD."""
         draw = self._draw_common_data(draw=ImageDraw.Draw(img), scale=2)
-        draw.text(xy=(72, 100), text=str(self.get_bios('IFEI_FUEL_DOWN')), fill=self.lcd.foreground, font=self.lcd.font_l)
+        draw.text(xy=(72, 100), text=str(self._fuel_down()), fill=self.lcd.foreground, font=self.lcd.font_l)
 
     def set_bios(self, selector: str, value: BiosValue) -> None:
         """
@@ -303,7 +335,7 @@ class F16C50(AdvancedAircraft):
         """
         if 'DED_LINE_' in selector:
             value = str(value)
-            LOG.debug(f'{type(self).__name__} {selector} org  : "{value}"')
+            TRACE.record(TraceEvent.RAW_VALUE, selector, value)
             value = self._clean_and_replace(value)
         super().set_bios(selector, value)
 
@@ -684,7 +716,7 @@ class AH64DBLKII(AdvancedAircraft):
 
     def draw_for_lcd_mono(self, img: Image.Image) -> None:
         """Prepare image for AH-64D Apache for Mono LCD."""
-        LOG.debug(f'Mode: {self.mode}')
+        TRACE.record(TraceEvent.DRAW, 'mode', self.mode)
         kwargs: ApacheAllDrawModesKwargs = ApacheAllDrawModesKwargs(draw=ImageDraw.Draw(img), scale=1)
         if self.mode == ApacheEufdMode.PRE:
             kwargs['x_cords'] = [0] * 5 + [80] * 5
@@ -695,7 +727,7 @@ class AH64DBLKII(AdvancedAircraft):
 
     def draw_for_lcd_color(self, img: Image.Image) -> None:
         """Prepare image for AH-64D Apache for Color LCD."""
-        LOG.debug(f'Mode: {self.mode}')
+        TRACE.record(TraceEvent.DRAW, 'mode', self.mode)
         kwargs: ApacheAllDrawModesKwargs = ApacheAllDrawModesKwargs(draw=ImageDraw.Draw(img), scale=2)
         if self.mode == ApacheEufdMode.PRE:
             kwargs['x_cords'] = [0] * 10
@@ -726,7 +758,7 @@ class AH64DBLKII(AdvancedAircraft):
         :param scale: scaling factor (Mono 1, Color 2)
         """
         warnings = self._fetch_warning_list()
-        LOG.debug(f'Warnings: {warnings}')
+        TRACE.record(TraceEvent.DRAW, 'warnings', warnings)
         try:
             for idx, warn_no in enumerate(range(self.warning_line - 1, self.warning_line + 4)):
                 line = idx * 8 * scale
@@ -786,11 +818,11 @@ class AH64DBLKII(AdvancedAircraft):
             if search(r'.*\|.*\|(PRESET TUNE)\s\w+', str(value)):
                 self.mode = ApacheEufdMode.PRE
         if selector in ('PLT_EUFD_LINE8', 'PLT_EUFD_LINE9', 'PLT_EUFD_LINE10', 'PLT_EUFD_LINE11', 'PLT_EUFD_LINE12'):
-            LOG.debug(f'{type(self).__name__} {selector} original: "{value}"')
+            TRACE.record(TraceEvent.RAW_VALUE, selector, value)
             value = str(value).replace(']', '\u2666').replace('[', '\u25ca').replace('~', '\u25a0'). \
                 replace('>', '\u25b8').replace('<', '\u25c2').replace('=', '\u2219')
         if 'PLT_EUFD_LINE' in selector:
-            LOG.debug(f'{type(self).__name__} {selector} original: "{value}"')
+            TRACE.record(TraceEvent.RAW_VALUE, selector, value)
             value = str(value).replace('!', '\u2192')  # replace ! with ->
         super().set_bios(selector, value)
 
@@ -801,6 +833,25 @@ class AH64DBLKII(AdvancedAircraft):
         :param button: LcdButton, Gkey or MouseButton
         :return: RequestModel object
         """
+        self._switch_eufd_mode(button)
+        return super().button_request(button)
+
+    def button_command(self, button: AnyButton) -> ButtonCommand:
+        """
+        Get AH-64D Apache specific precompiled DCS-BIOS request for button pressed.
+
+        :param button: LcdButton, Gkey or MouseButton
+        :return: ButtonCommand object
+        """
+        self._switch_eufd_mode(button)
+        return super().button_command(button)
+
+    def _switch_eufd_mode(self, button: AnyButton) -> None:
+        """
+        Switch EUFD mode and update requests of WCA/IDM buttons.
+
+        :param button: LcdButton, Gkey or MouseButton
+        """
         wca_or_idm = f'PLT_EUFD_WCA {RequestType.CUSTOM.value} PLT_EUFD_WCA 0|PLT_EUFD_WCA 1|'
         if self.mode == ApacheEufdMode.IDM:
             wca_or_idm = f'PLT_EUFD_IDM {RequestType.CUSTOM.value} PLT_EUFD_IDM 0|PLT_EUFD_IDM 1|'
@@ -815,7 +866,6 @@ class AH64DBLKII(AdvancedAircraft):
 
         self.key_req.set_request(LcdButton.ONE, wca_or_idm)
         self.key_req.set_request(LcdButton.LEFT, wca_or_idm)
-        return super().button_request(button)
 
 
 class A10C(AdvancedAircraft):
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from enum import Enum, auto
 from functools import partial
 from struct import pack
+from time import perf_counter
+
+from dcspy.models import StreamStats
+
+BufferKey = tuple[str, tuple[tuple[str, int], ...]]
 
 
 class ParserState(Enum):
@@ -17,6 +22,69 @@ class ParserState(Enum):
     WAIT_FOR_SYNC = auto()
 
 
+class StreamCounters:
+    """Counters of DCS-BIOS stream health."""
+    def __init__(self) -> None:
+        """Initialize instance."""
+        self.datagrams = 0
+        self.bytes = 0
+        self.frames = 0
+        self.sync_losses = 0
+        self.malformed = 0
+        self.frame_interval = 0.0
+        self.jitter = 0.0
+        self._last_sync = 0.0
+        self._window_start = perf_counter()
+        self._window_counters = (0, 0, 0)
+
+    def add_datagram(self, size: int) -> None:
+        """
+        Count received datagram.
+
+        :param size: Size of datagram in bytes
+        """
+        self.datagrams += 1
+        self.bytes += size
+
+    def add_frame(self) -> None:
+        """
+        Count frame synchronization and update interval jitter.
+
+        Jitter is smoothed as in RFC 3550, with gain of 1/16.
+        """
+        now = perf_counter()
+        self.frames += 1
+        if self._last_sync:
+            interval = now - self._last_sync
+            if self.frame_interval:
+                self.jitter += (abs(interval - self.frame_interval) - self.jitter) / 16
+            self.frame_interval = interval
+        self._last_sync = now
+
+    def snapshot(self, new_window: bool = True) -> StreamStats:
+        """
+        Get current stream statistics.
+
+        Rates are calculated since previous snapshot which started a new window.
+
+        :param new_window: start a new window for rates, False only reads current values
+        :return: StreamStats model
+        """
+        now = perf_counter()
+        elapsed = max(now - self._window_start, 1e-9)
+        datagrams, size, frames = self._window_counters
+        stats = StreamStats(datagrams=self.datagrams, bytes=self.bytes, frames=self.frames, sync_losses=self.sync_losses, malformed=self.malformed,
+                            datagrams_per_sec=(self.datagrams - datagrams) / elapsed,
+                            bytes_per_sec=(self.bytes - size) / elapsed,
+                            frames_per_sec=(self.frames - frames) / elapsed,
+                            frame_interval_ms=self.frame_interval * 1000,
+                            jitter_ms=self.jitter * 1000)
+        if new_window:
+            self._window_start = now
+            self._window_counters = (self.datagrams, self.bytes, self.frames)
+        return stats
+
+
 class ProtocolParser:
     """DCS_BIOS protocol parser."""
     def __init__(self) -> None:
@@ -28,6 +96,35 @@ class ProtocolParser:
         self.data = 0
         self.write_callbacks: set[Callable[[int, int], None]] = set()
         self.frame_sync_callbacks: set[Callable] = set()
+        self.buffers: dict[BufferKey, StringBuffer | IntegerBuffer] = {}
+        self.integers = IntegerBatch(write_callbacks=self.write_callbacks)
+        self.stats = StreamCounters()
+
+    def subscribe(self, klass: str, callback: Callable, scope: SubscriptionScope | None = None, **args: int) -> Subscription:
+        """
+        Subscribe callback to shared buffer, which decodes DCS-BIOS output.
+
+        Every subscription owns its callback, so cancel of one never removes the same callback subscribed by other.
+
+        :param klass: buffer class name: StringBuffer or IntegerBuffer
+        :param callback: callback function
+        :param scope: add subscription to scope, to cancel it together with others
+        :param args: buffer arguments, i.e.: address, max_length or address, mask, shift_by
+        :return: handle of subscription
+        """
+        buffer = self.buffers.get(buffer_key(klass, **args))
+        if buffer and callback in buffer.callbacks:
+            callback = partial(callback)
+        key = shared_buffer(parser=self, klass=klass, callback=callback, **args)
+        return Subscription(parser=self, key=key, callback=callback, scope=scope)
+
+    def scope(self) -> SubscriptionScope:
+        """
+        Create scope for subscriptions cancelled together, i.e.: all buffers of one aircraft.
+
+        :return: empty scope
+        """
+        return SubscriptionScope(parser=self)
 
     def process_byte(self, int_byte: int) -> None:
         """
@@ -86,7 +183,11 @@ class ProtocolParser:
         :param int_byte: Data to process
         """
         self.count += 256 * int_byte
-        self.state = ParserState.DATA_LOW
+        if not self.count or self.count % 2 or self.address + self.count > 0x10000:
+            self.stats.malformed += 1
+            self.state = ParserState.WAIT_FOR_SYNC
+        else:
+            self.state = ParserState.DATA_LOW
 
     def _data_low(self, int_byte: int) -> None:
         """
@@ -117,6 +218,9 @@ class ProtocolParser:
     def _wait_for_sync(self) -> None:
         """Handle WAIT_FOR_SYNC state."""
         if self.sync_byte_count == 4:
+            if self.state != ParserState.WAIT_FOR_SYNC:
+                self.stats.sync_losses += 1
+            self.stats.add_frame()
             self.state = ParserState.ADDRESS_LOW
             self.sync_byte_count = 0
             for callback in self.frame_sync_callbacks:
@@ -140,7 +244,26 @@ class StringBuffer:
         self.buffer = bytearray(max_length)
         self.callbacks: set[Callable] = set()
         self.callbacks.add(callback)
-        parser.write_callbacks.add(partial(self.on_dcsbios_write))
+        self.write_callback = partial(self.on_dcsbios_write)
+        parser.write_callbacks.add(self.write_callback)
+
+    @property
+    def shadow(self) -> bytes:
+        """
+        Get the last received raw value.
+
+        :return: content of buffer
+        """
+        return bytes(self.buffer)
+
+    @shadow.setter
+    def shadow(self, value: bytes) -> None:
+        """
+        Set the last known raw value, only changes against it will trigger callbacks.
+
+        :param value: content of buffer
+        """
+        self.buffer[:] = value[:self.__length].ljust(self.__length, b'\x00')
 
     def set_char(self, index: int, char: int) -> None:
         """
@@ -191,7 +314,53 @@ class IntegerBuffer:
         self.__value = int()
         self.callbacks: set[Callable] = set()
         self.callbacks.add(callback)
-        parser.write_callbacks.add(partial(self.on_dcsbios_write))
+        self.write_callback = partial(self.on_dcsbios_write)
+        parser.write_callbacks.add(self.write_callback)
+
+    @property
+    def shadow(self) -> int:
+        """
+        Get the last received value.
+
+        :return: integer value
+        """
+        return self.__value
+
+    @shadow.setter
+    def shadow(self, value: int) -> None:
+        """
+        Set the last known value, only changes against it will trigger callbacks.
+
+        :param value: integer value
+        """
+        self.__value = value
+
+    @property
+    def address(self) -> int:
+        """
+        Get export address of buffer.
+
+        :return: address
+        """
+        return self.__address
+
+    def set_data(self, data: int) -> bool:
+        """
+        Extract value from 16-bit word.
+
+        :param data: word at address of buffer
+        :return: True if value was changed
+        """
+        value = (data & self.__mask) >> self.__shift_by
+        if self.__value != value:
+            self.__value = value
+            return True
+        return False
+
+    def emit(self) -> None:
+        """Call all callbacks with current value."""
+        for callback in self.callbacks:
+            callback(self.__value)
 
     def on_dcsbios_write(self, address: int, data: int) -> None:
         """
@@ -200,9 +369,225 @@ class IntegerBuffer:
         :param address:
         :param data:
         """
-        if address == self.__address:
-            value = (data & self.__mask) >> self.__shift_by
-            if self.__value != value:
-                self.__value = value
-                for callback in self.callbacks:
-                    callback(value)
+        if address == self.__address and self.set_data(data):
+            self.emit()
+
+
+class IntegerBatch:
+    """
+    Extract values of many integer buffers at once, at the end of frame.
+
+    Buffers are grouped by address, so every write costs only one dictionary lookup, no matter how many buffers are subscribed.
+    Last word of every address is kept during frame and at the end of frame (write to 0xfffe) values are extracted,
+    only changed buffers call their callbacks.
+    """
+    def __init__(self, write_callbacks: set[Callable[[int, int], None]]) -> None:
+        """
+        Initialize instance.
+
+        :param write_callbacks: write callbacks of parser, batch is registered only when it has any buffer
+        """
+        self._write_callbacks = write_callbacks
+        self._buffers: dict[int, tuple[IntegerBuffer, ...]] = {}
+        self._words: dict[int, int] = {}
+
+    def add(self, buffer: IntegerBuffer) -> None:
+        """
+        Extract buffer in batch instead of with its own write callback.
+
+        :param buffer: integer buffer
+        """
+        self._write_callbacks.discard(buffer.write_callback)
+        self._buffers[buffer.address] = (*self._buffers.get(buffer.address, ()), buffer)
+        self._write_callbacks.add(self.on_dcsbios_write)
+
+    def discard(self, buffer: IntegerBuffer) -> None:
+        """
+        Remove buffer from batch.
+
+        :param buffer: integer buffer
+        """
+        buffers = tuple(buff for buff in self._buffers.get(buffer.address, ()) if buff is not buffer)
+        if buffers:
+            self._buffers[buffer.address] = buffers
+        else:
+            self._buffers.pop(buffer.address, None)
+            self._words.pop(buffer.address, None)
+        if not self._buffers:
+            self._write_callbacks.discard(self.on_dcsbios_write)
+
+    def on_dcsbios_write(self, address: int, data: int) -> None:
+        """
+        Keep word written to subscribed address, extract all values at the end of frame.
+
+        :param address: export address
+        :param data: 16-bit word
+        """
+        if address in self._buffers:
+            self._words[address] = data
+        if address == 0xfffe:
+            self.flush()
+
+    def flush(self) -> list[IntegerBuffer]:
+        """
+        Extract values from all words received in frame and call callbacks of changed buffers.
+
+        :return: list of changed buffers
+        """
+        changed = [buffer for address, data in self._words.items() for buffer in self._buffers[address] if buffer.set_data(data)]
+        self._words.clear()
+        for buffer in changed:
+            buffer.emit()
+        return changed
+
+    def __len__(self) -> int:
+        return sum(len(buffers) for buffers in self._buffers.values())
+
+
+BUFFERS: dict[str, type[StringBuffer] | type[IntegerBuffer]] = {'StringBuffer': StringBuffer, 'IntegerBuffer': IntegerBuffer}
+
+
+def buffer_key(klass: str, **args: int) -> BufferKey:
+    """
+    Get key of shared buffer.
+
+    :param klass: buffer class name: StringBuffer or IntegerBuffer
+    :param args: buffer arguments
+    :return: key of shared buffer
+    """
+    return klass, tuple(sorted(args.items()))
+
+
+def shared_buffer(parser: ProtocolParser, klass: str, callback: Callable, **args: int) -> BufferKey:
+    """
+    Subscribe callback to buffer, which decodes DCS-BIOS output.
+
+    Buffer is created only for first subscriber, next ones with the same output reuse it,
+    so every output is decoded once, no matter how many devices use it.
+    Integer buffers are extracted in batch, at the end of frame.
+
+    :param parser: DCS-BIOS parser instance
+    :param klass: buffer class name: StringBuffer or IntegerBuffer
+    :param callback: callback function
+    :param args: buffer arguments, i.e.: address, max_length or address, mask, shift_by
+    :return: key of shared buffer
+    """
+    key = buffer_key(klass, **args)
+    if key in parser.buffers:
+        parser.buffers[key].callbacks.add(callback)
+    else:
+        buffer = BUFFERS[klass](parser=parser, callback=callback, **args)
+        parser.buffers[key] = buffer
+        if isinstance(buffer, IntegerBuffer):
+            parser.integers.add(buffer)
+    return key
+
+
+def release_buffer(parser: ProtocolParser, key: BufferKey, callback: Callable) -> None:
+    """
+    Unsubscribe callback from shared buffer.
+
+    Buffer is removed from parser when last callback is released.
+
+    :param parser: DCS-BIOS parser instance
+    :param key: key of shared buffer
+    :param callback: callback function
+    """
+    buffer = parser.buffers.get(key)
+    if buffer:
+        buffer.callbacks.discard(callback)
+        if not buffer.callbacks:
+            parser.write_callbacks.discard(buffer.write_callback)
+            if isinstance(buffer, IntegerBuffer):
+                parser.integers.discard(buffer)
+            del parser.buffers[key]
+
+
+class Subscription:
+    """Handle of callback subscribed to shared buffer."""
+    def __init__(self, parser: ProtocolParser, key: BufferKey, callback: Callable, scope: SubscriptionScope | None = None) -> None:
+        """
+        Initialize instance.
+
+        :param parser: DCS-BIOS parser instance
+        :param key: key of shared buffer
+        :param callback: callback function
+        :param scope: scope which contains subscription
+        """
+        self.parser = parser
+        self.key = key
+        self.callback = callback
+        self.active = True
+        self._scope = scope
+        if scope is not None:
+            scope.add(self)
+
+    @property
+    def buffer(self) -> StringBuffer | IntegerBuffer | None:
+        """
+        Get shared buffer of subscription.
+
+        :return: buffer or None when subscription is cancelled
+        """
+        return self.parser.buffers.get(self.key) if self.active else None
+
+    def cancel(self) -> None:
+        """Unsubscribe callback, buffer is removed when it has no more callbacks. Cancel of cancelled subscription does nothing."""
+        if self.active:
+            self.active = False
+            release_buffer(parser=self.parser, key=self.key, callback=self.callback)
+            if self._scope is not None:
+                self._scope.discard(self)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(key={self.key}, active={self.active})'
+
+
+class SubscriptionScope:
+    """Group of subscriptions cancelled together, cancel of one subscription or whole scope is proportional to its size."""
+    def __init__(self, parser: ProtocolParser) -> None:
+        """
+        Initialize instance.
+
+        :param parser: DCS-BIOS parser instance
+        """
+        self.parser = parser
+        self._subscriptions: dict[Subscription, None] = {}
+
+    def subscribe(self, klass: str, callback: Callable, **args: int) -> Subscription:
+        """
+        Subscribe callback to shared buffer within scope.
+
+        :param klass: buffer class name: StringBuffer or IntegerBuffer
+        :param callback: callback function
+        :param args: buffer arguments, i.e.: address, max_length or address, mask, shift_by
+        :return: handle of subscription
+        """
+        return self.parser.subscribe(klass=klass, callback=callback, scope=self, **args)
+
+    def add(self, subscription: Subscription) -> None:
+        """
+        Add subscription to scope.
+
+        :param subscription: handle of subscription
+        """
+        self._subscriptions[subscription] = None
+
+    def discard(self, subscription: Subscription) -> None:
+        """
+        Remove subscription from scope, without cancelling it.
+
+        :param subscription: handle of subscription
+        """
+        self._subscriptions.pop(subscription, None)
+
+    def cancel(self) -> None:
+        """Cancel all subscriptions of scope."""
+        for subscription in list(self._subscriptions):
+            subscription.cancel()
+
+    def __iter__(self) -> Iterator[Subscription]:
+        return iter(list(self._subscriptions))
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
@@ -1,20 +1,231 @@
+import atexit
+from collections import deque
 from datetime import datetime
-from logging import DEBUG, INFO, Formatter, Logger, StreamHandler
-from logging.handlers import RotatingFileHandler
+from logging import DEBUG, INFO, WARNING, Formatter, Handler, Logger, LogRecord, StreamHandler, getLogger, makeLogRecord
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from queue import Full, Queue
 from tempfile import gettempdir
+from threading import Lock
+from time import perf_counter_ns
+from typing import Any
 
-from dcspy.models import LOG_FULL_FMT, LOG_SHORT_FMT
+from dcspy.models import LOG_FULL_FMT, LOG_QUEUE_SIZE, LOG_SHORT_FMT, TRACE_BUFFER_SIZE, TraceEvent
+
+LOG = getLogger(__name__)
+
+
+class Tracer:
+    """
+    Record events of hot paths as compact tuples in fixed-size ring buffer.
+
+    Events are formatted only when dumped or when verbose mode is on.
+    Selectors are interned under lock, because events are recorded from several threads.
+    """
+
+    def __init__(self, size: int = TRACE_BUFFER_SIZE) -> None:
+        """
+        Create tracer.
+
+        :param size: maximal number of kept events
+        """
+        self.verbose = False
+        self._ring: deque[tuple[int, TraceEvent, int, Any]] = deque(maxlen=size)
+        self._selectors: dict[str, int] = {}
+        self._lock = Lock()
+
+    def record(self, event: TraceEvent, selector: str = '', value: Any = None) -> None:
+        """
+        Record event with timestamp, interned selector and raw value.
+
+        :param event: type of event
+        :param selector: A name of selector or other source of event
+        :param value: raw value, formatted only when needed
+        """
+        selector_id = self._selectors.get(selector)
+        if selector_id is None:
+            with self._lock:
+                selector_id = self._selectors.setdefault(selector, len(self._selectors))
+        self._ring.append((perf_counter_ns(), event, selector_id, value))
+        if self.verbose:
+            LOG.debug('%s %s: %r', event.name, selector, value, stacklevel=2)
+
+    def dump(self) -> list[str]:
+        """
+        Format recorded events, oldest first, time is relative to the latest event.
+
+        :return: list of formatted events
+        """
+        events = list(self._ring)
+        if not events:
+            return []
+        with self._lock:
+            names = {selector_id: selector for selector, selector_id in self._selectors.items()}
+        latest = events[-1][0]
+        return [f'{(timestamp - latest) / 1e6:>10.3f} ms {event.name} {names[selector_id]}: {value!r}' for timestamp, event, selector_id, value in events]
+
+    def clear(self) -> None:
+        """Remove all recorded events."""
+        self._ring.clear()
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+
+TRACE = Tracer()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Put log records to bounded queue without blocking of caller thread.
+
+    When queue is full, record is dropped and counted, number of dropped records is logged as soon as queue has room again.
+    """
+
+    def __init__(self, queue: Queue) -> None:
+        """
+        Create handler.
+
+        :param queue: bounded queue shared with listener
+        """
+        super().__init__(queue)
+        self.listener: QueueListener | None = None
+        self.dropped = 0
+        self._unreported = 0
+
+    def enqueue(self, record: LogRecord) -> None:
+        """
+        Put record to queue or drop it, when queue is full.
+
+        :param record: log record
+        """
+        try:
+            if self._unreported:
+                self.queue.put_nowait(self._dropped_record())
+                self._unreported = 0
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+            self._unreported += 1
+
+    def stop(self) -> None:
+        """Stop listener when all queued records are processed, number of dropped records not reported yet is passed directly to handlers."""
+        if self.listener:
+            self.listener.stop()
+            if self._unreported:
+                self.listener.handle(self._dropped_record())
+                self._unreported = 0
+
+    def _dropped_record(self) -> LogRecord:
+        """
+        Prepare record with number of dropped records.
+
+        :return: log record
+        """
+        return makeLogRecord({'name': LOG.name, 'levelno': WARNING, 'levelname': 'WARNING', 'threadName': 'dcspy-log',
+                              'msg': f'Log queue full, {self._unreported} records dropped (total: {self.dropped})'})
+
+
+class LogListener(QueueListener):
+    """Pass records from queue to handlers in listener thread, stop waits until queue has room for sentinel."""
+
+    def __init__(self, queue: Queue, *handlers: Handler, respect_handler_level: bool = False) -> None:
+        """
+        Create listener.
+
+        :param queue: bounded queue with records
+        :param handlers: handlers which write records
+        :param respect_handler_level: pass record only to handlers with lower or equal level
+        """
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.records: Queue = queue
+
+    def enqueue_sentinel(self) -> None:
+        """Put sentinel to queue, blocks when queue is full."""
+        self.records.put(QueueListener._sentinel)  # type: ignore[attr-defined]
+
+    def stop(self) -> None:
+        """Process all queued records and stop listener thread, when it is running."""
+        if self._thread:
+            super().stop()
+
+    def add_handler(self, handler: Handler) -> None:
+        """
+        Add handler to running listener.
+
+        :param handler: log handler called from listener thread
+        """
+        if handler not in self.handlers:
+            self.handlers = (*self.handlers, handler)
+
+    def remove_handler(self, handler: Handler) -> None:
+        """
+        Remove handler from running listener.
+
+        :param handler: log handler
+        """
+        self.handlers = tuple(hand for hand in self.handlers if hand is not handler)
+
+
+def add_log_handler(logger: Logger, handler: Handler) -> None:
+    """
+    Add handler behind queue of logger, handler is added directly when logger has no queue.
+
+    :param logger: Logger instance
+    :param handler: log handler
+    """
+    listener = _get_listener(logger=logger)
+    if listener:
+        listener.add_handler(handler)
+    else:
+        logger.addHandler(handler)
+
+
+def remove_log_handler(logger: Logger, handler: Handler) -> None:
+    """
+    Remove handler added with add_log_handler.
+
+    :param logger: Logger instance
+    :param handler: log handler
+    """
+    listener = _get_listener(logger=logger)
+    if listener:
+        listener.remove_handler(handler)
+    logger.removeHandler(handler)
+
+
+def stop_logger(logger: Logger) -> None:
+    """
+    Stop queue listener of logger and flush queued records to handlers.
+
+    :param logger: Logger instance
+    """
+    for handler in logger.handlers:
+        if isinstance(handler, DroppingQueueHandler):
+            handler.stop()
+
+
+def _get_listener(logger: Logger) -> LogListener | None:
+    """
+    Get queue listener of logger.
+
+    :param logger: Logger instance
+    :return: LogListener instance or None when logger has no queue
+    """
+    return next((hand.listener for hand in logger.handlers if isinstance(hand, DroppingQueueHandler) and isinstance(hand.listener, LogListener)), None)
 
 
 def config_logger(logger: Logger, verbose: bool = False) -> None:
     """
     Configure global logger add handlers and set formatters.
 
+    Handlers are called from listener thread, logging threads only put records to bounded queue.
+
     :param logger: Logger instance
     :param verbose: Turn on/off verbose mode
     """
     logger.setLevel(DEBUG)
+    TRACE.verbose = verbose
     file_hand = RotatingFileHandler(filename=Path(gettempdir()) / 'dcspy.log', mode='a', encoding='utf-8', maxBytes=5 * 1024 * 1024, backupCount=1)
     file_hand.setFormatter(Formatter(fmt=LOG_FULL_FMT))
     file_hand.setLevel(INFO)
@@ -24,8 +235,13 @@ def config_logger(logger: Logger, verbose: bool = False) -> None:
         file_hand.setLevel(DEBUG)
         stream_hand.setLevel(DEBUG)
     stream_hand.setFormatter(Formatter(fmt=LOG_SHORT_FMT))
-    logger.addHandler(stream_hand)
-    logger.addHandler(file_hand)
+    records: Queue = Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_hand = DroppingQueueHandler(queue=records)
+    queue_hand.setLevel(DEBUG if verbose else INFO)
+    queue_hand.listener = LogListener(records, stream_hand, file_hand, respect_handler_level=True)
+    queue_hand.listener.start()
+    atexit.register(queue_hand.stop)
+    logger.addHandler(queue_hand)
     header = '#' * 60
     logger.debug(f'\n{header}\nStart session: {datetime.now()}\n{header}')
     logger.info(f'Log file store at: {file_hand.baseFilename}')
@@ -5,16 +5,19 @@ from logging import getLogger
 from pathlib import Path
 from pprint import pformat
 from socket import socket
-from time import sleep
+from threading import RLock
+from time import monotonic, sleep
 
 from PIL import Image, ImageDraw
 
 from dcspy import dcsbios, get_config_yaml_item
-from dcspy.aircraft import BasicAircraft, MetaAircraft
-from dcspy.models import (KEY_DOWN, SEND_ADDR, SUPPORTED_CRAFTS, TIME_BETWEEN_REQUESTS, AnyButton, Color, Gkey, LcdButton, LcdType, LogitechDeviceModel,
-                          MouseButton)
+from dcspy.aircraft import AdvancedAircraft, BasicAircraft, MetaAircraft
+from dcspy.log import TRACE
+from dcspy.macro import MacroScheduler
+from dcspy.models import (KEY_DOWN, SEND_ADDR, SUPPORTED_CRAFTS, TIME_BETWEEN_REQUESTS, ButtonCommand, CockpitState, Color, Gkey, LcdButton, LcdType,
+                          LazyDcsBiosPlaneData, LogitechDeviceModel, MouseButton, PlaneSwitchStats, TraceEvent)
 from dcspy.sdk import key_sdk, lcd_sdk
-from dcspy.utils import get_full_bios_for_plane, get_planes_list, rgba
+from dcspy.utils import get_lazy_bios_for_plane, get_planes_list, rgba, timed
 
 LOG = getLogger(__name__)
 
@@ -22,27 +25,43 @@ LOG = getLogger(__name__)
 class LogitechDevice:
     """General Logitech device."""
 
-    def __init__(self, parser: dcsbios.ProtocolParser, sock: socket, model: LogitechDeviceModel) -> None:
+    def __init__(self, parser: dcsbios.ProtocolParser, sock: socket, model: LogitechDeviceModel, gkeys: bool = True) -> None:
         """
         General Logitech device.
 
+        Many devices can share one parser, but only one of them should handle G-Keys,
+        because G-Key SDK reports events from all connected devices.
+        Lock has to be held during plane switch, processing of DCS-BIOS data and handling of keys,
+        because keys are handled in other threads than DCS-BIOS data.
+
         :param parser: DCS-BIOS parser instance
         :param sock: multicast UDP socket
         :param model: device model
+        :param gkeys: initialize G-Key SDK and handle G-Keys and mouse buttons
         """
-        dcsbios.StringBuffer(parser=parser, address=0x0, max_length=0x10, callback=partial(self.detecting_plane))
         self.parser = parser
+        self.detection = parser.subscribe(klass='StringBuffer', callback=partial(self.detecting_plane), address=0x0, max_length=0x10)
+        self._plane_scope = parser.scope()
+        self._plane_states: dict[str, CockpitState] = {}
+        self._switch_phases: dict[str, float] = {}
+        self.switch_stats = PlaneSwitchStats()
         self.socket = sock
+        self.lock = RLock()
+        self.macros = MacroScheduler(send=self._send_payload)
         self.plane_name = ''
         self.bios_name = ''
         self.plane_detected = False
         self.lcd_button_pressed = False
+        self.lcd_button_debounce = int(get_config_yaml_item('lcd_buttons_debounce', 50)) / 1000
+        self._lcd_button_time = 0.0
         self._text: list[tuple[str, Color]] = []
         self.model = model
         self.lcd_sdk = lcd_sdk.LcdSdkManager(name='DCS World', lcd_type=self.model.lcd_info.type)
-        self.key_sdk = key_sdk.GkeySdkManager(self.gkey_callback_handler)
-        success = self.key_sdk.logi_gkey_init()
-        LOG.debug(f'G-Key is connected: {success}')
+        self.key_sdk: key_sdk.GkeySdkManager | None = None
+        if gkeys:
+            self.key_sdk = key_sdk.GkeySdkManager(self.gkey_callback_handler)
+            success = self.key_sdk.logi_gkey_init()
+            LOG.debug(f'G-Key is connected: {success}')
         self.plane = BasicAircraft(self.model.lcd_info)
 
     @property
@@ -111,41 +130,90 @@ class LogitechDevice:
                 self.text = [('     DCSpy       ', Color.orange), ('Detected aircraft:', Color.white), (value, Color.green), ('Not supported yet!', Color.red)]
 
     def unload_old_plane(self) -> None:
-        """Unloads the previous plane by remove all callbacks and keep only one."""
+        """Unloads the previous plane by remove its callbacks, callbacks of other devices sharing parser are kept."""
         LOG.debug(f'Unload start: {self.plane_name} Number of callbacks: {len(self.parser.write_callbacks)}')
-        for partial_obj in self.parser.write_callbacks:
-            for callback in partial_obj.func.__self__.callbacks:  # type: ignore[attr-defined]
-                if callback.func.__name__ == 'detecting_plane':
-                    self.parser.write_callbacks = {partial_obj}
-            if len(self.parser.write_callbacks) == 1:
-                break
+        self._switch_phases = {}
+        with timed(self._switch_phases, 'unload'):
+            if self._plane_scope:
+                self._plane_states[type(self.plane).__name__] = CockpitState(bios_data=dict(self.plane.bios_data),
+                                                                             shadows={sub.key: sub.buffer.shadow for sub in self._plane_scope if sub.buffer},
+                                                                             cycles=dict(self.plane.key_req.cycles.values))
+            self._plane_scope.cancel()
 
     def load_new_plane(self) -> None:
         """
         Dynamic load of new detected aircraft.
 
         Set up callbacks for detected plane inside DCS-BIOS parser.
+        Duration of every phase of switch is available in `switch_stats`.
         """
         self.plane_detected = False
         if self.plane_name in SUPPORTED_CRAFTS:
-            self.clear(true_clear=True)
-            lcd_update_func = self.lcd_sdk.update_display if self.model.lcd_info.type != LcdType.NONE else None
-            self.plane = getattr(import_module('dcspy.aircraft'), self.plane_name)(self.model.lcd_info, update_display=lcd_update_func)
+            with timed(self._switch_phases, 'clear'):
+                self.clear(true_clear=True)
+            with timed(self._switch_phases, 'create'):
+                lcd_update_func = self.lcd_sdk.update_display if self.model.lcd_info.type != LcdType.NONE else None
+                self.plane = getattr(import_module('dcspy.aircraft'), self.plane_name)(self.model.lcd_info, update_display=lcd_update_func)
             LOG.debug(f'Dynamic load of: {self.plane_name} as AdvancedAircraft | BIOS: {self.plane.bios_name}')
             self._setup_plane_callback()
+            with timed(self._switch_phases, 'restore'):
+                self._restore_plane_state()
         else:
-            self.plane = MetaAircraft(self.plane_name, (BasicAircraft,), {})(self.model.lcd_info)
-            self.plane.bios_name = self.bios_name
+            with timed(self._switch_phases, 'create'):
+                self.plane = MetaAircraft(self.plane_name, (BasicAircraft,), {})(self.model.lcd_info)
+                self.plane.bios_name = self.bios_name
             LOG.debug(f'Dynamic load of: {self.plane_name} as BasicAircraft | BIOS: {self.plane.bios_name}')
-        LOG.debug(f'{repr(self)}')
+        self.switch_stats = PlaneSwitchStats(plane=self.plane_name, phases=self._switch_phases)
+        self._switch_phases = {}
+        LOG.info(f'Aircraft switch: {self.switch_stats}')
+        LOG.debug('%r', self)
 
     def _setup_plane_callback(self) -> None:
         """Set ups DCS-BIOS parser callbacks for detected plane."""
-        plane_bios = get_full_bios_for_plane(plane=SUPPORTED_CRAFTS[self.plane_name]['bios'], bios_dir=Path(get_config_yaml_item('dcsbios')))
-        for ctrl_name in self.plane.bios_data:
+        with timed(self._switch_phases, 'bios'):
+            plane_bios = get_lazy_bios_for_plane(plane=SUPPORTED_CRAFTS[self.plane_name]['bios'], bios_dir=Path(get_config_yaml_item('dcsbios')))
+        with timed(self._switch_phases, 'subscribe'):
+            for ctrl_name in self.plane.bios_data:
+                ctrl = plane_bios.get_ctrl(ctrl_name=ctrl_name)
+                self._plane_scope.subscribe(klass=ctrl.output.klass, callback=partial(self.plane.set_bios, ctrl_name), **ctrl.output.args.model_dump())
+            self._setup_cycle_callback(plane_bios=plane_bios)
+
+    def _setup_cycle_callback(self, plane_bios: LazyDcsBiosPlaneData) -> None:
+        """
+        Set ups DCS-BIOS parser callbacks for controls of cycle buttons.
+
+        Live values only synchronize iterators of cycle buttons, they are not stored in BIOS data of plane.
+
+        :param plane_bios: DCS-BIOS data of plane
+        """
+        cycles = self.plane.key_req.cycles
+        for ctrl_name in cycles.ctrl_names:
             ctrl = plane_bios.get_ctrl(ctrl_name=ctrl_name)
-            dcsbios_buffer = getattr(dcsbios, ctrl.output.klass)
-            dcsbios_buffer(parser=self.parser, callback=partial(self.plane.set_bios, ctrl_name), **ctrl.output.args.model_dump())
+            if ctrl.outputs and ctrl.output.klass == 'IntegerBuffer':
+                self._plane_scope.subscribe(klass=ctrl.output.klass, callback=partial(cycles.update, ctrl_name), **ctrl.output.args.model_dump())
+
+    def _restore_plane_state(self) -> None:
+        """
+        Restore the last known cockpit state, when the same plane reappears.
+
+        Values of buffers are restored as well, so only changes in incoming data update the LCD.
+        """
+        state = self._plane_states.get(self.plane_name)
+        if state:
+            LOG.debug(f'Restore cockpit state of: {self.plane_name}')
+            self.plane.bios_data.update(state.bios_data)
+            for ctrl_name, value in state.cycles.items():
+                self.plane.key_req.cycles.update(ctrl_name=ctrl_name, value=value)
+            for key, shadow in state.shadows.items():
+                if key in self.parser.buffers:
+                    self.parser.buffers[key].shadow = shadow
+            self.restore_display()
+
+    def restore_display(self) -> None:
+        """Clear LCD and show at once the last known screen of the current plane, without waiting for DCS-BIOS data."""
+        self.clear(true_clear=True)
+        if isinstance(self.plane, AdvancedAircraft) and callable(self.plane.update_display):
+            self.plane.update_display(self.plane.prepare_image())
 
     def gkey_callback_handler(self, key_idx: int, mode: int, key_down: int, mouse: int) -> None:
         """
@@ -159,11 +227,11 @@ class LogitechDevice:
         :param mouse: Indicate if the Event comes from a mouse, one (1) is yes, zro (0) is no
 
         """
-        key = Gkey(key=key_idx, mode=mode)
-        if mouse:
-            key = MouseButton(button=key_idx)  # type: ignore[assignment]
-        LOG.debug(f'Button {key} is pressed, key down: {key_down}')
-        self._send_request(button=key, key_down=key_down)
+        code = MouseButton.code_of(button=key_idx) if mouse else Gkey.code_of(key=key_idx, mode=mode)
+        TRACE.record(TraceEvent.KEY_EVENT, 'mouse' if mouse else 'gkey', (key_idx, mode, key_down))
+        with self.lock:
+            command = self.plane.command_by_code(code)
+        self._send_request(command=command, key_down=key_down, code=code)
 
     def check_buttons(self) -> LcdButton:
         """
@@ -185,26 +253,43 @@ class LogitechDevice:
         Button handler.
 
         * Detect if a button was pressed
+        * Ignore presses during debounce time after previous one
         * Sent action to DCS-BIOS via network socket
         """
         if self.model.lcd_info.type != LcdType.NONE:
             button = self.check_buttons()
-            if button.value:
-                self._send_request(button=button, key_down=KEY_DOWN)
+            if button.value and monotonic() - self._lcd_button_time >= self.lcd_button_debounce:
+                self._lcd_button_time = monotonic()
+                with self.lock:
+                    command = self.plane.button_command(button)
+                self._send_request(command=command, key_down=KEY_DOWN, code=button.code)
 
-    def _send_request(self, button: AnyButton, key_down: int) -> None:
+    def _send_request(self, command: ButtonCommand, key_down: int, code: int) -> None:
         """
         Sent action to DCS-BIOS via network socket.
 
-        :param button: LcdButton, Gkey or MouseButton
+        Custom requests are run by macro scheduler, so key handler is not blocked between steps.
+
+        :param command: precompiled request of button
         :param key_down: One (1) indicate when G-Key was pushed down and zero (0) when G-Key is up
+        :param code: integer key code of button
         """
-        req_model = self.plane.button_request(button)
-        for request in req_model.bytes_requests(key_down=key_down):
-            LOG.debug(f'{button=}: {request=}')
-            self.socket.sendto(request, SEND_ADDR)
+        if command.macro is not None:
+            self.macros.trigger(key=code, macro=command.macro, key_down=key_down)
+            return
+        for request in command.requests(key_down=key_down):
+            self._send_payload(request)
             sleep(TIME_BETWEEN_REQUESTS)
 
+    def _send_payload(self, request: bytes) -> None:
+        """
+        Sent single request to DCS-BIOS.
+
+        :param request: request as bytes
+        """
+        TRACE.record(TraceEvent.SEND_REQUEST, 'socket', request)
+        self.socket.sendto(request, SEND_ADDR)
+
     def clear(self, true_clear: bool = False) -> None:
         """
         Clear LCD.
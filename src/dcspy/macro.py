@@ -0,0 +1,204 @@
+from collections.abc import Callable, Hashable, Sequence
+from logging import getLogger
+from math import ceil
+from threading import Condition, Thread
+from time import monotonic
+
+from dcspy.models import KEY_DOWN, MACRO_TICK, MACRO_WHEEL_SLOTS, TIME_BETWEEN_REQUESTS, Macro, MacroStep
+
+LOG = getLogger(__name__)
+
+
+class MacroRun:
+    """Steps of running macro, only one step of macro is scheduled at once."""
+
+    def __init__(self, key: Hashable, steps: Sequence[MacroStep], start: float) -> None:
+        """
+        Create running macro.
+
+        :param key: key which started macro
+        :param steps: steps to send
+        :param start: monotonic time of start
+        """
+        self.key = key
+        self.steps = list(steps)
+        self.index = 0
+        self.deadline = start + self.steps[0].delay
+        self.cancelled = False
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(key={self.key!r}, step={self.index}/{len(self.steps)}, cancelled={self.cancelled})'
+
+
+class MacroScheduler(Thread):
+    """
+    Run macros of many keys at once in one thread.
+
+    Steps are scheduled with hashed timer wheel driven by monotonic clock.
+    Thread is started with the first macro and sleeps, when no macro is running.
+    """
+
+    def __init__(self, send: Callable[[bytes], None], tick: float = MACRO_TICK, slots: int = MACRO_WHEEL_SLOTS) -> None:
+        """
+        Create scheduler thread.
+
+        :param send: called with request of every step, from scheduler thread
+        :param tick: resolution of timer wheel in seconds
+        :param slots: number of slots of timer wheel
+        """
+        super().__init__(name='dcspy-macros', daemon=True)
+        self.send = send
+        self.tick = tick
+        self._wheel: list[list[tuple[int, MacroRun]]] = [[] for _ in range(slots)]
+        self._runs: dict[Hashable, MacroRun] = {}
+        self._pending = 0
+        self._origin = monotonic()
+        self._current = 0
+        self._cond = Condition()
+        self._stopped = False
+
+    @property
+    def running(self) -> list[Hashable]:
+        """
+        Get keys of running macros.
+
+        :return: list of keys
+        """
+        with self._cond:
+            return list(self._runs)
+
+    def trigger(self, key: Hashable, macro: Macro, key_down: int) -> None:
+        """
+        Handle key event for macro.
+
+        :param key: key of macro, i.e. key code
+        :param macro: Macro instance
+        :param key_down: One (1) indicate when key was pushed down and zero (0) when key is up
+        """
+        if key_down == KEY_DOWN:
+            self.press(key=key, steps=macro.press)
+        else:
+            self.release(key=key, steps=macro.release)
+
+    def press(self, key: Hashable, steps: Sequence[MacroStep]) -> bool:
+        """
+        Start macro of key, when macro of key is still running it is cancelled instead.
+
+        :param key: key of macro
+        :param steps: steps to send
+        :return: True if macro was started, False if it was cancelled
+        """
+        with self._cond:
+            run = self._runs.pop(key, None)
+            if run:
+                run.cancelled = True
+                LOG.debug(f'Macro cancelled: {run}')
+                return False
+            self._start(key=key, steps=steps)
+        return True
+
+    def release(self, key: Hashable, steps: Sequence[MacroStep]) -> None:
+        """
+        Send steps for released key after running macro of key or as new macro.
+
+        :param key: key of macro
+        :param steps: steps to send
+        """
+        if not steps:
+            return
+        with self._cond:
+            run = self._runs.get(key)
+            if run:
+                first, *rest = steps
+                run.steps.extend([first.model_copy(update={'delay': max(first.delay, TIME_BETWEEN_REQUESTS)}), *rest])
+            else:
+                self._start(key=key, steps=steps)
+
+    def stop(self) -> None:
+        """Stop scheduler, steps which are not sent yet are dropped."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def run(self) -> None:
+        """Send due steps of macros on every tick, until stopped."""
+        while self._wait_for_tick():
+            with self._cond:
+                requests = self._advance(now=monotonic())
+            for request in requests:
+                self.send(request)
+
+    def _start(self, key: Hashable, steps: Sequence[MacroStep]) -> None:
+        """
+        Schedule the first step of new macro, lock has to be acquired.
+
+        :param key: key of macro
+        :param steps: steps to send
+        """
+        if not steps or self._stopped:
+            return
+        now = monotonic()
+        if not self._pending:
+            self._current = int((now - self._origin) / self.tick)
+        run = MacroRun(key=key, steps=steps, start=now)
+        self._runs[key] = run
+        self._schedule(run=run)
+        if not self.is_alive():
+            self.start()
+
+    def _schedule(self, run: MacroRun) -> None:
+        """
+        Put the next step of macro to slot of timer wheel, lock has to be acquired.
+
+        :param run: running macro
+        """
+        index = max(self._current + 1, ceil((run.deadline - self._origin) / self.tick))
+        self._wheel[index % len(self._wheel)].append((index, run))
+        self._pending += 1
+        self._cond.notify()
+
+    def _wait_for_tick(self) -> bool:
+        """
+        Wait for the next tick, or for the first macro when none is running.
+
+        :return: False when scheduler was stopped
+        """
+        with self._cond:
+            while not self._pending and not self._stopped:
+                self._cond.wait()
+            if not self._stopped:
+                self._cond.wait(timeout=max(0.0, self._origin + (self._current + 1) * self.tick - monotonic()))
+            return not self._stopped
+
+    def _advance(self, now: float) -> list[bytes]:
+        """
+        Move timer wheel to current time and collect requests of due steps, lock has to be acquired.
+
+        :param now: monotonic time
+        :return: list of requests to send
+        """
+        requests: list[bytes] = []
+        while self._pending and self._origin + (self._current + 1) * self.tick <= now:
+            self._current += 1
+            slot = self._wheel[self._current % len(self._wheel)]
+            due = [run for index, run in slot if index <= self._current]
+            slot[:] = [(index, run) for index, run in slot if index > self._current]
+            self._pending -= len(due)
+            requests.extend(self._fire(run=run) for run in due if not run.cancelled)
+        return requests
+
+    def _fire(self, run: MacroRun) -> bytes:
+        """
+        Take due step of macro and schedule the next one, lock has to be acquired.
+
+        :param run: running macro
+        :return: request of step
+        """
+        step = run.steps[run.index]
+        run.index += 1
+        if run.index < len(run.steps):
+            run.deadline = max(run.deadline, self._origin + self._current * self.tick) + run.steps[run.index].delay
+            self._schedule(run=run)
+        elif self._runs.get(run.key) is run:
+            del self._runs[run.key]
+        return step.request
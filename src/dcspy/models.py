@@ -1,17 +1,20 @@
 from __future__ import annotations
 
+import json
 from _ctypes import sizeof
-from collections.abc import Callable, Iterator, Mapping, Sequence
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator, Mapping, MutableMapping, Sequence
 from ctypes import c_void_p
 from datetime import datetime
 from enum import Enum, IntEnum
-from functools import partial
+from functools import cached_property, partial
 from os import environ
 from pathlib import Path
 from platform import architecture
-from re import search
+from re import fullmatch, search
 from sys import maxsize
 from tempfile import gettempdir
+from types import MappingProxyType
 from typing import Any, Final, TypedDict, TypeVar, Union
 
 from packaging import version
@@ -25,10 +28,18 @@ SEND_ADDR: Final = ('127.0.0.1', 7778)
 UDP_PORT: Final = 5010
 RECV_ADDR: Final = ('', UDP_PORT)
 MULTICAST_IP: Final = '239.255.50.10'
+STREAM_STATS_INTERVAL: Final = 60
 
 # G Key
 LOGITECH_MAX_GKEYS: Final = 30
 LOGITECH_MAX_M_STATES: Final = 4
+LOGITECH_MAX_MOUSE_BUTTONS: Final = 20
+
+# Key codes: G-Keys in all modes, then mouse buttons, then LCD buttons
+MOUSE_CODE_BASE: Final = LOGITECH_MAX_GKEYS * LOGITECH_MAX_M_STATES
+LCD_CODE_BASE: Final = MOUSE_CODE_BASE + LOGITECH_MAX_MOUSE_BUTTONS + 1
+KEY_CODES: Final = LCD_CODE_BASE + 16
+NO_KEY_CODE: Final = -1
 
 # Key press
 KEY_DOWN: Final = 1
@@ -38,8 +49,17 @@ KEY_UP: Final = 0
 LOG_GUI_FMT: Final[str] = '%(asctime)s | %(levelname)-8s | %(threadName)-10s | %(message)s / %(funcName)s:%(lineno)d'
 LOG_FULL_FMT: Final[str] = '%(asctime)s | %(name)-17s | %(levelname)-8s | %(threadName)-10s | %(message)s / %(funcName)s:%(lineno)d'
 LOG_SHORT_FMT: Final[str] = '%(levelname)-8s | %(message)s'
+LOG_GUI_BUFFER_SIZE: Final = 2000
+LOG_GUI_FLUSH_INTERVAL: Final = 100
+LOG_GUI_MAX_LINES: Final = 5000
+LOG_QUEUE_SIZE: Final = 10_000
+TRACE_BUFFER_SIZE: Final = 512
 NO_OF_LCD_SCREENSHOTS: Final = 301
 TIME_BETWEEN_REQUESTS: Final = 0.2
+MACRO_TICK: Final = 0.01
+MACRO_WHEEL_SLOTS: Final = 512
+MACRO_WAIT: Final = r'WAIT (\d+(?:\.\d+)?)'
+MACRO_REPEAT: Final = r'(.+?) \*([1-9]\d*)'
 LOCAL_APPDATA: Final = True
 DCSPY_REPO_NAME: Final = 'emcek/dcspy'
 BIOS_REPO_NAME: Final = 'DCS-Skunkworks/dcs-bios'
@@ -47,6 +67,12 @@ BIOS_REPO_ADDR: Final = f'https://github.com/{BIOS_REPO_NAME}.git'
 DEFAULT_FONT_NAME: Final = 'consola.ttf'
 CTRL_LIST_SEPARATOR: Final = '--'
 CONFIG_YAML: Final = 'config.yaml'
+BIOS_CACHE_DIR: Final = 'bios_cache'
+LAST_PLANE_FILE: Final = 'last_plane'
+BIOS_CACHE_SIZE: Final = 64
+BIOS_WATCHER_INTERVAL: Final = 1.0
+BIOS_WATCHER_SETTLE: Final = 0.5
+BIOS_FINGERPRINT_TTL: Final = 1.0
 DEFAULT_YAML_FILE: Final = Path(__file__).parent / 'resources' / CONFIG_YAML
 SUPPORTED_CRAFTS = {
     'FA18Chornet': {'name': 'F/A-18C Hornet', 'bios': 'FA-18C_hornet'},
@@ -247,6 +273,57 @@ class OutputInt(Output):
         return value
 
 
+class OutputAddress(BaseModel):
+    """Location of one output of Control in DCS-BIOS export memory."""
+    model_config = ConfigDict(frozen=True)
+
+    ctrl_name: str
+    address: int
+    mask: int = 0xffff
+    shift_by: int = 0
+    max_length: int = 0
+
+    @classmethod
+    def from_output(cls, /, ctrl_name: str, output: OutputStr | OutputInt) -> OutputAddress:
+        """
+        Create location from output of Control.
+
+        :param ctrl_name: Control name
+        :param output: integer or string output
+        :return: OutputAddress instance
+        """
+        if isinstance(output, OutputStr):
+            return cls(ctrl_name=ctrl_name, address=output.address, max_length=output.max_length)
+        return cls(ctrl_name=ctrl_name, address=output.address, mask=output.mask, shift_by=output.shift_by)
+
+    @property
+    def is_string(self) -> bool:
+        """
+        Check if output is string.
+
+        :return: True for string output
+        """
+        return self.max_length > 0
+
+    @property
+    def end(self) -> int:
+        """
+        Get first address after output.
+
+        :return: address
+        """
+        return self.address + max(self.max_length, 2)
+
+    def extract(self, value: int) -> int:
+        """
+        Extract integer value of output from 16-bit word.
+
+        :param value: word at address of output
+        :return: value of output
+        """
+        return (value & self.mask) >> self.shift_by
+
+
 # ---------------- DCS-BIOS ----------------
 class IntBuffArgs(BaseModel):
     """Arguments of BIOS Integer Buffer."""
@@ -505,11 +582,43 @@ class DcsBiosPlaneData(RootModel):
         :param ctrl_name: Control name
         :return: Control instance
         """
+        try:
+            return self.ctrl_index[ctrl_name]
+        except KeyError:
+            return Control.make_empty()
+
+    @property
+    def ctrl_index(self) -> Mapping[str, Control]:
+        """
+        Get read-only index of all Controls by name.
+
+        :return: Mapping with name of Control as key
+        """
+        return MappingProxyType(self._ctrl_index)
+
+    @cached_property
+    def _ctrl_index(self) -> dict[str, Control]:
+        """
+        Build index of all Controls by name, only once at first access.
+
+        When the same name is present in many sections, the first one is used.
+
+        :return: Dictionary with name of Control as key
+        """
+        ctrl_index: dict[str, Control] = {}
         for controllers in self.root.values():
             for ctrl, data in controllers.items():
-                if ctrl == ctrl_name:
-                    return Control.model_validate(data)
-        return Control.make_empty()
+                ctrl_index.setdefault(ctrl, data)
+        return ctrl_index
+
+    @cached_property
+    def address_index(self) -> BiosAddressIndex:
+        """
+        Get reverse index from export address to outputs of Controls, built only once at first access.
+
+        :return: BiosAddressIndex instance
+        """
+        return BiosAddressIndex(OutputAddress.from_output(ctrl_name=name, output=output) for name, ctrl in self.ctrl_index.items() for output in ctrl.outputs)
 
     def get_inputs(self) -> dict[str, dict[str, ControlKeyData]]:
         """
@@ -532,6 +641,143 @@ class DcsBiosPlaneData(RootModel):
         return ctrl_key
 
 
+class BiosAddressIndex:
+    """
+    Reverse index from DCS-BIOS export address to outputs of Controls.
+
+    Every 16-bit word covered by output is mapped to it, so lookup of single address is one dictionary access.
+    Outputs sorted by start address are used to find all outputs overlapping any address range.
+    """
+    def __init__(self, outputs: Iterable[OutputAddress]) -> None:
+        """
+        Build index.
+
+        :param outputs: locations of outputs
+        """
+        self._outputs = sorted(outputs, key=lambda out: (out.address, out.ctrl_name))
+        self._starts = [output.address for output in self._outputs]
+        self._max_span = max((output.end - output.address for output in self._outputs), default=0)
+        words: dict[int, list[OutputAddress]] = {}
+        for output in self._outputs:
+            for word in range(output.address & ~1, output.end, 2):
+                words.setdefault(word, []).append(output)
+        self._words = {word: tuple(word_outputs) for word, word_outputs in words.items()}
+
+    def at(self, address: int) -> tuple[OutputAddress, ...]:
+        """
+        Get all outputs which use 16-bit word at address.
+
+        :param address: export address
+        :return: tuple of outputs, empty when address is not used
+        """
+        return self._words.get(address & ~1, ())
+
+    def overlapping(self, address: int, count: int = 2) -> list[OutputAddress]:
+        """
+        Get all outputs which overlap with address range.
+
+        :param address: first address of range
+        :param count: number of bytes in range
+        :return: list of outputs sorted by address
+        """
+        end = address + count
+        first = bisect_left(self._starts, address - self._max_span + 1)
+        last = bisect_left(self._starts, end)
+        return [output for output in self._outputs[first:last] if output.end > address]
+
+    def decode(self, address: int, value: int) -> dict[str, int]:
+        """
+        Decode values of all integer outputs from 16-bit word.
+
+        :param address: export address
+        :param value: word written at address
+        :return: dictionary with Control name as key and output value
+        """
+        return {output.ctrl_name: output.extract(value) for output in self.at(address) if not output.is_string}
+
+    @property
+    def addresses(self) -> list[int]:
+        """
+        Get all used addresses of 16-bit words.
+
+        :return: sorted list of addresses
+        """
+        return sorted(self._words)
+
+    def __len__(self) -> int:
+        return len(self._outputs)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(outputs={len(self)}, words={len(self._words)})'
+
+
+def compact_controls(raw_data: Mapping[str, Mapping[str, Any]]) -> dict[str, dict[str, str]]:
+    """
+    Serialize JSON data of every Control to compact string.
+
+    Strings take much less memory than nested dictionaries and can be validated directly.
+
+    :param raw_data: Merged JSON data of plane, grouped in sections
+    :return: JSON strings of Controls with name, grouped in sections
+    """
+    return {section: {ctrl: json.dumps(data, separators=(',', ':')) for ctrl, data in controllers.items()} for section, controllers in raw_data.items()}
+
+
+class LazyDcsBiosPlaneData:
+    """DcsBios plane data, with Control validated only at first access."""
+    def __init__(self, sections: Mapping[str, Mapping[str, str]]) -> None:
+        """
+        Keep JSON data of every Control as compact string, without validation.
+
+        When the same name is present in many sections, the first one is used.
+
+        :param sections: JSON strings of Controls with name, grouped in sections
+        """
+        self._raw: dict[str, str] = {}
+        for controllers in sections.values():
+            for ctrl, data in controllers.items():
+                self._raw.setdefault(ctrl, data)
+        self._size = len(self._raw)
+        self._validated: dict[str, Control] = {}
+
+    @classmethod
+    def from_raw_data(cls, raw_data: Mapping[str, Mapping[str, Any]]) -> LazyDcsBiosPlaneData:
+        """
+        Create from JSON data of plane, so raw data can be freed just after loading.
+
+        :param raw_data: Merged JSON data of plane, grouped in sections
+        :return: LazyDcsBiosPlaneData instance
+        """
+        return cls(sections=compact_controls(raw_data=raw_data))
+
+    def get_ctrl(self, ctrl_name: str) -> Control:
+        """
+        Get Control from DCS-BIOS with name.
+
+        JSON string of Control is dropped, after validated instance is stored.
+        Concurrent callers can validate the same control, but the first validated instance is used.
+
+        :param ctrl_name: Control name
+        :return: Control instance
+        """
+        ctrl = self._validated.get(ctrl_name)
+        if ctrl is not None:
+            return ctrl
+        raw_ctrl = self._raw.get(ctrl_name)
+        if raw_ctrl is None:
+            ctrl = self._validated.get(ctrl_name)
+            return Control.make_empty() if ctrl is None else ctrl
+        ctrl = self._validated.setdefault(ctrl_name, Control.model_validate_json(raw_ctrl))
+        self._raw.pop(ctrl_name, None)
+        return ctrl
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(controls={len(self)}, validated={len(self._validated)})'
+
+
 class CycleButton(BaseModel):
     """Map BIOS key string with iterator to keep a current value."""
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -559,6 +805,17 @@ class CycleButton(BaseModel):
         """Return True if any of the attributes: `step`, `max_value`, `ctrl_name` is truthy, False otherwise."""
         return not all([not self.step, not self.max_value, not self.ctrl_name])
 
+    def sync(self, current: int) -> None:
+        """
+        Move iterator to current value of control, direction of iteration is kept.
+
+        :param current: current value of control
+        """
+        if isinstance(self.iter, ZigZagIterator):
+            self.iter.current = current
+        else:
+            self.iter = ZigZagIterator(current=current, step=self.step, max_val=self.max_value)
+
 
 class GuiPlaneInputRequest(BaseModel):
     """
@@ -672,6 +929,15 @@ class LcdButton(Enum):
     def __str__(self) -> str:
         return self.name
 
+    @property
+    def code(self) -> int:
+        """
+        Get integer key code of LCD button, i.e. index in flat lookup table.
+
+        :return: key code
+        """
+        return LCD_CODE_BASE + self.value.bit_length()
+
 
 class MouseButton(BaseModel):
     """
@@ -695,6 +961,27 @@ class MouseButton(BaseModel):
         """Hash will be the same for any two MouseButton instances with the same button value."""
         return hash(self.button)
 
+    @property
+    def code(self) -> int:
+        """
+        Get integer key code of mouse button, i.e. index in flat lookup table.
+
+        :return: key code
+        """
+        return self.code_of(button=self.button)
+
+    @staticmethod
+    def code_of(button: int) -> int:
+        """
+        Get integer key code of mouse button without creating instance.
+
+        :param button: Number of mouse button, starting from 1
+        :return: key code, NO_KEY_CODE when button is out of Logitech SDK range
+        """
+        if 1 <= button <= LOGITECH_MAX_MOUSE_BUTTONS:
+            return MOUSE_CODE_BASE + button
+        return NO_KEY_CODE
+
     @classmethod
     def from_yaml(cls, /, yaml_str: str) -> MouseButton:
         """
@@ -745,6 +1032,28 @@ class Gkey(BaseModel):
         """Hash will be the same for any two Gkey instances with the same key and mode values."""
         return hash((self.key, self.mode))
 
+    @property
+    def code(self) -> int:
+        """
+        Get integer key code of G-Key, i.e. index in flat lookup table.
+
+        :return: key code
+        """
+        return self.code_of(key=self.key, mode=self.mode)
+
+    @staticmethod
+    def code_of(key: int, mode: int) -> int:
+        """
+        Get integer key code of G-Key without creating instance.
+
+        :param key: Number of G-Key, starting from 1
+        :param mode: Number of mode (M-State), starting from 1
+        :return: key code, NO_KEY_CODE when key or mode is out of Logitech SDK range
+        """
+        if 1 <= key <= LOGITECH_MAX_GKEYS and 1 <= mode <= LOGITECH_MAX_M_STATES:
+            return (key - 1) * LOGITECH_MAX_M_STATES + mode - 1
+        return NO_KEY_CODE
+
     @classmethod
     def from_yaml(cls, /, yaml_str: str) -> Gkey:
         """
@@ -1037,7 +1346,185 @@ class SystemData(BaseModel):
         return self.dcs_bios_ver.split(' ')[0]
 
 
-ConfigValue = TypeVar('ConfigValue', str, int, float, bool)
+class StreamStats(BaseModel):
+    """Health of DCS-BIOS export stream, rates are calculated since previous snapshot."""
+    datagrams: int = 0
+    bytes: int = 0
+    frames: int = 0
+    sync_losses: int = 0
+    malformed: int = 0
+    datagrams_per_sec: float = 0.0
+    bytes_per_sec: float = 0.0
+    frames_per_sec: float = 0.0
+    frame_interval_ms: float = 0.0
+    jitter_ms: float = 0.0
+
+    def __str__(self) -> str:
+        return (f'datagrams: {self.datagrams} ({self.datagrams_per_sec:.1f}/s) bytes: {self.bytes} ({self.bytes_per_sec:.0f}/s) '
+                f'frames: {self.frames} ({self.frames_per_sec:.1f}/s) interval: {self.frame_interval_ms:.1f} ms jitter: {self.jitter_ms:.2f} ms '
+                f'sync losses: {self.sync_losses} malformed: {self.malformed}')
+
+
+class BiosCacheStats(BaseModel):
+    """Statistics of DCS-BIOS data cache."""
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    evictions: int = 0
+    size: int = 0
+    maxsize: int = 0
+
+    def __str__(self) -> str:
+        return f'hits: {self.hits} misses: {self.misses} stale: {self.stale} evictions: {self.evictions} size: {self.size}/{self.maxsize}'
+
+
+class PlaneSwitchStats(BaseModel):
+    """Duration of phases of aircraft switch in milliseconds."""
+    plane: str = ''
+    phases: dict[str, float] = {}
+
+    @property
+    def total_ms(self) -> float:
+        """
+        Get duration of whole switch.
+
+        :return: time in milliseconds
+        """
+        return sum(self.phases.values())
+
+    def __str__(self) -> str:
+        phases = ' '.join(f'{name}: {duration:.2f}' for name, duration in self.phases.items())
+        return f'{self.plane} total: {self.total_ms:.2f} ms ({phases})'
+
+
+_MISSING: Final = object()
+
+
+class CockpitStore(MutableMapping[str, BiosValue]):
+    """
+    Compact storage of decoded DCS-BIOS values of aircraft.
+
+    Each selector is interned to slot in preallocated list, type of slot is taken from first value.
+    Written values are converted to type of slot, so typed reads usually do not need any conversion.
+    """
+
+    def __init__(self, data: Mapping[str, BiosValue] | None = None) -> None:
+        """
+        Create store.
+
+        :param data: initial selectors with values
+        """
+        self._slots: dict[str, int] = {}
+        self._values: list[Any] = []
+        self._kinds: list[type] = []
+        self.update(data or {})
+
+    def __getitem__(self, selector: str) -> BiosValue:
+        value = self._values[self._slots[selector]]
+        if value is _MISSING:
+            raise KeyError(selector)
+        return value
+
+    def __setitem__(self, selector: str, value: BiosValue) -> None:
+        slot = self._slots.get(selector)
+        if slot is None:
+            self._intern(selector=selector, value=value)
+            return
+        kind = self._kinds[slot]
+        if type(value) is not kind:
+            value = self._convert(kind=kind, value=value)
+        self._values[slot] = value
+
+    def __delitem__(self, selector: str) -> None:
+        slot = self._slots.get(selector)
+        if slot is None or self._values[slot] is _MISSING:
+            raise KeyError(selector)
+        self._values[slot] = _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return (selector for selector, slot in self._slots.items() if self._values[slot] is not _MISSING)
+
+    def __len__(self) -> int:
+        return sum(value is not _MISSING for value in self._values)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({dict(self)!r})'
+
+    def read(self, selector: str, default: BiosValue = '') -> BiosValue:
+        """
+        Get value of selector with type of default value.
+
+        :param selector: A name of selector
+        :param default: When fetch or conversion of value failed, this value will be returned
+        :return: value of selector
+        """
+        slot = self._slots.get(selector)
+        if slot is None or self._values[slot] is _MISSING:
+            return default
+        value: BiosValue = self._values[slot]
+        if type(value) is type(default):
+            return value
+        try:
+            return type(default)(value)
+        except ValueError:
+            return default
+
+    def reader(self, selector: str, default: BiosValue = '') -> Callable[[], BiosValue]:
+        """
+        Precompile accessor of selector, for hot render paths.
+
+        Selector is interned when not exists yet, with type of default value.
+        Accessor is bound to this store, it does not see values of store assigned later.
+
+        :param selector: A name of selector
+        :param default: value returned, when selector has no value
+        :return: function without arguments returning current value
+        """
+        if selector not in self._slots:
+            self._intern(selector=selector, value=_MISSING, kind=type(default))
+        values = self._values
+        slot = self._slots[selector]
+
+        def _read() -> BiosValue:
+            value = values[slot]
+            return default if value is _MISSING else value
+        return _read
+
+    def _intern(self, selector: str, value: Any, kind: type | None = None) -> None:
+        """
+        Assign new slot to selector.
+
+        :param selector: A name of selector
+        :param value: initial value
+        :param kind: type of slot, type of value is used when not provided
+        """
+        self._slots[selector] = len(self._values)
+        self._values.append(value)
+        self._kinds.append(kind or type(value))
+
+    @staticmethod
+    def _convert(kind: type, value: Any) -> Any:
+        """
+        Convert value to type of slot, keep value as is when not possible.
+
+        :param kind: type of slot
+        :param value: new value
+        :return: converted value
+        """
+        try:
+            return kind(value)
+        except (TypeError, ValueError):
+            return value
+
+
+class CockpitState(BaseModel):
+    """Last decoded cockpit state of aircraft, kept to restore LCD when the same aircraft reappears."""
+    bios_data: dict[str, BiosValue]
+    shadows: dict[tuple, int | bytes]
+    cycles: dict[str, int] = {}
+
+
+ConfigValue = TypeVar('ConfigValue', str, int, float, bool, list[str])
 DcspyConfigYaml = dict[str, ConfigValue]
 
 
@@ -1047,6 +1534,15 @@ class Direction(IntEnum):
     BACKWARD = -1
 
 
+class TraceEvent(IntEnum):
+    """Events recorded by tracer on hot paths."""
+    SET_BIOS = 1
+    RAW_VALUE = 2
+    SEND_REQUEST = 3
+    KEY_EVENT = 4
+    DRAW = 5
+
+
 class ZigZagIterator:
     """
     An iterator that moves within a range in an oscillating pattern.
@@ -1259,6 +1755,71 @@ class RequestType(Enum):
     PUSH_BUTTON = 'PUSH_BUTTON'
 
 
+class MacroStep(BaseModel):
+    """Single request of macro, sent after delay counted from the previous step."""
+    model_config = ConfigDict(frozen=True)
+
+    request: bytes
+    delay: float = 0.0
+
+
+class Macro(BaseModel):
+    """
+    Timed steps of CUSTOM request.
+
+    Steps are separated with `|`, every step is one of:
+
+    * `SELECTOR ARGUMENT` - request sent to DCS-BIOS
+    * `SELECTOR ARGUMENT *N` - request repeated N times
+    * `WAIT S` - wait S seconds before the next step, instead of default time between requests
+    * `HOLD` - next steps are sent, when key is released
+    """
+    model_config = ConfigDict(frozen=True)
+
+    press: tuple[MacroStep, ...] = ()
+    release: tuple[MacroStep, ...] = ()
+
+    @classmethod
+    def from_request(cls, request: str, hold: bool = True) -> Macro:
+        """
+        Parse steps of CUSTOM request.
+
+        The first step of press and release is sent at once, unless `WAIT` precedes it.
+
+        :param request: steps of request, without selector and request type
+        :param hold: split steps with `HOLD`, when False it is ignored, i.e. LCD buttons do not report release
+        :return: Macro instance
+        """
+        press: list[MacroStep] = []
+        release: list[MacroStep] = []
+        steps, wait = press, None
+        for step in filter(None, (part.strip() for part in request.split('|'))):
+            if wait_match := fullmatch(MACRO_WAIT, step):
+                wait = (wait or 0.0) + float(wait_match.group(1))
+            elif step == 'HOLD' and hold:
+                steps, wait = release, None
+            elif step != 'HOLD':
+                delay = TIME_BETWEEN_REQUESTS if steps else 0.0
+                steps.extend(cls._make_steps(step=step, delay=delay if wait is None else wait))
+                wait = None
+        return cls(press=tuple(press), release=tuple(release))
+
+    @staticmethod
+    def _make_steps(step: str, delay: float) -> list[MacroStep]:
+        """
+        Make steps for request, repeated requests are sent with default time between requests.
+
+        :param step: request with optional repeat count
+        :param delay: delay of the first request
+        :return: list of steps
+        """
+        request, count = step, 1
+        if repeat_match := fullmatch(MACRO_REPEAT, step):
+            request, count = repeat_match.group(1), int(repeat_match.group(2))
+        payload = f'{request}\n'.encode('utf-8')
+        return [MacroStep(request=payload, delay=delay)] + [MacroStep(request=payload, delay=TIME_BETWEEN_REQUESTS)] * (count - 1)
+
+
 class RequestModel(BaseModel):
     """
     Represent a request model for handling different input button states and their respective BIOS actions.
@@ -1320,7 +1881,7 @@ class RequestModel(BaseModel):
         """
         return cls(ctrl_name='EMPTY', raw_request='', get_bios_fn=int, cycle=CycleButton(ctrl_name='', step=0, max_value=0), key=key)
 
-    def _get_next_value_for_button(self) -> int:
+    def next_cycle_value(self) -> int:
         """
         Determine the next value for the button using a ZigZagIterator.
 
@@ -1331,9 +1892,7 @@ class RequestModel(BaseModel):
         :returns: The next value as an integer generated by the ZigZagIterator.
         """
         if not isinstance(self.cycle.iter, ZigZagIterator):
-            self.cycle.iter = ZigZagIterator(current=int(self.get_bios_fn(self.ctrl_name)),
-                                             step=self.cycle.step,
-                                             max_val=self.cycle.max_value)
+            self.cycle.sync(current=int(self.get_bios_fn(self.ctrl_name) or 0))
         return next(self.cycle.iter)
 
     @property
@@ -1360,6 +1919,17 @@ class RequestModel(BaseModel):
         """
         return RequestType.CUSTOM.value in self.raw_request
 
+    @property
+    def macro(self) -> Macro:
+        """
+        Get timed steps of custom request.
+
+        LCD buttons do not report release, so `HOLD` is ignored for them.
+
+        :return: Macro instance
+        """
+        return Macro.from_request(request=self.raw_request.split(f'{RequestType.CUSTOM.value} ')[1], hold=not isinstance(self.key, LcdButton))
+
     @property
     def is_push_button(self) -> bool:
         """
@@ -1467,7 +2037,7 @@ class RequestModel(BaseModel):
 
         :return: A formatted string representing the cycle request, including the control name and the next value for the button.
         """
-        return f'{self.ctrl_name} {self._get_next_value_for_button()}\n'
+        return f'{self.ctrl_name} {self.next_cycle_value()}\n'
 
     def __generate_custom_request(self) -> str:
         """
@@ -1475,21 +2045,145 @@ class RequestModel(BaseModel):
 
         This method processes the raw request string to extract and properly format its content,
         specifically for custom request types.
-        It splits the raw request using the defined delimiter for custom request types and
-        re-formats the request content using newline characters.
+        Requests of macro sent on key press are joined with the `|` delimiter, timing of steps is skipped.
 
-        :raises AttributeError: If `self.raw_request` is not properly formatted or the expected split pattern is missing.
         :raises IndexError: If the split raw request string does not contain the expected elements after processing.
         :return: A formatted request string with replaced delimiters.
         """
-        request = self.raw_request.split(f'{RequestType.CUSTOM.value} ')[1]
-        request = request.replace('|', '\n|')
-        return request.strip('|')
+        return '|'.join(step.request.decode('utf-8') for step in self.macro.press)
 
     def __str__(self) -> str:
         return f'{self.ctrl_name}: {self.raw_request}'
 
 
+class ButtonCommand(BaseModel):
+    """
+    Precompiled DCS-BIOS request for button, ready to be sent.
+
+    Payloads for key down and key up are prepared when aircraft is loaded,
+    only cycle button computes the next value during key press.
+    Custom request keeps also timed steps of macro.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    key_down: tuple[bytes, ...] = ()
+    key_up: tuple[bytes, ...] = ()
+    cycle: RequestModel | None = None
+    macro: Macro | None = None
+
+    @classmethod
+    def from_request_model(cls, request: RequestModel) -> ButtonCommand:
+        """
+        Compile request model to payloads, empty payloads are skipped.
+
+        :param request: RequestModel instance
+        :return: ButtonCommand instance
+        """
+        key_up = tuple(payload for payload in request.bytes_requests(key_down=KEY_UP) if payload)
+        if request.is_cycle:
+            return cls(key_up=key_up, cycle=request)
+        if request.is_custom:
+            macro = request.macro
+            return cls(key_down=tuple(step.request for step in macro.press), key_up=tuple(step.request for step in macro.release), macro=macro)
+        key_down = tuple(payload for payload in request.bytes_requests(key_down=KEY_DOWN) if payload)
+        return cls(key_down=key_down, key_up=key_up)
+
+    def requests(self, key_down: int) -> tuple[bytes, ...]:
+        """
+        Get payloads to be sent for key state.
+
+        :param key_down: One (1) indicate when key was pushed down and zero (0) when key is up
+        :return: tuple of byte strings
+        """
+        if key_down != KEY_DOWN:
+            return self.key_up
+        if self.cycle is None:
+            return self.key_down
+        return (f'{self.cycle.ctrl_name} {self.cycle.next_cycle_value()}\n'.encode('utf-8'),)
+
+
+class KeyBinding(BaseModel):
+    """
+    Compiled request of key from aircraft YAML file.
+
+    Binding is shared by all instances of aircraft, so it is compiled only once for every request.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    request: str
+    model: RequestModel
+    command: ButtonCommand
+
+    @classmethod
+    def from_request(cls, key: AnyButton, request: str) -> KeyBinding:
+        """
+        Compile request of key.
+
+        :param key: LcdButton, Gkey or MouseButton
+        :param request: raw request from YAML file
+        :return: KeyBinding instance
+        """
+        model = RequestModel.from_request(key=key, request=request, get_bios_fn=int)
+        return cls(request=request, model=model, command=ButtonCommand.from_request_model(model))
+
+    def bind(self, get_bios_fn: Callable[[str], BiosValue]) -> tuple[RequestModel, ButtonCommand]:
+        """
+        Make request and command for instance of aircraft.
+
+        Request model is shallow copy with own cycle button, precompiled command is shared, except cycle button.
+
+        :param get_bios_fn: function used to get a current BIOS value
+        :return: tuple with request model and command
+        """
+        model = self.model.model_copy(update={'get_bios_fn': get_bios_fn, 'cycle': self.model.cycle.model_copy()})
+        if self.command.cycle is None:
+            return model, self.command
+        return model, self.command.model_copy(update={'cycle': model})
+
+
+class CycleTracker:
+    """
+    Keep iterators of cycle buttons in sync with live values of cycled controls.
+
+    Live value only moves iterator, so press of cycle button sends the next position without any lookup.
+    """
+
+    def __init__(self, requests: Iterable[RequestModel] = ()) -> None:
+        """
+        Collect cycle buttons of requests.
+
+        :param requests: request models, only cycle requests are tracked
+        """
+        self.values: dict[str, int] = {}
+        self._cycles: dict[str, list[CycleButton]] = {}
+        for request in requests:
+            if request.is_cycle:
+                self._cycles.setdefault(request.ctrl_name, []).append(request.cycle)
+
+    @property
+    def ctrl_names(self) -> list[str]:
+        """
+        Get names of cycled controls.
+
+        :return: list of control names
+        """
+        return list(self._cycles)
+
+    def update(self, ctrl_name: str, value: int) -> None:
+        """
+        Synchronize all cycle buttons of control with its live value.
+
+        :param ctrl_name: name of control
+        :param value: current value of control
+        """
+        self.values[ctrl_name] = value
+        for cycle in self._cycles.get(ctrl_name, ()):
+            cycle.sync(current=value)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.values!r})'
+
+
 class Color(Enum):
     """A superset of HTML 4.0 color names used in CSS 1."""
     aliceblue = 0xf0f8ff
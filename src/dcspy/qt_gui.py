@@ -22,7 +22,7 @@ from webbrowser import open_new_tab
 from packaging import version
 from pydantic import ValidationError
 from PySide6 import __version__ as pyside6_ver
-from PySide6.QtCore import QAbstractItemModel, QFile, QIODevice, QMetaObject, QObject, QRunnable, Qt, QThreadPool, Signal, SignalInstance, Slot
+from PySide6.QtCore import QAbstractItemModel, QFile, QIODevice, QMetaObject, QObject, QRunnable, Qt, QThreadPool, QTimer, Signal, SignalInstance, Slot
 from PySide6.QtCore import __version__ as qt6_ver
 from PySide6.QtGui import (QAction, QActionGroup, QColor, QColorConstants, QFont, QGuiApplication, QIcon, QPixmap, QShowEvent, QStandardItemModel, QStyleHints,
                            QTextCharFormat)
@@ -32,14 +32,16 @@ from PySide6.QtWidgets import (QApplication, QButtonGroup, QCheckBox, QComboBox,
                                QSystemTrayIcon, QTableWidget, QTabWidget, QTextBrowser, QTextEdit, QToolBar, QToolBox, QWidget)
 
 from dcspy import default_yaml, qtgui_rc
-from dcspy.models import (ALL_DEV, BIOS_REPO_NAME, CTRL_LIST_SEPARATOR, DCSPY_REPO_NAME, LOG_GUI_FMT, AnyButton, ControlDepiction, ControlKeyData,
-                          DcspyConfigYaml, FontsConfig, Gkey, GuiPlaneInputRequest, GuiTab, LcdButton, LcdMono, LcdType, LogitechDeviceModel, MouseButton,
-                          MsgBoxTypes, Release, RequestType, SystemData, __version__)
+from dcspy.log import add_log_handler, remove_log_handler
+from dcspy.models import (ALL_DEV, BIOS_REPO_NAME, CTRL_LIST_SEPARATOR, DCSPY_REPO_NAME, LOG_GUI_BUFFER_SIZE, LOG_GUI_FLUSH_INTERVAL, LOG_GUI_FMT,
+                          LOG_GUI_MAX_LINES, AnyButton, ControlDepiction, ControlKeyData, DcspyConfigYaml, FontsConfig, Gkey, GuiPlaneInputRequest, GuiTab,
+                          LcdButton, LcdMono, LcdType, LogitechDeviceModel, MouseButton, MsgBoxTypes, Release, RequestType, SystemData, __version__)
 from dcspy.starter import DCSpyStarter
-from dcspy.utils import (CloneProgress, check_bios_ver, check_dcs_bios_entry, check_dcs_ver, check_github_repo, check_ver_at_github, collect_debug_data,
-                         count_files, defaults_cfg, detect_system_color_mode, download_file, generate_bios_jsons_with_lupa, get_all_git_refs,
-                         get_depiction_of_ctrls, get_inputs_for_plane, get_list_of_ctrls, get_plane_aliases, get_planes_list, get_version_string,
-                         is_git_exec_present, is_git_object, load_yaml, run_command, save_yaml)
+from dcspy.utils import (CloneProgress, bios_cache, check_bios_ver, check_dcs_bios_entry, check_dcs_ver, check_github_repo, check_ver_at_github,
+                         collect_debug_data, count_files, defaults_cfg, detect_system_color_mode, download_file, generate_bios_jsons_with_lupa,
+                         get_all_git_refs, get_depiction_of_ctrls, get_inputs_for_plane, get_list_of_ctrls, get_plane_aliases, get_planes_list,
+                         get_version_string, is_git_exec_present, is_git_object, load_yaml, run_command, save_yaml, yaml_cache)
+from dcspy.watcher import BiosWatcher
 
 _ = qtgui_rc  # prevent to remove import statement accidentally
 LOG = getLogger(__name__)
@@ -102,6 +104,7 @@ class DcsPyQtGui(QMainWindow):
         self._init_settings()
         self._init_devices()
         self._init_autosave()
+        self._init_bios_watcher()
         self._trigger_refresh_data()
 
         if self.cb_autoupdate_bios.isChecked():
@@ -123,7 +126,10 @@ class DcsPyQtGui(QMainWindow):
         self.gui_log.setLevel(INFO)
         if self.config.get('verbose', False):
             self.gui_log.setLevel(DEBUG)
-        LOG.parent.addHandler(self.gui_log)
+        self._log_timer = QTimer(self)
+        self._log_timer.timeout.connect(self.gui_log.flush_to_widget)
+        self._log_timer.start(LOG_GUI_FLUSH_INTERVAL)
+        add_log_handler(logger=LOG.parent, handler=self.gui_log)
         self.hs_debug_font_size.valueChanged.connect(self._hs_debug_font_size_changed)
 
     def _init_tray(self) -> None:
@@ -258,6 +264,41 @@ class DcsPyQtGui(QMainWindow):
         for widget_name, trigger_method in widget_dict.items():
             getattr(getattr(self, widget_name), trigger_method).connect(self.save_configuration)
 
+    def _init_bios_watcher(self) -> None:
+        """Initialize watcher of DCS-BIOS JSON files."""
+        self.bios_watcher: BiosWatcher | None = None
+        self.bios_watcher_signals = WorkerSignals()
+        self.bios_watcher_signals.result.connect(self._bios_json_changed)
+        self.le_biosdir.editingFinished.connect(self._start_bios_watcher)
+        app = QApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self._stop_bios_watcher)
+        self._start_bios_watcher()
+
+    def _start_bios_watcher(self) -> None:
+        """Start watching current DCS-BIOS directory, previous watcher is stopped."""
+        self._stop_bios_watcher()
+        self.bios_watcher = BiosWatcher(bios_dir=self.bios_path, callback=self.bios_watcher_signals.result.emit)
+        self.bios_watcher.start()
+
+    def _stop_bios_watcher(self) -> None:
+        """Stop watcher of DCS-BIOS JSON files and wait until its thread is finished."""
+        if self.bios_watcher:
+            self.bios_watcher.stop()
+            self.bios_watcher.join(timeout=self.bios_watcher.interval * 2)
+            self.bios_watcher = None
+
+    def _bios_json_changed(self, planes: set[str]) -> None:
+        """
+        Reload G-Keys table when DCS-BIOS JSON files of current plane were changed.
+
+        :param planes: set of affected BIOS plane names
+        """
+        LOG.debug(f'Planes with changed DCS-BIOS: {", ".join(sorted(planes))}')
+        if self.current_plane in planes:
+            self.statusbar.showMessage(f'DCS-BIOS of {self.current_plane} changed, reload G-Keys')
+            self._reload_table_gkeys()
+
     def _trigger_refresh_data(self) -> None:
         """Refresh widgets states and regenerates data."""
         try:
@@ -452,7 +493,7 @@ class DcsPyQtGui(QMainWindow):
         labels_m_key = [f'M{i}' for i in range(m_btn_start, m_btn_end + 1)]
         self.tw_gkeys.setVerticalHeaderLabels(labels_g_key + labels_lcd_key + labels_m_key)
         self.tw_gkeys.setHorizontalHeaderLabels([f'Mode {i}' for i in range(1, self.device.cols + 1)])
-        plane_keys = load_yaml(full_path=default_yaml.parent / f'{self.current_plane}.yaml')
+        plane_keys = yaml_cache.load(full_path=default_yaml.parent / f'{self.current_plane}.yaml')
         LOG.debug(f'Load {self.current_plane}:\n{pformat(plane_keys)}')
         self.input_reqs[self.current_plane] = GuiPlaneInputRequest.from_plane_gkeys(plane_gkeys=plane_keys)
         self._generate_table()
@@ -797,7 +838,7 @@ class DcsPyQtGui(QMainWindow):
         """Save G-Keys configuration for a current plane."""
         plane_cfg_yaml = {g_key: value.request for g_key, value in self.input_reqs[self.current_plane].items() if value.request}
         LOG.debug(f'Save {self.current_plane}:\n{pformat(plane_cfg_yaml)}')
-        save_yaml(data=plane_cfg_yaml, full_path=default_yaml.parent / f'{self.current_plane}.yaml')
+        yaml_cache.save(data=plane_cfg_yaml, full_path=default_yaml.parent / f'{self.current_plane}.yaml')
 
     def _save_current_cell(self, currentRow: int, currentColumn: int, previousRow: int, previousColumn: int) -> None:
         """
@@ -874,9 +915,9 @@ class DcsPyQtGui(QMainWindow):
         :param state: State to switch to.
         """
         if state:
-            LOG.parent.addHandler(self.gui_log)
+            add_log_handler(logger=LOG.parent, handler=self.gui_log)
         else:
-            LOG.parent.removeHandler(self.gui_log)
+            remove_log_handler(logger=LOG.parent, handler=self.gui_log)
         self.tw_main.setTabEnabled(GuiTab.debug, state)
         self.gui_log.toggle_logging(state=state)
 
@@ -1101,6 +1142,7 @@ class DcsPyQtGui(QMainWindow):
         install_result = f'{install_result}\n\nUsing Git/Live version.'
         self.statusbar.showMessage(sha)
         self._is_git_object_exists(text=self.le_bios_ref.text())
+        bios_cache.invalidate()
         self._reload_table_gkeys()
         if not silence:
             self._show_message_box(kind_of=MsgBoxTypes.INFO, title=f'Updated {self.l_bios}', message=install_result)
@@ -1203,6 +1245,8 @@ class DcsPyQtGui(QMainWindow):
         rmtree(path=self.bios_path, ignore_errors=True)
         LOG.debug(f'Copy DCS-BIOS to: {self.bios_path} ')
         copytree(src=tmp_dir / 'DCS-BIOS', dst=self.bios_path)
+        bios_cache.invalidate()
+        self._reload_table_gkeys()
         install_result = self._handling_export_lua(tmp_dir)
         if 'github' in install_result:
             reply = self._show_message_box(kind_of=MsgBoxTypes.QUESTION, title='Open browser', message=install_result,
@@ -1299,6 +1343,24 @@ class DcsPyQtGui(QMainWindow):
             self.cb_ded_font.setEnabled(True)
         self.event_set()
 
+    def _extra_devices(self) -> list[LogitechDeviceModel]:
+        """
+        Get additional Logitech devices, which share DCS-BIOS data with selected one.
+
+        Devices are set only in config.yaml, i.e. `extra_devices: [G19, G600]`, there is no control in GUI.
+
+        :return: List of Logitech device models
+        """
+        extra_klass = self.config.get('extra_devices', [])
+        if isinstance(extra_klass, str):
+            extra_klass = [extra_klass]
+        unknown = set(extra_klass) - {logi_dev.klass for logi_dev in ALL_DEV}
+        if unknown:
+            LOG.warning(f'Unknown extra devices: {sorted(unknown)}')
+        extra_devices = [logi_dev for logi_dev in ALL_DEV if logi_dev.klass in extra_klass and logi_dev.klass != self.device.klass]
+        LOG.debug(f'Extra devices: {[logi_dev.klass for logi_dev in extra_devices]}')
+        return extra_devices
+
     def _start_clicked(self) -> None:
         """Run real application in thread."""
         LOG.debug(f'Local DCS-BIOS version: {self._check_local_bios()}')
@@ -1307,13 +1369,15 @@ class DcsPyQtGui(QMainWindow):
         for rb_key in self.bg_rb_device.buttons():
             if not rb_key.isChecked():
                 rb_key.setEnabled(False)
-        if self.device.lcd_info.type != LcdType.NONE:
-            ded_font = True if self.cb_ded_font.isChecked() and self.device.lcd_info.type == LcdType.COLOR else False
-            fonts_cfg = FontsConfig(name=self.le_font_name.text(), ded_font=ded_font,
-                                    **getattr(self, f'{self.device.lcd_name}_font'))
-            self.device.lcd_info.set_fonts(fonts_cfg)
+        extra_devices = self._extra_devices()
+        for device in [self.device, *extra_devices]:
+            if device.lcd_info.type != LcdType.NONE:
+                ded_font = True if self.cb_ded_font.isChecked() and device.lcd_info.type == LcdType.COLOR else False
+                fonts_cfg = FontsConfig(name=self.le_font_name.text(), ded_font=ded_font,
+                                        **getattr(self, f'{device.lcd_name}_font'))
+                device.lcd_info.set_fonts(fonts_cfg)
         self.event: Event = Event()
-        app_params = {'model': self.device, 'event': self.event}
+        app_params = {'model': self.device, 'event': self.event, 'extra_models': extra_devices}
         app_thread = Thread(target=DCSpyStarter(**app_params))
         app_thread.name = 'dcspy-app'
         LOG.debug(f'Starting thread {app_thread} for: {app_params}')
@@ -1421,7 +1485,7 @@ class DcsPyQtGui(QMainWindow):
 
         cfg.update(font_cfg)
         cfg.update({'color_mode': color_mode})
-        save_yaml(data=cfg, full_path=default_yaml)
+        save_yaml(data={**load_yaml(full_path=default_yaml), **cfg}, full_path=default_yaml)
 
     def _reset_defaults_cfg(self) -> None:
         """Set defaults and stop the application."""
@@ -2045,7 +2109,11 @@ class UiLoader(QUiLoader):
 
 
 class QTextEditLogHandler(Handler):
-    """GUI log handler."""
+    """
+    GUI log handler.
+
+    Records from any thread are only buffered, widget is updated in batches by flush_to_widget() from GUI thread.
+    """
     colors: ClassVar[dict[str, QColor]] = {
         'DEBUG': QColorConstants.Svg.grey,
         'INFO': QColorConstants.Svg.green,
@@ -2054,30 +2122,60 @@ class QTextEditLogHandler(Handler):
         'CRITICAL': QColorConstants.Svg.blue
     }
 
-    def __init__(self, text_widget: QTextEdit) -> None:
+    def __init__(self, text_widget: QTextEdit, max_lines: int = LOG_GUI_MAX_LINES, buffer_size: int = LOG_GUI_BUFFER_SIZE) -> None:
         """
         Log handler for GUI application.
 
         :param text_widget: widget to emit logs to.
+        :param max_lines: maximal number of lines in widget, the oldest lines are removed
+        :param buffer_size: maximal number of records waiting for flush, next records are dropped
         """
         super().__init__()
         self.text_widget = text_widget
+        self.text_widget.document().setMaximumBlockCount(max_lines)
+        self.buffer_size = buffer_size
         self.paused = False
+        self.dropped = 0
+        self._records: list[tuple[str, str]] = []
+        self._formats: dict[str, QTextCharFormat] = {}
+        for levelname, color in self.colors.items():
+            self._formats[levelname] = QTextCharFormat()
+            self._formats[levelname].setForeground(color)
 
     def emit(self, record: LogRecord) -> None:
         """
-        Emit a log record.
+        Buffer a log record, drop it when buffer is full.
 
         :param record: LogRecord instance.
         """
         if self.paused:
             return
+        if len(self._records) >= self.buffer_size:
+            self.dropped += 1
+            return
+        self._records.append((record.levelname, self.format(record)))
+
+    def flush_to_widget(self) -> int:
+        """
+        Insert all buffered records to widget at once, must be called from GUI thread.
+
+        :return: number of inserted records
+        """
+        with self.lock:
+            records, self._records = self._records, []
+            dropped, self.dropped = self.dropped, 0
+        if not records and not dropped:
+            return 0
         cursor = self.text_widget.textCursor()
-        text_format = QTextCharFormat()
-        text_format.setForeground(self.colors.get(record.levelname, QColorConstants.Svg.black))
         cursor.movePosition(cursor.MoveOperation.End)
-        cursor.insertText(f'{self.format(record)}\n', text_format)
+        cursor.beginEditBlock()
+        for levelname, message in records:
+            cursor.insertText(f'{message}\n', self._formats.get(levelname, QTextCharFormat()))
+        if dropped:
+            cursor.insertText(f'{dropped} records dropped\n', self._formats['ERROR'])
+        cursor.endEditBlock()
         self.text_widget.setTextCursor(cursor)
+        return len(records)
 
     def toggle_logging(self, state: bool) -> None:
         """
@@ -13,6 +13,7 @@ from PySide6.QtGui import QPixmap, Qt
 from PySide6.QtWidgets import QApplication, QProgressBar, QSplashScreen
 
 from dcspy import get_config_yaml_item
+from dcspy.log import stop_logger
 from dcspy.qt_gui import DcsPyQtGui
 
 LOG = getLogger(__name__)
@@ -58,4 +59,5 @@ def run(cli_args: Namespace = Namespace()) -> None:
     except Exception as exp:
         LOG.exception(f'Critical error: {exp}', exc_info=True)
     finally:
+        app.aboutToQuit.connect(partial(stop_logger, logger=getLogger('dcspy')))
         sys.exit(app.exec())
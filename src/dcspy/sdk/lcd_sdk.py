@@ -1,5 +1,6 @@
 from contextlib import suppress
 from logging import getLogger
+from threading import RLock
 
 from _cffi_backend import Lib
 from cffi import FFI, CDefError
@@ -13,7 +14,15 @@ LOG = getLogger(__name__)
 
 
 class LcdSdkManager:
-    """Lcd SDK manager."""
+    """
+    Lcd SDK manager.
+
+    LCD SDK is global for the whole process, so it is loaded and initialized once and shared by all managers.
+    """
+    _lock = RLock()
+    _dll: Lib | None = None
+    _loaded = False
+    _lcd_types = 0
 
     def __init__(self, name: str, lcd_type: LcdType) -> None:
         """
@@ -23,22 +32,46 @@ class LcdSdkManager:
         :param lcd_type: An integer representing the type of the LCD
         """
         result = None
+        self.lcd_type = lcd_type
         if lcd_type != LcdType.NONE:
-            self.lcd_dll: Lib = load_dll(LcdDll)  # type: ignore[assignment]
-            result = self.logi_lcd_init(name=name, lcd_type=lcd_type)
+            result = self._init_shared(name=name, lcd_type=lcd_type)
         LOG.debug(f'LCD is connected: {result}')
 
-    def logi_lcd_init(self, name: str, lcd_type: LcdType) -> bool:
+    def _init_shared(self, name: str, lcd_type: LcdType) -> bool:
+        """
+        Load and initialize SDK for all managers.
+
+        SDK is initialized again, with all types, only when manager for a new LCD type is created.
+        :param name: The name of your applet
+        :param lcd_type: LCD type
+        :return: A result of execution
+        """
+        manager = type(self)
+        with manager._lock:
+            if not manager._loaded:
+                manager._dll = load_dll(LcdDll)  # type: ignore[assignment]
+                manager._loaded = True
+            self.lcd_dll: Lib = manager._dll  # type: ignore[assignment]
+            lcd_types = manager._lcd_types | lcd_type.value
+            if lcd_types == manager._lcd_types:
+                return True
+            if manager._lcd_types:
+                self.logi_lcd_shutdown()
+            result = self.logi_lcd_init(name=name, lcd_type=lcd_types)
+            manager._lcd_types = lcd_types if result else 0
+            return result
+
+    def logi_lcd_init(self, name: str, lcd_type: int) -> bool:
         """
         Make the necessary initializations.
 
         You must call this function prior to any other function in the library.
         :param name: The name of your applet, you can't change it after initialization
-        :param lcd_type: LCD type
+        :param lcd_type: LCD type or bitwise OR of LCD types
         :return: A result of execution
         """
         with suppress(AttributeError):
-            return self.lcd_dll.LogiLcdInit(FFI().new('wchar_t[]', name), lcd_type.value)  # type: ignore[attr-defined]
+            return self.lcd_dll.LogiLcdInit(FFI().new('wchar_t[]', name), lcd_type)  # type: ignore[attr-defined]
         return False
 
     def logi_lcd_is_connected(self, lcd_type: LcdType) -> bool:
@@ -59,7 +92,7 @@ class LcdSdkManager:
         :param button: Defines the button to check on
         :return: True if a button is being pressed, False otherwise
         """
-        with suppress(AttributeError):
+        with self._lock, suppress(AttributeError):
             return self.lcd_dll.LogiLcdIsButtonPressed(button.value)  # type: ignore[attr-defined]
         return False
 
@@ -154,20 +187,21 @@ class LcdSdkManager:
         For color, LCD takes eight (8) elements of the list and displays as eight (8) rows.
         :param txt: List of strings to display, row by row
         """
-        title = txt.pop(0)
-        title_txt = title[0]
-        title_color = rgb(title[1])
-        if self.logi_lcd_is_connected(LcdType.MONO):
-            for line_no, txt_and_color in enumerate(txt[:4]):
-                self.logi_lcd_mono_set_text(line_no, txt_and_color[0])
-            self.logi_lcd_update()
-        elif self.logi_lcd_is_connected(LcdType.COLOR):
-            self.logi_lcd_color_set_title(title_txt, title_color)
-            for line_no, txt_and_color in enumerate(txt):
-                self.logi_lcd_color_set_text(line_no, txt_and_color[0], rgb(txt_and_color[1]))
-            self.logi_lcd_update()
-        else:
-            LOG.warning('LCD is not connected')
+        with self._lock:
+            title = txt.pop(0)
+            title_txt = title[0]
+            title_color = rgb(title[1])
+            if not self.logi_lcd_is_connected(self.lcd_type):
+                LOG.warning('LCD is not connected')
+            elif self.lcd_type == LcdType.MONO:
+                for line_no, txt_and_color in enumerate(txt[:4]):
+                    self.logi_lcd_mono_set_text(line_no, txt_and_color[0])
+                self.logi_lcd_update()
+            else:
+                self.logi_lcd_color_set_title(title_txt, title_color)
+                for line_no, txt_and_color in enumerate(txt):
+                    self.logi_lcd_color_set_text(line_no, txt_and_color[0], rgb(txt_and_color[1]))
+                self.logi_lcd_update()
 
     def update_display(self, image: Image.Image) -> None:
         """
@@ -175,14 +209,15 @@ class LcdSdkManager:
 
         :param image: Image object from the Pillow library
         """
-        if self.logi_lcd_is_connected(LcdType.MONO):
-            self.logi_lcd_mono_set_background(image.get_flattened_data())  # type: ignore[attr-defined]
-            self.logi_lcd_update()
-        elif self.logi_lcd_is_connected(LcdType.COLOR):
-            self.logi_lcd_color_set_background(image.get_flattened_data())  # type: ignore[attr-defined]
-            self.logi_lcd_update()
-        else:
-            LOG.warning('LCD is not connected')
+        with self._lock:
+            if not self.logi_lcd_is_connected(self.lcd_type):
+                LOG.warning('LCD is not connected')
+            elif self.lcd_type == LcdType.MONO:
+                self.logi_lcd_mono_set_background(image.get_flattened_data())  # type: ignore[attr-defined]
+                self.logi_lcd_update()
+            else:
+                self.logi_lcd_color_set_background(image.get_flattened_data())  # type: ignore[attr-defined]
+                self.logi_lcd_update()
 
     def clear_display(self, true_clear: bool = False) -> None:
         """
@@ -190,11 +225,12 @@ class LcdSdkManager:
 
         :param true_clear:
         """
-        if self.logi_lcd_is_connected(LcdType.MONO):
-            self._clear_mono(true_clear)
-        elif self.logi_lcd_is_connected(LcdType.COLOR):
-            self._clear_color(true_clear)
-        self.logi_lcd_update()
+        with self._lock:
+            if self.lcd_type == LcdType.MONO:
+                self._clear_mono(true_clear)
+            elif self.lcd_type == LcdType.COLOR:
+                self._clear_color(true_clear)
+            self.logi_lcd_update()
 
     def _clear_mono(self, true_clear: bool) -> None:
         """
@@ -1,73 +1,276 @@
 import socket
 import struct
 from collections import deque
-from collections.abc import Iterator
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from logging import getLogger
-from threading import Event
+from pathlib import Path
+from threading import Event, Lock, Thread
 from time import gmtime, time
 
 from dcspy import get_config_yaml_item
 from dcspy.dcsbios import ProtocolParser
+from dcspy.log import TRACE
 from dcspy.logitech import LogitechDevice
-from dcspy.models import DCSPY_REPO_NAME, MULTICAST_IP, RECV_ADDR, Color, LogitechDeviceModel, __version__
-from dcspy.utils import check_bios_ver, get_version_string
+from dcspy.models import (DCSPY_REPO_NAME, MULTICAST_IP, RECV_ADDR, STREAM_STATS_INTERVAL, SUPPORTED_CRAFTS, Color, LcdType, LogitechDeviceModel,
+                          PlaneSwitchStats, StreamStats, __version__)
+from dcspy.utils import check_bios_ver, get_last_plane, get_lazy_bios_for_plane, get_plane_aliases, get_version_string, save_last_plane
 
 LOG = getLogger(__name__)
 SUPPORTERS = ['Jon Wardell', 'Simon Leigh', 'Alexander Leschanz', 'Sireyn', 'Nick Thain', 'BrotherBloat']
 
 
+class BiosPrefetcher:
+    """Load DCS-BIOS data of planes in background, so receiving thread never waits for JSON files."""
+
+    def __init__(self, bios_dir: Path) -> None:
+        """
+        Create prefetcher with one worker thread.
+
+        :param bios_dir: path to DCS-BIOS directory
+        """
+        self.bios_dir = bios_dir
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dcspy-prefetch')
+        self._futures: dict[str, Future] = {}
+        self._lock = Lock()
+
+    def prefetch(self, *planes: str) -> None:
+        """
+        Start loading DCS-BIOS data of planes, which are not loaded yet.
+
+        :param planes: BIOS plane names
+        """
+        with self._lock:
+            for plane in planes:
+                if plane and plane not in self._futures:
+                    LOG.debug(f'Prefetch BIOS: {plane}')
+                    self._futures[plane] = self._executor.submit(self._load, plane)
+
+    def is_ready(self, plane: str) -> bool:
+        """
+        Check if DCS-BIOS data of plane is loaded, if not loading is started.
+
+        :param plane: BIOS plane name
+        :return: True if data is available without waiting
+        """
+        self.prefetch(plane)
+        return self._futures[plane].done()
+
+    def plane_loaded(self, plane: str) -> None:
+        """
+        Remember plane as last flown and warm up its variants, i.e.: A-10C and A-10C_2.
+
+        :param plane: BIOS plane name
+        """
+        self._executor.submit(self._plane_loaded, plane)
+
+    def shutdown(self) -> None:
+        """Stop worker thread and cancel not started jobs."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _load(self, plane: str) -> None:
+        """
+        Load DCS-BIOS data of plane into cache.
+
+        :param plane: BIOS plane name
+        """
+        try:
+            get_lazy_bios_for_plane(plane=plane, bios_dir=self.bios_dir)
+        except (OSError, KeyError, ValueError) as err:
+            LOG.debug(f'Prefetch of {plane} failed: {type(err).__name__}: {err}')
+
+    def _plane_loaded(self, plane: str) -> None:
+        """
+        Save plane as last flown and prefetch other supported planes with the same aliases.
+
+        :param plane: BIOS plane name
+        """
+        try:
+            if get_last_plane() != plane:
+                save_last_plane(plane=plane)
+            aliases = get_plane_aliases(bios_dir=self.bios_dir)
+        except OSError as err:
+            LOG.debug(f'Prefetch of {plane} variants failed: {type(err).__name__}: {err}')
+            return
+        self.prefetch(*[craft['bios'] for craft in SUPPORTED_CRAFTS.values() if plane in aliases and aliases.get(craft['bios']) == aliases[plane]])
+
+
 class DCSpyStarter:
     """Wrapper object to handle starting and showing welcome screen."""
 
-    def __init__(self, model: LogitechDeviceModel, event: Event) -> None:
+    def __init__(self, model: LogitechDeviceModel, event: Event, extra_models: Sequence[LogitechDeviceModel] = ()) -> None:
         """
         Initialize an object with a global state.
 
-        :param model: Logitech device model
+        All devices share one socket and one parser, so DCS-BIOS stream is received and decoded only once.
+        Main device handles G-Keys and mouse buttons for all of them.
+
+        :param model: main Logitech device model
         :param event: stop event for the main loop
+        :param extra_models: additional Logitech device models
         """
         self.model = model
+        self.models = [model, *extra_models]
         self.event = event
         self.parser = ProtocolParser()
+        self.prefetcher = BiosPrefetcher(bios_dir=Path(str(get_config_yaml_item('dcsbios'))))
         self.CLEAN_BEFORE_LOAD_PLANE = False
         self.CLEAN_WHILE_WAIT_FOR_DATA = False
+        self._stats_time = time()
 
-    def _handle_connection(self, logi_device: LogitechDevice, sock: socket.socket, ver_string: str) -> None:
+    @property
+    def stats(self) -> StreamStats:
+        """
+        Get DCS-BIOS stream statistics.
+
+        :return: StreamStats model
+        """
+        return self.parser.stats.snapshot(new_window=False)
+
+    def _handle_connection(self, logi_devices: Sequence[LogitechDevice], sock: socket.socket, ver_string: str) -> None:
         """
         Handle the main loop where all the magic is happened.
 
-        :param logi_device: Type of Logitech keyboard with LCD
+        :param logi_devices: Logitech devices sharing DCS-BIOS data
         :param sock: Multicast UDP socket
         :param ver_string: Current version to show
         """
         start_time = time()
         LOG.info('Waiting for DCS connection...')
-        support_banner = DCSpyStarter._supporters(text=f'Huge thanks to: {", ".join(SUPPORTERS)} and others! For support and help! ', width=37)
+        support_banners = [DCSpyStarter._supporters(text=f'Huge thanks to: {", ".join(SUPPORTERS)} and others! For support and help! ', width=37)
+                           for _ in logi_devices]
         while not self.event.is_set():
+            self._log_stream_stats()
             try:
                 dcs_bios_resp = sock.recv(2048)
-                if self.CLEAN_BEFORE_LOAD_PLANE:
-                    logi_device.clear(true_clear=True)
-                    self.CLEAN_BEFORE_LOAD_PLANE = False
-                    self.CLEAN_WHILE_WAIT_FOR_DATA = True
-                for int_byte in dcs_bios_resp:
-                    self.parser.process_byte(int_byte)
+                self._process_datagram(logi_devices=logi_devices, dcs_bios_resp=dcs_bios_resp)
                 start_time = time()
-                self._load_new_plane_if_detected(logi_device)
-                logi_device.button_handle()
             except OSError as exp:
-                self._sock_err_handler(logi_device, start_time, ver_string, support_banner, exp)
+                self._clear_on_disconnect(logi_devices=logi_devices, exp=exp)
+                for logi_device, support_banner in zip(logi_devices, support_banners):
+                    self._sock_err_handler(logi_device, start_time, ver_string, support_banner, exp)
 
-    def _load_new_plane_if_detected(self, logi_device: LogitechDevice) -> None:
+    def _run_main_loop(self, logi_devices: Sequence[LogitechDevice], sock: socket.socket, ver_string: str) -> None:
         """
-        Load instance when new plane detected.
+        Run main loop, last traced events are logged when it fails.
+
+        :param logi_devices: Logitech devices sharing DCS-BIOS data
+        :param sock: Multicast UDP socket
+        :param ver_string: Current version to show
+        """
+        try:
+            self._handle_connection(logi_devices=logi_devices, sock=sock, ver_string=ver_string)
+        except Exception:
+            LOG.error('Last traced events:\n%s', '\n'.join(TRACE.dump()))
+            raise
+
+    def _process_datagram(self, logi_devices: Sequence[LogitechDevice], dcs_bios_resp: bytes) -> None:
+        """
+        Parse received datagram once and load new plane for all devices if detected.
+
+        After reconnection, the last known screen is restored at once and updated with new data.
+        Locks of devices are held, so LCD buttons are not handled during parsing or plane switch.
+
+        :param logi_devices: Logitech devices sharing DCS-BIOS data
+        :param dcs_bios_resp: DCS-BIOS datagram
+        """
+        self.parser.stats.add_datagram(len(dcs_bios_resp))
+        with self._lock_devices(logi_devices=logi_devices):
+            if self.CLEAN_BEFORE_LOAD_PLANE:
+                for logi_device in logi_devices:
+                    logi_device.restore_display()
+                self.CLEAN_BEFORE_LOAD_PLANE = False
+                self.CLEAN_WHILE_WAIT_FOR_DATA = True
+            for int_byte in dcs_bios_resp:
+                self.parser.process_byte(int_byte)
+            self._load_new_plane_if_detected(logi_devices)
+
+    @staticmethod
+    @contextmanager
+    def _lock_devices(logi_devices: Sequence[LogitechDevice]) -> Iterator[None]:
+        """
+        Hold locks of all devices, so planes are not switched or rendered while keys are handled.
+
+        :param logi_devices: Logitech devices sharing DCS-BIOS data
+        """
+        with ExitStack() as stack:
+            for logi_device in logi_devices:
+                stack.enter_context(logi_device.lock)
+            yield
+
+    def _poll_lcd_buttons(self, logi_device: LogitechDevice, rate: float) -> None:
+        """
+        Poll LCD buttons with constant rate, independently of DCS-BIOS data.
+
+        :param logi_device: Type of Logitech keyboard with LCD
+        :param rate: Polling frequency in Hz
+        """
+        period = 1 / max(rate, 1.0)
+        while not self.event.wait(timeout=period):
+            logi_device.button_handle()
+
+    def _start_lcd_buttons_thread(self, logi_device: LogitechDevice) -> Thread | None:
+        """
+        Start thread with LCD buttons polling, only for devices with LCD.
 
         :param logi_device: Type of Logitech keyboard with LCD
+        :return: Started thread or None
         """
-        if logi_device.plane_detected:
+        if logi_device.model.lcd_info.type == LcdType.NONE:
+            return None
+        rate = float(get_config_yaml_item('lcd_buttons_rate', 50))
+        buttons_thread = Thread(target=self._poll_lcd_buttons, kwargs={'logi_device': logi_device, 'rate': rate}, name='dcspy-buttons', daemon=True)
+        buttons_thread.start()
+        LOG.debug(f'LCD buttons polling with: {rate} Hz')
+        return buttons_thread
+
+    def _log_stream_stats(self) -> None:
+        """Log DCS-BIOS stream statistics periodically."""
+        if time() - self._stats_time >= STREAM_STATS_INTERVAL:
+            self._stats_time = time()
+            LOG.info(f'DCS-BIOS stream: {self.parser.stats.snapshot()}')
+
+    def _load_new_plane_if_detected(self, logi_devices: Sequence[LogitechDevice]) -> None:
+        """
+        Load instance when new plane detected.
+
+        Old planes of all devices are unloaded first, so shared buffers are not reused by new plane.
+        Plane is loaded only when its DCS-BIOS data is already prefetched, otherwise next datagram is processed.
+
+        :param logi_devices: Logitech devices sharing DCS-BIOS data
+        """
+        detected = [logi_device for logi_device in logi_devices if logi_device.plane_detected and self._is_bios_ready(logi_device.plane_name)]
+        for logi_device in detected:
             logi_device.unload_old_plane()
+        for logi_device in detected:
             logi_device.load_new_plane()
+            self._check_switch_time(switch_stats=logi_device.switch_stats)
+        if detected:
             self.CLEAN_WHILE_WAIT_FOR_DATA = True
+            if detected[0].plane_name in SUPPORTED_CRAFTS:
+                self.prefetcher.plane_loaded(plane=SUPPORTED_CRAFTS[detected[0].plane_name]['bios'])
+
+    def _check_switch_time(self, switch_stats: PlaneSwitchStats) -> None:
+        """
+        Warn when aircraft switch takes longer than one DCS-BIOS frame.
+
+        :param switch_stats: duration of phases of switch
+        """
+        frame_interval_ms = self.parser.stats.frame_interval * 1000
+        if frame_interval_ms and switch_stats.total_ms > frame_interval_ms:
+            LOG.warning(f'Aircraft switch takes longer than frame ({frame_interval_ms:.1f} ms): {switch_stats}')
+
+    def _is_bios_ready(self, plane_name: str) -> bool:
+        """
+        Check if DCS-BIOS data of the detected plane can be used without waiting.
+
+        :param plane_name: Short name of plane
+        :return: True for basic supported planes or when data is prefetched
+        """
+        if plane_name not in SUPPORTED_CRAFTS:
+            return True
+        return self.prefetcher.is_ready(plane=SUPPORTED_CRAFTS[plane_name]['bios'])
 
     @staticmethod
     def _supporters(text: str, width: int) -> Iterator[str]:
@@ -92,11 +295,6 @@ class DCSpyStarter:
         :param support_iter: Iterator for banner supporters
         :param exp: Caught exception instance
         """
-        if self.CLEAN_WHILE_WAIT_FOR_DATA:
-            LOG.debug(f'Main loop socket error: {exp}')
-            logi_device.clear(true_clear=True)
-            self.CLEAN_BEFORE_LOAD_PLANE = True
-            self.CLEAN_WHILE_WAIT_FOR_DATA = False
         wait_time = gmtime(time() - start_time)
         logi_device.text = [('     DCSpy       ', Color.orange),
                             ('Logitech LCD OK', Color.lightgreen),
@@ -104,32 +302,79 @@ class DCSpyStarter:
                             (f'{next(support_iter)}', Color.yellow),
                             (ver_string, Color.white)]
 
+    def _clear_on_disconnect(self, logi_devices: Sequence[LogitechDevice], exp: Exception) -> None:
+        """
+        Clear LCD of all devices once, when DCS is disconnected.
+
+        :param logi_devices: Logitech devices sharing DCS-BIOS data
+        :param exp: Caught exception instance
+        """
+        if self.CLEAN_WHILE_WAIT_FOR_DATA:
+            LOG.debug(f'Main loop socket error: {exp}')
+            for logi_device in logi_devices:
+                logi_device.clear(true_clear=True)
+            self.CLEAN_BEFORE_LOAD_PLANE = True
+            self.CLEAN_WHILE_WAIT_FOR_DATA = False
+
     @staticmethod
     def _prepare_socket() -> socket.socket:
         """
         Prepare a multicast UDP socket for DCS-BIOS communication.
 
+        Receive buffer size and multicast options are taken from configuration.
+
         :return: Socket object
         """
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        DCSpyStarter._set_receive_buffer(sock=sock, size=int(get_config_yaml_item('socket_rcvbuf', 0)))
         sock.bind(RECV_ADDR)
-        mreq = struct.pack('=4sl', socket.inet_aton(MULTICAST_IP), socket.INADDR_ANY)
+        iface = socket.inet_aton(str(get_config_yaml_item('multicast_iface', '0.0.0.0')))
+        mreq = struct.pack('=4s4s', socket.inet_aton(MULTICAST_IP), iface)
         sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, iface)
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, int(get_config_yaml_item('multicast_ttl', 1)))
+        sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, int(bool(get_config_yaml_item('multicast_loop', True))))
         sock.settimeout(0.5)
         return sock
 
+    @staticmethod
+    def _set_receive_buffer(sock: socket.socket, size: int) -> None:
+        """
+        Set size of socket receive buffer and verify it.
+
+        When size is zero, operating system default is used.
+
+        :param sock: UDP socket
+        :param size: Requested size in bytes
+        """
+        if size > 0:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, size)
+        actual = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        if actual < size:
+            LOG.warning(f'Socket receive buffer capped by OS: requested {size} B, got {actual} B')
+        LOG.debug(f'Socket receive buffer: {actual} B')
+
     def __call__(self, *args, **kwargs) -> None:
         """Real starting point of DCSpy."""
+        self.prefetcher.prefetch(get_last_plane(), str(get_config_yaml_item('current_plane', '')))
         with DCSpyStarter._prepare_socket() as dcs_sock:
-            logi_dev = LogitechDevice(parser=self.parser, sock=dcs_sock, model=self.model)
-            LOG.info(f'Loading: {str(logi_dev)}')
-            LOG.debug(f'Loading: {repr(logi_dev)}')
+            logi_devs = [LogitechDevice(parser=self.parser, sock=dcs_sock, model=model, gkeys=not idx) for idx, model in enumerate(self.models)]
+            for logi_dev in logi_devs:
+                LOG.info(f'Loading: {str(logi_dev)}')
+                LOG.debug(f'Loading: {repr(logi_dev)}')
             dcspy_ver = get_version_string(repo=DCSPY_REPO_NAME, current_ver=__version__, check=bool(get_config_yaml_item('check_ver')))
-            self._handle_connection(logi_device=logi_dev, sock=dcs_sock, ver_string=dcspy_ver)
+            buttons_threads = [self._start_lcd_buttons_thread(logi_device=logi_dev) for logi_dev in logi_devs]
+            self._run_main_loop(logi_devices=logi_devs, sock=dcs_sock, ver_string=dcspy_ver)
+            for logi_dev, buttons_thread in zip(logi_devs, buttons_threads):
+                if buttons_thread:
+                    buttons_thread.join()
+                logi_dev.macros.stop()
+        self.prefetcher.shutdown()
         LOG.info('DCSpy stopped.')
-        logi_dev.text = [('     DCSpy       ', Color.orange),
-                         ('DCSpy stopped', Color.red),
-                         ('', Color.black),
-                         (f'DCSpy:    {dcspy_ver}', Color.white),
-                         (f'DCS-BIOS:  {check_bios_ver(bios_path=get_config_yaml_item("dcsbios"))}', Color.white)]
+        for logi_dev in logi_devs:
+            logi_dev.text = [('     DCSpy       ', Color.orange),
+                             ('DCSpy stopped', Color.red),
+                             ('', Color.black),
+                             (f'DCSpy:    {dcspy_ver}', Color.white),
+                             (f'DCS-BIOS:  {check_bios_ver(bios_path=get_config_yaml_item("dcsbios"))}', Color.white)]
@@ -4,34 +4,41 @@ import hashlib
 import json
 import sys
 import zipfile
-from collections.abc import Callable, Generator, Sequence
-from contextlib import suppress
+from collections import OrderedDict
+from collections.abc import Callable, Generator, Iterator, Mapping, Sequence
+from contextlib import contextmanager, suppress
 from datetime import datetime
-from functools import lru_cache
+from functools import wraps
 from glob import glob
+from inspect import signature
 from logging import getLogger
-from os import chdir, environ, getcwd, makedirs, walk
+from os import chdir, environ, getcwd, makedirs, remove, replace, walk
 from pathlib import Path
 from platform import python_implementation, python_version, uname
 from pprint import pformat
 from re import search, sub
 from shutil import rmtree
 from subprocess import CalledProcessError, run
-from tempfile import gettempdir
-from typing import Any, ClassVar
+from tempfile import NamedTemporaryFile, gettempdir
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import Any, ClassVar, TypeVar
 
 import yaml
 from packaging import version
 from PIL import ImageColor
 from requests import get
 
-from dcspy.models import (CONFIG_YAML, CTRL_LIST_SEPARATOR, DEFAULT_YAML_FILE, AnyButton, BiosValue, ButtonTypes, Color, ControlDepiction, ControlKeyData,
-                          DcsBiosPlaneData, DcspyConfigYaml, Gkey, LcdButton, LcdMode, MouseButton, Release, RequestModel, __version__)
+from dcspy.models import (BIOS_CACHE_DIR, BIOS_CACHE_SIZE, BIOS_FINGERPRINT_TTL, CONFIG_YAML, CTRL_LIST_SEPARATOR, DEFAULT_YAML_FILE, KEY_CODES,
+                          LAST_PLANE_FILE, AnyButton, BiosAddressIndex, BiosCacheStats, BiosValue, ButtonCommand, ButtonTypes, Color, ControlDepiction,
+                          ControlKeyData, CycleTracker, DcsBiosPlaneData, DcspyConfigYaml, Gkey, KeyBinding, LazyDcsBiosPlaneData, LcdButton, LcdMode,
+                          MouseButton, Release, RequestModel, __version__, compact_controls)
 
 with suppress(ImportError):
     import git
 
 LOG = getLogger(__name__)
+YAML_LOADER: type[yaml.SafeLoader] = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 with open(DEFAULT_YAML_FILE) as c_file:
     defaults_cfg: DcspyConfigYaml = yaml.load(c_file, Loader=yaml.SafeLoader)
@@ -64,7 +71,7 @@ def load_yaml(full_path: Path) -> DcspyConfigYaml:
     """
     try:
         with open(file=full_path, encoding='utf-8') as yaml_file:
-            data = yaml.load(yaml_file, Loader=yaml.SafeLoader)
+            data = yaml.load(yaml_file, Loader=YAML_LOADER)
             if not isinstance(data, dict):
                 data = {}
     except (FileNotFoundError, yaml.parser.ParserError) as err:
@@ -591,6 +598,44 @@ def get_config_yaml_location() -> Path:
     return user_appdata
 
 
+def get_cache_location() -> Path:
+    """
+    Get a location of cache files, outside of package directory.
+
+    Local application data is used on Windows, XDG cache directory otherwise.
+
+    :return: Path object to directory
+    """
+    localappdata = environ.get('LOCALAPPDATA', None)
+    if localappdata:
+        return Path(localappdata) / 'dcspy'
+    cache_home = environ.get('XDG_CACHE_HOME', None)
+    return (Path(cache_home) if cache_home else Path.home() / '.cache') / 'dcspy'
+
+
+def get_last_plane() -> str:
+    """
+    Get last flown aircraft, it is kept in cache location, not in configuration.
+
+    :return: BIOS plane name or empty string
+    """
+    try:
+        return (get_cache_location() / LAST_PLANE_FILE).read_text(encoding='utf-8').strip()
+    except OSError:
+        return ''
+
+
+def save_last_plane(plane: str) -> None:
+    """
+    Save last flown aircraft.
+
+    :param plane: BIOS plane name
+    """
+    cache_dir = get_cache_location()
+    makedirs(name=cache_dir, exist_ok=True)
+    (cache_dir / LAST_PLANE_FILE).write_text(plane, encoding='utf-8')
+
+
 def run_command(cmd: Sequence[str], cwd: Path | None = None) -> int:
     """
     Run command in shell as a subprocess.
@@ -619,25 +664,410 @@ def load_json(full_path: Path) -> dict[Any, Any]:
     return json.loads(data)
 
 
-@lru_cache
+def get_bios_fingerprint(bios_dir: Path, plane: str | None = None) -> tuple[tuple[str, int, int], ...]:
+    """
+    Get fingerprint of DCS-BIOS JSON files: name, modification time and size of file.
+
+    Fingerprint always contains AircraftAliases.json, for plane also all JSON files of its modules,
+    so change of one module invalidates only planes which use it.
+
+    :param bios_dir: path to DCS-BIOS directory
+    :param plane: BIOS plane name, only aliases file when None
+    :return: Tuple with data of existing files, empty when directory does not exist
+    """
+    json_names = ['AircraftAliases.json']
+    if plane:
+        try:
+            json_names.extend(f'{module}.json' for module in get_plane_aliases(bios_dir=bios_dir).get(plane, []))
+        except (OSError, ValueError):
+            pass
+    fingerprint = []
+    for json_name in json_names:
+        try:
+            stat = (bios_dir / 'doc' / 'json' / json_name).stat()
+        except OSError:
+            continue
+        fingerprint.append((json_name, stat.st_mtime_ns, stat.st_size))
+    return tuple(fingerprint)
+
+
+@contextmanager
+def timed(phases: dict[str, float], name: str) -> Iterator[None]:
+    """
+    Measure duration of code block and store it in milliseconds.
+
+    :param phases: dictionary where duration is stored
+    :param name: name of measured phase
+    """
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = (perf_counter() - start) * 1000
+
+
+BiosFunc = TypeVar('BiosFunc', bound=Callable[..., Any])
+
+
+class VersionedBiosCache:
+    """
+    Bounded LRU cache for functions which read DCS-BIOS JSON files.
+
+    Every entry is stored with the fingerprint of its JSON files, entry with different fingerprint is never used.
+    Decorated function has to accept `bios_dir` parameter, `plane` parameter narrows fingerprint to files of plane.
+    Fingerprint is taken again only after its time to live or invalidation, so hits do not touch files.
+    """
+
+    def __init__(self, maxsize: int, ttl: float = BIOS_FINGERPRINT_TTL) -> None:
+        """
+        Create cache.
+
+        :param maxsize: maximal number of entries
+        :param ttl: time to live of fingerprint in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[Any, ...], tuple[tuple[tuple[str, int, int], ...], Any]] = OrderedDict()
+        self._fingerprints: dict[tuple[Path, str | None], tuple[float, tuple[tuple[str, int, int], ...]]] = {}
+        self._stats = BiosCacheStats(maxsize=maxsize)
+        self._lock = Lock()
+
+    def __call__(self, func: BiosFunc) -> BiosFunc:
+        """
+        Decorate function with cache.
+
+        :param func: function with bios_dir parameter
+        :return: decorated function
+        """
+        func_sig = signature(func)
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound = func_sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__qualname__, *bound.arguments.items())
+            fingerprint = self._fingerprint(bios_dir=Path(bound.arguments['bios_dir']), plane=bound.arguments.get('plane'))
+            with self._lock:
+                entry = self._get(key=key, fingerprint=fingerprint)
+            if entry is not None:
+                return entry[1]
+            value = func(*args, **kwargs)
+            with self._lock:
+                self._put(key=key, fingerprint=fingerprint, value=value)
+            return value
+
+        wrapper.cache_clear = self.invalidate  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    @property
+    def stats(self) -> BiosCacheStats:
+        """
+        Get cache statistics.
+
+        :return: BiosCacheStats model
+        """
+        with self._lock:
+            return self._stats.model_copy(update={'size': len(self._entries)})
+
+    def invalidate(self, bios_dir: Path | None = None, plane: str | None = None) -> None:
+        """
+        Remove entries from cache, i.e. after DCS-BIOS update.
+
+        :param bios_dir: remove only entries for this DCS-BIOS directory, all when None
+        :param plane: remove only entries for this plane, all when None
+        """
+        with self._lock:
+            for key in [key for key in self._entries if self._is_matching(key=key, bios_dir=bios_dir, plane=plane)]:
+                del self._entries[key]
+            for fingerprint_key in [fingerprint_key for fingerprint_key in self._fingerprints if bios_dir is None or fingerprint_key[0] == bios_dir]:
+                del self._fingerprints[fingerprint_key]
+        LOG.debug(f'BIOS cache invalidated for: {bios_dir or "all"} {plane or ""}')
+
+    def _fingerprint(self, bios_dir: Path, plane: str | None) -> tuple[tuple[str, int, int], ...]:
+        """
+        Get fingerprint of DCS-BIOS directory, it is taken again when its time to live has passed.
+
+        :param bios_dir: path to DCS-BIOS directory
+        :param plane: BIOS plane name
+        :return: fingerprint of JSON files
+        """
+        now = monotonic()
+        with self._lock:
+            checked = self._fingerprints.get((bios_dir, plane))
+        if checked is not None and now - checked[0] < self.ttl:
+            return checked[1]
+        fingerprint = get_bios_fingerprint(bios_dir=bios_dir, plane=plane)
+        with self._lock:
+            self._fingerprints[(bios_dir, plane)] = (now, fingerprint)
+        return fingerprint
+
+    @staticmethod
+    def _is_matching(key: tuple[Any, ...], bios_dir: Path | None, plane: str | None) -> bool:
+        """
+        Check if entry key match DCS-BIOS directory and plane.
+
+        :param key: function name and arguments
+        :param bios_dir: DCS-BIOS directory or None for any
+        :param plane: plane name or None for any
+        :return: True if entry match
+        """
+        arguments = dict(key[1:])
+        return (bios_dir is None or arguments.get('bios_dir') == bios_dir) and (plane is None or arguments.get('plane') == plane)
+
+    def _get(self, key: tuple[Any, ...], fingerprint: tuple[tuple[str, int, int], ...]) -> tuple[Any, Any] | None:
+        """
+        Get entry with the same fingerprint, stale entry is removed.
+
+        :param key: function name and arguments
+        :param fingerprint: current fingerprint of DCS-BIOS directory
+        :return: entry with fingerprint and value or None
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry
+        if entry is not None:
+            del self._entries[key]
+            self._stats.stale += 1
+        self._stats.misses += 1
+        return None
+
+    def _put(self, key: tuple[Any, ...], fingerprint: tuple[tuple[str, int, int], ...], value: Any) -> None:
+        """
+        Store value in cache, the least recently used entries are removed above max size.
+
+        :param key: function name and arguments
+        :param fingerprint: fingerprint of DCS-BIOS directory
+        :param value: value to store
+        """
+        self._entries[key] = (fingerprint, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+
+bios_cache = VersionedBiosCache(maxsize=BIOS_CACHE_SIZE)
+
+
+@bios_cache
 def get_full_bios_for_plane(plane: str, bios_dir: Path) -> DcsBiosPlaneData:
     """
     Collect full BIOS for plane with name.
 
+    Merged data is cached on disk and reused until any of source JSON files changes.
+
     :param plane: BIOS plane name
     :param bios_dir: path to DCS-BIOS directory
     :return: dict
     """
-    alias_path = bios_dir / 'doc' / 'json' / 'AircraftAliases.json'
+    sections = _compact_bios_for_plane(plane=plane, bios_dir=bios_dir, cache_dir=get_bios_cache_dir())
+    return DcsBiosPlaneData.model_validate_json(_join_sections(sections=sections))
+
+
+@bios_cache
+def get_lazy_bios_for_plane(plane: str, bios_dir: Path) -> LazyDcsBiosPlaneData:
+    """
+    Collect BIOS for plane with name, without validation.
+
+    Only Controls which are used are validated, at first access.
+    It is enough for the client, use `get_full_bios_for_plane` to get all validated data.
+
+    :param plane: BIOS plane name
+    :param bios_dir: path to DCS-BIOS directory
+    :return: LazyDcsBiosPlaneData instance
+    """
+    return LazyDcsBiosPlaneData(sections=_compact_bios_for_plane(plane=plane, bios_dir=bios_dir, cache_dir=get_bios_cache_dir()))
+
+
+def _compact_bios_for_plane(plane: str, bios_dir: Path, cache_dir: Path) -> dict[str, dict[str, str]]:
+    """
+    Load compact JSON strings of Controls for plane from disk cache or build them from JSON files.
+
+    :param plane: BIOS plane name
+    :param bios_dir: path to DCS-BIOS directory
+    :param cache_dir: path to directory with disk cache
+    :return: JSON strings of Controls with name, grouped in sections
+    """
+    json_files = _get_json_files_for_plane(plane=plane, bios_dir=bios_dir)
+    cache_file = cache_dir / f'{plane}.json'
+    sections = _load_bios_cache(cache_file=cache_file, sources=json_files)
+    if sections is None:
+        stamps = _source_stamps(sources=json_files)
+        sections = compact_controls(raw_data=_merge_json_files(json_files=json_files))
+        _save_bios_cache(cache_file=cache_file, stamps=stamps, sections=sections)
+    return sections
+
+
+def _join_sections(sections: Mapping[str, Mapping[str, str]]) -> str:
+    """
+    Join compact JSON strings of Controls into JSON document of plane.
+
+    :param sections: JSON strings of Controls with name, grouped in sections
+    :return: JSON document
+    """
+    return '{' + ','.join(f'{json.dumps(section)}:{{{",".join(f"{json.dumps(ctrl)}:{data}" for ctrl, data in controllers.items())}}}'
+                          for section, controllers in sections.items()) + '}'
+
+
+@bios_cache
+def get_address_index_for_plane(plane: str, bios_dir: Path) -> BiosAddressIndex:
+    """
+    Get reverse index from export address to outputs of Controls for plane with name.
+
+    Works for any plane from aircraft aliases, also with only basic support.
+
+    :param plane: BIOS plane name
+    :param bios_dir: path to DCS-BIOS directory
+    :return: BiosAddressIndex instance
+    """
+    return get_full_bios_for_plane(plane=plane, bios_dir=bios_dir).address_index
+
+
+def _get_json_files_for_plane(plane: str, bios_dir: Path) -> list[Path]:
+    """
+    Get a list of JSON files with BIOS for plane, based on aircraft aliases.
+
+    :param plane: BIOS plane name
+    :param bios_dir: path to DCS-BIOS directory
+    :return: List of paths to JSON files
+    """
+    json_dir = bios_dir / 'doc' / 'json'
+    aircraft_aliases = load_json(full_path=json_dir / 'AircraftAliases.json')
+    return [json_dir / f'{json_file}.json' for json_file in aircraft_aliases[plane]]
+
+
+def _merge_json_files(json_files: Sequence[Path]) -> dict[str, Any]:
+    """
+    Load JSON files and merge them in one pass, sections from later files replace earlier ones.
+
+    :param json_files: Paths to JSON files
+    :return: Merged data
+    """
     local_json: dict[str, Any] = {}
-    aircraft_aliases = load_json(full_path=alias_path)
-    for json_file in aircraft_aliases[plane]:
-        local_json = {**local_json, **load_json(full_path=bios_dir / 'doc' / 'json' / f'{json_file}.json')}
+    for json_file in json_files:
+        local_json.update(load_json(full_path=json_file))
+    return local_json
+
 
-    return DcsBiosPlaneData.model_validate(local_json)
+def get_bios_cache_dir() -> Path:
+    """
+    Get a location of compiled DCS-BIOS cache.
+
+    :return: Path object to directory
+    """
+    return get_cache_location() / BIOS_CACHE_DIR
+
+
+def _file_digest(file_path: Path) -> str:
+    """
+    Compute SHA-256 digest of file.
+
+    :param file_path: Path to file
+    :return: Hex digest
+    """
+    with open(file_path, 'rb') as f_path:
+        return hashlib.sha256(f_path.read()).hexdigest()
+
+
+def _source_stamps(sources: Sequence[Path]) -> dict[str, tuple[int, int, str]]:
+    """
+    Get modification time, size and digest of all source files.
+
+    :param sources: Paths to source files
+    :return: Dictionary with path as key and tuple with stamps as value
+    """
+    stamps = {}
+    for source in sources:
+        stat = source.stat()
+        stamps[str(source)] = (stat.st_mtime_ns, stat.st_size, _file_digest(source))
+    return stamps
 
 
-@lru_cache
+def _current_stamp(source: Path, stamp: tuple[int, int, str]) -> tuple[int, int, str] | None:
+    """
+    Get current stamp of source file, if its content is the same as when stamp was taken.
+
+    Digest is computed only when modification time or size is different.
+
+    :param source: Path to source file
+    :param stamp: Modification time, size and digest of file
+    :return: Stamp with current modification time or None if file was changed
+    """
+    stat = source.stat()
+    if (stat.st_mtime_ns, stat.st_size) == stamp[:2]:
+        return stamp
+    if stat.st_size != stamp[1] or _file_digest(source) != stamp[2]:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stamp[2]
+
+
+def _load_bios_cache(cache_file: Path, sources: Sequence[Path]) -> dict[str, dict[str, str]] | None:
+    """
+    Load compact DCS-BIOS data of plane from JSON cache file.
+
+    Cache is plain JSON, so nothing but strings can be loaded from it, Controls are validated later.
+    When only modification time of source was changed, i.e. file was touched, stamps in cache file are updated.
+
+    :param cache_file: Path to cache file
+    :param sources: Paths to source JSON files
+    :return: Cached data or None when cache is missing, broken or outdated
+    """
+    try:
+        cache = load_json(full_path=cache_file)
+        cached_stamps = {source: tuple(stamp) for source, stamp in cache['sources'].items()}
+        if cache['version'] != __version__ or list(cached_stamps) != [str(source) for source in sources] or not _is_compact_bios(cache['bios']):
+            return None
+        stamps = {str(source): _current_stamp(source=source, stamp=cached_stamps[str(source)]) for source in sources}
+        if None in stamps.values():
+            return None
+        if stamps != cached_stamps:
+            _save_bios_cache(cache_file=cache_file, stamps=stamps, sections=cache['bios'])
+        LOG.debug(f'Loaded BIOS from cache: {cache_file}')
+        return cache['bios']
+    except (OSError, AttributeError, KeyError, TypeError, ValueError) as err:
+        LOG.debug(f'BIOS cache {cache_file} not used: {type(err).__name__}: {err}')
+        return None
+
+
+def _is_compact_bios(sections: Any) -> bool:
+    """
+    Check if data has structure of compact DCS-BIOS data: sections with JSON strings of Controls.
+
+    :param sections: data loaded from cache file
+    :return: True if structure is correct
+    """
+    return isinstance(sections, dict) and all(isinstance(controllers, dict) and all(isinstance(data, str) for data in controllers.values())
+                                              for controllers in sections.values())
+
+
+def _save_bios_cache(cache_file: Path, stamps: Mapping[str, tuple[int, int, str] | None], sections: Mapping[str, Mapping[str, str]]) -> None:
+    """
+    Save compact DCS-BIOS data of plane to JSON cache file.
+
+    Every writer uses its own temporary file, which replaces cache file when it is complete.
+
+    :param cache_file: Path to cache file
+    :param stamps: Stamps of source JSON files, taken before they were read
+    :param sections: JSON strings of Controls with name, grouped in sections
+    """
+    tmp_file = ''
+    try:
+        makedirs(name=cache_file.parent, exist_ok=True)
+        with NamedTemporaryFile(mode='w', encoding='utf-8', dir=cache_file.parent, prefix=f'{cache_file.stem}.', suffix='.tmp', delete=False) as json_file:
+            tmp_file = json_file.name
+            json.dump({'version': __version__, 'sources': stamps, 'bios': sections}, json_file, separators=(',', ':'))
+        replace(tmp_file, cache_file)
+        LOG.debug(f'Saved BIOS cache: {cache_file}')
+    except (OSError, TypeError, ValueError) as err:
+        LOG.warning(f'Can not save BIOS cache {cache_file}: {err}')
+        if tmp_file:
+            with suppress(OSError):
+                remove(tmp_file)
+
+
+@bios_cache
 def get_inputs_for_plane(plane: str, bios_dir: Path) -> dict[str, dict[str, ControlKeyData]]:
     """
     Get dict with all not empty inputs for plane.
@@ -666,7 +1096,7 @@ def get_list_of_ctrls(inputs: dict[str, dict[str, ControlKeyData]]) -> list[str]
     return result_list
 
 
-@lru_cache
+@bios_cache
 def get_planes_list(bios_dir: Path) -> list[str]:
     """
     Get a list of all DCS-BIOS supported planes with clickable cockpit.
@@ -678,7 +1108,7 @@ def get_planes_list(bios_dir: Path) -> list[str]:
     return [name for name, yaml_data in aircraft_aliases.items() if yaml_data not in (['CommonData', 'FC3'], ['CommonData'])]
 
 
-@lru_cache
+@bios_cache
 def get_plane_aliases(bios_dir: Path, plane: str | None = None) -> dict[str, list[str]]:
     """
     Get a list of all YAML files for plane with name.
@@ -775,6 +1205,126 @@ def get_key_instance(key_str: str) -> AnyButton:
     raise AttributeError(f'Could not resolve "{key_str}" to a Gkey/LcdButton/MouseButton instance')
 
 
+FileStamp = tuple[int, int] | None
+
+
+class YamlCache:
+    """
+    Parsed YAML files and key bindings compiled from them, shared by all instances of aircraft.
+
+    Entry is valid until modification time or size of file changes,
+    then only key bindings with changed request are compiled again.
+    """
+
+    def __init__(self) -> None:
+        """Create empty cache."""
+        self._data: dict[Path, tuple[FileStamp, DcspyConfigYaml]] = {}
+        self._bindings: dict[Path, tuple[FileStamp, dict[str, KeyBinding]]] = {}
+        self._lock = Lock()
+
+    def load(self, full_path: Path) -> DcspyConfigYaml:
+        """
+        Load YAML file, parsed data is reused until file changes.
+
+        :param full_path: Full path to YAML file
+        :return: Copy of dictionary with data
+        """
+        stamp = self._stamp(full_path=full_path)
+        with self._lock:
+            stored_stamp, data = self._data.get(full_path, (None, None))
+        if data is None or stored_stamp != stamp:
+            data = load_yaml(full_path=full_path)
+            self._store(cache=self._data, full_path=full_path, entry=(stamp, data))
+        return dict(data)
+
+    def save(self, data: DcspyConfigYaml, full_path: Path) -> None:
+        """
+        Save YAML file and keep saved data, so it is not parsed again.
+
+        :param data: Dictionary with data
+        :param full_path: Full path to YAML file
+        """
+        save_yaml(data=data, full_path=full_path)
+        self._store(cache=self._data, full_path=full_path, entry=(self._stamp(full_path=full_path), dict(data)))
+
+    def bindings(self, yaml_path: Path) -> dict[str, KeyBinding]:
+        """
+        Get compiled key bindings of aircraft YAML file.
+
+        :param yaml_path: Path to the airplane YAML file
+        :return: Dictionary with key name as key
+        """
+        stamp = self._stamp(full_path=yaml_path)
+        with self._lock:
+            previous_stamp, previous = self._bindings.get(yaml_path, (None, {}))
+        if stamp is not None and stamp == previous_stamp:
+            return previous
+        bindings = self._compile(data=self.load(full_path=yaml_path), previous=previous)
+        self._store(cache=self._bindings, full_path=yaml_path, entry=(stamp, bindings))
+        return bindings
+
+    def invalidate(self, full_path: Path | None = None) -> None:
+        """
+        Remove entries from cache.
+
+        :param full_path: remove only entries for this file, all when None
+        """
+        with self._lock:
+            for cache in (self._data, self._bindings):
+                for path in [path for path in cache if full_path is None or path == full_path]:
+                    del cache[path]
+
+    def _store(self, cache: dict[Path, Any], full_path: Path, entry: tuple[FileStamp, Any]) -> None:
+        """
+        Store entry, entry of file which can not be accessed is not stored.
+
+        :param cache: dictionary with entries
+        :param full_path: Full path to YAML file
+        :param entry: tuple with stamp of file and value
+        """
+        if entry[0] is not None:
+            with self._lock:
+                cache[full_path] = entry
+
+    @staticmethod
+    def _compile(data: DcspyConfigYaml, previous: dict[str, KeyBinding]) -> dict[str, KeyBinding]:
+        """
+        Compile key bindings, bindings with unchanged request are reused.
+
+        :param data: Dictionary with key name and raw request
+        :param previous: Previously compiled key bindings
+        :return: Dictionary with key name as key
+        """
+        bindings = {}
+        for key_str, request in data.items():
+            if not request:
+                continue
+            binding = previous.get(key_str)
+            if binding is None or binding.request != str(request):
+                binding = KeyBinding.from_request(key=get_key_instance(key_str), request=str(request))
+            bindings[key_str] = binding
+        reused = sum(binding is previous.get(key_str) for key_str, binding in bindings.items())
+        LOG.debug(f'Key bindings compiled: {len(bindings) - reused}, reused: {reused}')
+        return bindings
+
+    @staticmethod
+    def _stamp(full_path: Path) -> FileStamp:
+        """
+        Get modification time and size of file.
+
+        :param full_path: Full path to file
+        :return: tuple with modification time in nanoseconds and size or None
+        """
+        try:
+            stat = full_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+
+yaml_cache = YamlCache()
+
+
 class KeyRequest:
     """Map LCD button or G-Key with an abstract request model."""
 
@@ -782,20 +1332,20 @@ class KeyRequest:
         """
         Load YAML with BIOS request for G-Keys and LCD buttons.
 
+        Compiled key bindings are shared with other instances of aircraft and reused until YAML file changes.
+
         :param yaml_path: Path to the airplane YAML file.
         :param get_bios_fn: Function used to get a current BIOS value.
         """
-        plane_yaml = load_yaml(full_path=yaml_path)
         self.buttons: dict[AnyButton, RequestModel] = {}
-        for key_str, request in plane_yaml.items():
-            if request:
-                key = get_key_instance(key_str)
-                self.buttons[key] = RequestModel.from_request(key=key, request=request, get_bios_fn=get_bios_fn)
-
-    @property
-    def cycle_button_ctrl_name(self) -> dict[str, int]:
-        """Return a dictionary with BIOS selectors to track changes of values for a cycle button to get current values."""
-        return {req_model.ctrl_name: int() for req_model in self.buttons.values() if req_model.is_cycle}
+        self.commands: dict[AnyButton, ButtonCommand] = {}
+        self._empty_command = ButtonCommand.from_request_model(RequestModel.make_empty(key=LcdButton.NONE))
+        self._codes: list[ButtonCommand] = [self._empty_command] * KEY_CODES
+        for binding in yaml_cache.bindings(yaml_path=yaml_path).values():
+            req_model, command = binding.bind(get_bios_fn=get_bios_fn)
+            self.buttons[req_model.key] = req_model
+            self._set_command(button=req_model.key, command=command)
+        self.cycles = CycleTracker(requests=self.buttons.values())
 
     def get_request(self, button: AnyButton) -> RequestModel:
         """
@@ -806,14 +1356,50 @@ class KeyRequest:
         """
         return self.buttons.get(button, RequestModel.make_empty(key=button))
 
+    def get_command(self, button: AnyButton) -> ButtonCommand:
+        """
+        Get precompiled request to be sent for requested button.
+
+        :param button: LcdButton, Gkey or MouseButton
+        :return: ButtonCommand object
+        """
+        return self.commands.get(button, self._empty_command)
+
+    def get_command_by_code(self, code: int) -> ButtonCommand:
+        """
+        Get precompiled request for integer key code of button, without creating button instance.
+
+        :param code: key code of LcdButton, Gkey or MouseButton
+        :return: ButtonCommand object
+        """
+        if 0 <= code < KEY_CODES:
+            return self._codes[code]
+        return self._empty_command
+
     def set_request(self, button: AnyButton, req: str) -> None:
         """
         Update the internal string request for the specified button.
 
+        Precompiled request is rebuilt only when request was changed.
+
         :param button: LcdButton, Gkey or MouseButton
         :param req: The raw request to set.
         """
-        self.buttons[button].raw_request = req
+        req_model = self.buttons[button]
+        if req_model.raw_request != req:
+            req_model.raw_request = req
+            self._set_command(button=button, command=ButtonCommand.from_request_model(req_model))
+
+    def _set_command(self, button: AnyButton, command: ButtonCommand) -> None:
+        """
+        Store precompiled request for button and its key code.
+
+        :param button: LcdButton, Gkey or MouseButton
+        :param command: ButtonCommand object
+        """
+        self.commands[button] = command
+        if 0 <= button.code < KEY_CODES:
+            self._codes[button.code] = command
 
 
 def generate_bios_jsons_with_lupa(dcs_save_games: Path, local_compile='./Scripts/DCS-BIOS/test/compile/LocalCompile.lua') -> None:
@@ -0,0 +1,239 @@
+import os
+import select
+import struct
+import sys
+from collections.abc import Callable, Iterable
+from ctypes import CDLL, get_errno
+from ctypes.util import find_library
+from logging import getLogger
+from pathlib import Path
+from threading import Event, Thread
+
+from dcspy.models import BIOS_WATCHER_INTERVAL, BIOS_WATCHER_SETTLE
+from dcspy.utils import bios_cache, get_bios_cache_dir, get_full_bios_for_plane, get_plane_aliases
+
+LOG = getLogger(__name__)
+ALIASES_JSON = 'AircraftAliases.json'
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class PollingBackend:
+    """Detect changes of JSON files by comparing modification time and size of files."""
+
+    def __init__(self, json_dir: Path, stop_event: Event) -> None:
+        """
+        Create backend and take first snapshot of directory.
+
+        :param json_dir: path to directory with JSON files
+        :param stop_event: event which interrupt waiting
+        """
+        self.json_dir = json_dir
+        self._stop_event = stop_event
+        self._snapshot = self._take_snapshot()
+
+    def wait(self, timeout: float) -> set[str]:
+        """
+        Wait and return names of changed files.
+
+        :param timeout: time to wait in seconds
+        :return: set of changed JSON file names
+        """
+        self._stop_event.wait(timeout)
+        snapshot = self._take_snapshot()
+        changed = {name for name in snapshot.keys() | self._snapshot.keys() if snapshot.get(name) != self._snapshot.get(name)}
+        self._snapshot = snapshot
+        return changed
+
+    def close(self) -> None:
+        """Nothing to release for polling."""
+
+    def _take_snapshot(self) -> dict[str, tuple[int, int]]:
+        """
+        Get modification time and size of all JSON files.
+
+        :return: dictionary with file name as key
+        """
+        try:
+            with os.scandir(self.json_dir) as json_dir:
+                return {entry.name: (entry.stat().st_mtime_ns, entry.stat().st_size) for entry in json_dir if entry.name.endswith('.json')}
+        except OSError:
+            return {}
+
+
+class InotifyBackend:
+    """Detect changes of JSON files with Linux inotify API, without periodic scanning of directory."""
+
+    def __init__(self, json_dir: Path) -> None:
+        """
+        Create inotify instance and watch directory.
+
+        :param json_dir: path to directory with JSON files
+        :raise OSError: when inotify is not available or directory can not be watched
+        """
+        self.json_dir = json_dir
+        libc = CDLL(find_library('c'), use_errno=True)
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(get_errno(), 'inotify_init1 failed')
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        if libc.inotify_add_watch(self._fd, os.fsencode(json_dir), mask) < 0:
+            os.close(self._fd)
+            raise OSError(get_errno(), f'inotify_add_watch failed for: {json_dir}')
+
+    def wait(self, timeout: float) -> set[str]:
+        """
+        Wait for inotify events and return names of changed files.
+
+        :param timeout: time to wait in seconds
+        :return: set of changed JSON file names
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        return {name for name in self.parse_events(os.read(self._fd, 64 * 1024)) if name.endswith('.json')}
+
+    def close(self) -> None:
+        """Close inotify file descriptor."""
+        os.close(self._fd)
+
+    @staticmethod
+    def parse_events(buffer: bytes) -> list[str]:
+        """
+        Get file names from raw inotify events.
+
+        :param buffer: bytes read from inotify file descriptor
+        :return: list of file names
+        """
+        names = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(buffer):
+            _, _, _, name_len = EVENT_HEADER.unpack_from(buffer, offset)
+            offset += EVENT_HEADER.size
+            names.append(os.fsdecode(buffer[offset:offset + name_len].rstrip(b'\0')))
+            offset += name_len
+        return names
+
+
+def affected_planes(bios_dir: Path, changed_files: Iterable[str]) -> set[str]:
+    """
+    Get planes which use any of changed JSON files.
+
+    Change of aircraft aliases affects all planes.
+
+    :param bios_dir: path to DCS-BIOS directory
+    :param changed_files: names of changed JSON files
+    :return: set of BIOS plane names
+    """
+    changed_modules = {file_name.removesuffix('.json') for file_name in changed_files}
+    try:
+        aliases = get_plane_aliases(bios_dir=bios_dir)
+    except (OSError, ValueError) as err:
+        LOG.debug(f'Can not read aircraft aliases: {err}')
+        return set()
+    if ALIASES_JSON.removesuffix('.json') in changed_modules:
+        return set(aliases)
+    return {plane for plane, modules in aliases.items() if changed_modules.intersection(modules)}
+
+
+class BiosWatcher(Thread):
+    """Watch DCS-BIOS JSON files and rebuild cached data only for affected planes."""
+
+    def __init__(self, bios_dir: Path, callback: Callable[[set[str]], None], interval: float = BIOS_WATCHER_INTERVAL, polling: bool = False) -> None:
+        """
+        Create watcher thread.
+
+        :param bios_dir: path to DCS-BIOS directory
+        :param callback: called with set of affected plane names, from watcher thread
+        :param interval: polling interval and timeout of waiting for inotify events in seconds
+        :param polling: force polling backend, inotify is used on Linux otherwise
+        """
+        super().__init__(name='dcspy-bios-watcher', daemon=True)
+        self.bios_dir = bios_dir
+        self.callback = callback
+        self.interval = interval
+        self.polling = polling
+        self._stop_event = Event()
+
+    def run(self) -> None:
+        """Wait for changes of JSON files until stopped."""
+        backend = self._get_backend()
+        LOG.debug(f'Watching DCS-BIOS with: {type(backend).__name__}')
+        try:
+            while not self._stop_event.is_set():
+                changed = self._wait_for_changes(backend=backend)
+                if changed and not self._stop_event.is_set():
+                    self.rebuild(changed_files=changed)
+        finally:
+            backend.close()
+
+    def stop(self) -> None:
+        """Stop watching, thread finish after current wait."""
+        self._stop_event.set()
+
+    def rebuild(self, changed_files: set[str]) -> set[str]:
+        """
+        Invalidate and rebuild cached data of planes which use changed files.
+
+        Disk cache is rebuilt only for planes which were already compiled.
+
+        :param changed_files: names of changed JSON files
+        :return: set of affected plane names
+        """
+        planes = affected_planes(bios_dir=self.bios_dir, changed_files=changed_files)
+        LOG.info(f'DCS-BIOS files changed: {", ".join(sorted(changed_files))}, affected planes: {len(planes)}')
+        for plane in planes:
+            bios_cache.invalidate(bios_dir=self.bios_dir, plane=plane)
+            if (get_bios_cache_dir() / f'{plane}.json').is_file():
+                self._rebuild_plane(plane=plane)
+        if planes:
+            self.callback(planes)
+        return planes
+
+    def _rebuild_plane(self, plane: str) -> None:
+        """
+        Compile DCS-BIOS data of plane again.
+
+        :param plane: BIOS plane name
+        """
+        try:
+            get_full_bios_for_plane(plane=plane, bios_dir=self.bios_dir)
+        except (OSError, KeyError, ValueError) as err:
+            LOG.warning(f'Can not rebuild BIOS for: {plane}: {err}')
+
+    def _wait_for_changes(self, backend: PollingBackend | InotifyBackend) -> set[str]:
+        """
+        Wait for changes and collect burst of changes, i.e. when DCS-BIOS regenerate all files.
+
+        :param backend: backend used to detect changes
+        :return: set of changed JSON file names
+        """
+        changed = backend.wait(timeout=self.interval)
+        while changed and not self._stop_event.is_set():
+            more_changed = backend.wait(timeout=BIOS_WATCHER_SETTLE)
+            if not more_changed:
+                break
+            changed |= more_changed
+        return changed
+
+    def _get_backend(self) -> PollingBackend | InotifyBackend:
+        """
+        Get inotify backend on Linux with fallback to polling.
+
+        Inotify exists only on Linux, polling is always used on other systems, i.e. on Windows.
+
+        :return: backend instance
+        """
+        json_dir = self.bios_dir / 'doc' / 'json'
+        if not self.polling and sys.platform.startswith('linux'):
+            try:
+                return InotifyBackend(json_dir=json_dir)
+            except (OSError, AttributeError) as err:
+                LOG.debug(f'Inotify not available, fallback to polling: {err}')
+        return PollingBackend(json_dir=json_dir, stop_event=self._stop_event)
@@ -15,6 +15,14 @@ def sock():
     return MagicMock()
 
 
+@fixture(autouse=True)
+def bios_cache_dir(tmp_path_factory) -> Iterator[Path]:
+    """Keep compiled DCS-BIOS cache outside of source tree."""
+    cache_dir = tmp_path_factory.getbasetemp() / 'bios_cache'
+    with patch('dcspy.utils.get_bios_cache_dir', return_value=cache_dir), patch('dcspy.watcher.get_bios_cache_dir', return_value=cache_dir):
+        yield cache_dir
+
+
 def generate_plane_fixtures(plane, lcd_info: models.LcdInfo, fonts: models.FontsConfig):
     """
     Generate fixtures for any plane with any lcd type.
@@ -5,7 +5,7 @@ from unittest.mock import patch
 
 from pytest import mark, raises
 
-from dcspy.models import KEY_DOWN, ApacheEufdMode, LcdButton
+from dcspy.models import KEY_DOWN, ApacheEufdMode, CockpitStore, LcdButton
 from tests.helpers import all_plane_list, compare_images, set_bios_during_test
 
 
@@ -31,6 +31,7 @@ def test_aircraft_base_class_set_bios(selector, data, value, c_func, effect, pla
 
     with patch.object(LcdSdkManager, c_func, return_value=True), \
             patch.object(LcdSdkManager, 'logi_lcd_update', return_value=True):
+        assert isinstance(aircraft.bios_data, CockpitStore)
         assert aircraft.bios_data[selector]['value'] == ''
         assert aircraft.get_bios('none') == ''
         with raises(NotImplementedError):
@@ -295,6 +296,14 @@ def test_set_bios_for_airplane(plane, bios_pairs, result, request):
     assert plane.bios_data[bios_pairs[0][0]] == result
 
 
+def test_hornet_readers_follow_bios_data(fa18chornet_mono):
+    fa18chornet_mono.set_bios('UFC_COMM1_DISPLAY', '`3')
+    fa18chornet_mono.bios_data.update({'IFEI_FUEL_UP': '10780'})
+    assert fa18chornet_mono._comm[0]() == '13'
+    assert fa18chornet_mono._fuel_up() == '10780'
+    assert fa18chornet_mono.get_bios('IFEI_FUEL_UP', 0) == 10780
+
+
 @mark.benchmark
 @mark.parametrize('plane, bios_pairs, mode', [
     ('ah64dblkii_mono', [('PLT_EUFD_LINE1', 'ENGINE 1 OUT      |AFT FUEL LOW      |TAIL WHL LOCK SEL ')], 'IDM'),
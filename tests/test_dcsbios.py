@@ -115,6 +115,129 @@ def test_simple_instance_of_buffers(class_name, params, protocol_parser):
     assert 'on_dcsbios_write' in dir(buff)
 
 
+def test_shared_buffer(protocol_parser):
+    from dcspy.dcsbios import IntegerBuffer, release_buffer, shared_buffer
+
+    values = []
+    params = {'address': 0x1938, 'mask': 0x200, 'shift_by': 0x9}
+    key1 = shared_buffer(parser=protocol_parser, klass='IntegerBuffer', callback=values.append, **params)
+    key2 = shared_buffer(parser=protocol_parser, klass='IntegerBuffer', callback=print, **params)
+    assert key1 == key2
+    assert len(protocol_parser.write_callbacks) == 1
+    assert isinstance(protocol_parser.buffers[key1], IntegerBuffer)
+    assert protocol_parser.buffers[key1].callbacks == {values.append, print}
+
+    release_buffer(parser=protocol_parser, key=key1, callback=print)
+    assert protocol_parser.buffers[key1].callbacks == {values.append}
+    release_buffer(parser=protocol_parser, key=key1, callback=values.append)
+    assert protocol_parser.buffers == {}
+    assert protocol_parser.write_callbacks == set()
+    release_buffer(parser=protocol_parser, key=key1, callback=values.append)
+
+
+def test_subscription(protocol_parser):
+    from dcspy.dcsbios import StringBuffer
+
+    values = []
+    sub1 = protocol_parser.subscribe(klass='StringBuffer', callback=values.append, address=0x1930, max_length=4)
+    sub2 = protocol_parser.subscribe(klass='StringBuffer', callback=print, address=0x1930, max_length=4)
+    assert sub1.key == sub2.key
+    assert isinstance(sub1.buffer, StringBuffer)
+    assert repr(sub1) == f'Subscription(key={sub1.key}, active=True)'
+
+    sub2.cancel()
+    assert sub2.buffer is None
+    assert protocol_parser.buffers[sub1.key].callbacks == {values.append}
+    sub1.cancel()
+    sub1.cancel()
+    assert protocol_parser.buffers == {}
+    assert protocol_parser.write_callbacks == set()
+
+
+def test_subscription_scope(protocol_parser):
+    detection = protocol_parser.subscribe(klass='StringBuffer', callback=print, address=0x0, max_length=0x10)
+    scope = protocol_parser.scope()
+    lamp = scope.subscribe(klass='IntegerBuffer', callback=print, address=0x1000, mask=0x1, shift_by=0)
+    scope.subscribe(klass='IntegerBuffer', callback=print, address=0x1000, mask=0x2, shift_by=1)
+    scope.subscribe(klass='StringBuffer', callback=print, address=0x0, max_length=0x10)
+    assert len(scope) == 3
+    assert len(protocol_parser.buffers) == 3
+
+    lamp.cancel()
+    assert len(scope) == 2
+    assert lamp not in list(scope)
+    scope.cancel()
+    assert len(scope) == 0
+    assert list(protocol_parser.buffers) == [detection.key]
+    assert protocol_parser.buffers[detection.key].callbacks == {print}
+    assert len(protocol_parser.integers) == 0
+
+
+def test_integer_batch(protocol_parser):
+    from dcspy.dcsbios import release_buffer, shared_buffer
+
+    values = []
+    lamp = shared_buffer(parser=protocol_parser, klass='IntegerBuffer', callback=values.append, address=0x1000, mask=0x1, shift_by=0)
+    switch = shared_buffer(parser=protocol_parser, klass='IntegerBuffer', callback=values.append, address=0x1000, mask=0x6, shift_by=1)
+    gauge = shared_buffer(parser=protocol_parser, klass='IntegerBuffer', callback=values.append, address=0x1002, mask=0xffff, shift_by=0)
+    assert len(protocol_parser.integers) == 3
+    assert protocol_parser.write_callbacks == {protocol_parser.integers.on_dcsbios_write}
+
+    for address, data in ((0x1000, 0x1), (0x1000, 0x5), (0x1002, 0x0), (0x1004, 0xff)):
+        protocol_parser.integers.on_dcsbios_write(address=address, data=data)
+    assert values == []
+    protocol_parser.integers.on_dcsbios_write(address=0xfffe, data=0x0)
+    assert sorted(values) == [1, 2]
+    protocol_parser.integers.on_dcsbios_write(address=0x1000, data=0x5)
+    assert protocol_parser.integers.flush() == []
+    protocol_parser.integers.on_dcsbios_write(address=0x1002, data=0x3)
+    assert protocol_parser.integers.flush() == [protocol_parser.buffers[gauge]]
+
+    release_buffer(parser=protocol_parser, key=lamp, callback=values.append)
+    release_buffer(parser=protocol_parser, key=switch, callback=values.append)
+    assert len(protocol_parser.integers) == 1
+    release_buffer(parser=protocol_parser, key=gauge, callback=values.append)
+    assert len(protocol_parser.integers) == 0
+    assert protocol_parser.write_callbacks == set()
+
+
+@mark.benchmark
+def test_integer_batch_process_frame(protocol_parser):
+    from struct import pack
+
+    from dcspy.dcsbios import shared_buffer
+
+    values = []
+    for address in range(0x1000, 0x1040, 2):
+        for bit in range(16):
+            shared_buffer(parser=protocol_parser, klass='IntegerBuffer', callback=values.append, address=address, mask=1 << bit, shift_by=bit)
+    frame = b'\x55' * 4 + pack('<HH', 0x1000, 0x40) + b'\xff' * 0x40 + pack('<HHH', 0xfffe, 0x2, 0x1)
+    for int_byte in frame:
+        protocol_parser.process_byte(int_byte)
+    assert values == [1] * 16 * 32
+
+
+def test_buffers_shadow(protocol_parser):
+    from dcspy.dcsbios import IntegerBuffer, StringBuffer
+
+    values = []
+    int_buff = IntegerBuffer(parser=protocol_parser, address=0x1938, mask=0x200, shift_by=0x9, callback=values.append)
+    str_buff = StringBuffer(parser=protocol_parser, address=0x1930, max_length=4, callback=values.append)
+    int_buff.shadow = 1
+    str_buff.shadow = b'AB'
+    assert int_buff.shadow == 1
+    assert str_buff.shadow == b'AB\x00\x00'
+
+    int_buff.on_dcsbios_write(address=0x1938, data=0x200)
+    str_buff.on_dcsbios_write(address=0x1930, data=0x4241)
+    str_buff.on_dcsbios_write(address=0xfffe, data=0x0)
+    assert values == []
+    int_buff.on_dcsbios_write(address=0x1938, data=0x0)
+    str_buff.on_dcsbios_write(address=0x1932, data=0x43)
+    str_buff.on_dcsbios_write(address=0xfffe, data=0x0)
+    assert values == [0, 'ABC']
+
+
 def test_integer_buffer_callback(protocol_parser):
     from functools import partial
 
@@ -147,3 +270,74 @@ def test_string_buffer_callback(protocol_parser):
     protocol_parser.data = 0x31
     protocol_parser.address = 0x1930
     protocol_parser.process_byte(0x0)
+
+
+@mark.parametrize('count_bytes, malformed, state', [
+    ([0x02, 0x00], 0, ParserState.DATA_LOW),
+    ([0x00, 0x00], 1, ParserState.WAIT_FOR_SYNC),
+    ([0x03, 0x00], 1, ParserState.WAIT_FOR_SYNC),
+], ids=['valid', 'zero count', 'odd count'])
+def test_process_byte_malformed_record(count_bytes, malformed, state, protocol_parser):
+    protocol_parser.state = ParserState.COUNT_LOW
+    for int_byte in count_bytes:
+        protocol_parser.process_byte(int_byte)
+    assert protocol_parser.stats.malformed == malformed
+    assert protocol_parser.state == state
+
+
+def test_process_byte_sync_loss(protocol_parser):
+    protocol_parser.state = ParserState.DATA_LOW
+    protocol_parser.count = 10
+    for _ in range(4):
+        protocol_parser.process_byte(0x55)
+    assert protocol_parser.state == ParserState.ADDRESS_LOW
+    assert protocol_parser.stats.sync_losses == 1
+    assert protocol_parser.stats.frames == 1
+
+
+def test_stream_stats_snapshot(protocol_parser):
+    frame = bytes([0x55, 0x55, 0x55, 0x55, 0x00, 0x10, 0x02, 0x00, 0x01, 0x00])
+    for _ in range(3):
+        protocol_parser.stats.add_datagram(len(frame))
+        for int_byte in frame:
+            protocol_parser.process_byte(int_byte)
+
+    assert protocol_parser.stats.snapshot(new_window=False).frames_per_sec > 0
+    stats = protocol_parser.stats.snapshot()
+    assert stats.datagrams == 3
+    assert stats.bytes == 30
+    assert stats.frames == 3
+    assert stats.sync_losses == 0
+    assert stats.malformed == 0
+    assert stats.frames_per_sec > 0
+    assert stats.frame_interval_ms > 0
+    assert protocol_parser.stats.snapshot().frames_per_sec == 0
+
+
+SYNC = [0x55, 0x55, 0x55, 0x55]
+VALID = bytes([*SYNC, 0x00, 0x10, 0x02, 0x00, 0x01, 0x00])
+TRUNCATED = bytes([*SYNC, 0x00, 0x10, 0x04, 0x00, 0x01])
+ODD_COUNT = bytes([*SYNC, 0x00, 0x10, 0x03, 0x00, 0x01, 0x00, 0x00])
+ZERO_COUNT = bytes([*SYNC, 0x00, 0x10, 0x00, 0x00])
+OVERFLOW = bytes([*SYNC, 0xfe, 0xff, 0x04, 0x00, 0x01, 0x00, 0x02, 0x00])
+
+
+@mark.parametrize('datagrams, frames, sync_losses, malformed', [
+    ([VALID] * 5, 5, 0, 0),
+    ([VALID, TRUNCATED, VALID, TRUNCATED, TRUNCATED, VALID], 6, 3, 0),
+    ([VALID, ODD_COUNT, ZERO_COUNT, OVERFLOW, VALID], 5, 0, 3),
+    ([VALID, TRUNCATED, VALID, ODD_COUNT, VALID, TRUNCATED, OVERFLOW, ZERO_COUNT, VALID, VALID], 10, 2, 3),
+], ids=['clean', 'lost frames', 'malformed', 'mixed'])
+def test_stream_counters(datagrams, frames, sync_losses, malformed, protocol_parser):
+    for datagram in datagrams:
+        protocol_parser.stats.add_datagram(len(datagram))
+        for int_byte in datagram:
+            protocol_parser.process_byte(int_byte)
+
+    stats = protocol_parser.stats.snapshot()
+    assert stats.datagrams == len(datagrams)
+    assert stats.bytes == sum(len(datagram) for datagram in datagrams)
+    assert stats.frames == frames
+    assert stats.sync_losses == sync_losses
+    assert stats.malformed == malformed
+    assert protocol_parser.state == ParserState.ADDRESS_LOW
@@ -28,64 +28,64 @@ def test_all_failure_cases(function, lcd, args, result):
     assert getattr(lcd_sdk, function)(*args) is result
 
 
-@mark.parametrize('c_func, effect, lcd, size', [
-    ('logi_lcd_mono_set_background', [True], LcdType.MONO, (16, 4)),
-    ('logi_lcd_color_set_background', [False, True], LcdType.COLOR, (32, 24))
+@mark.parametrize('c_func, lcd, size', [
+    ('logi_lcd_mono_set_background', LcdType.MONO, (16, 4)),
+    ('logi_lcd_color_set_background', LcdType.COLOR, (32, 24))
 ], ids=['Mono', 'Color'])
-def test_update_display(c_func, effect, lcd, size):
+def test_update_display(c_func, lcd, size):
     from PIL import Image
 
     from dcspy.sdk.lcd_sdk import LcdSdkManager
 
-    lcd_sdk = LcdSdkManager('test', LcdType.MONO)
+    lcd_sdk = LcdSdkManager('test', lcd)
 
-    with patch.object(lcd_sdk, 'logi_lcd_is_connected', side_effect=effect) as connected, \
+    with patch.object(lcd_sdk, 'logi_lcd_is_connected', return_value=True) as connected, \
             patch.object(lcd_sdk, c_func, return_value=True) as set_background, \
             patch.object(lcd_sdk, 'logi_lcd_update', return_value=True):
         lcd_sdk.update_display(Image.new('1', (size[0], size[1]), 0))
-        connected.assert_called_with(lcd)
+        connected.assert_called_once_with(lcd)
         set_background.assert_called_once_with((0,) * size[0] * size[1])
 
 
-@mark.parametrize('c_func, effect, lcd, list_txt', [
-    ('logi_lcd_mono_set_text', [True], LcdType.MONO, [('0', Color.white), ('1', Color.white), ('2', Color.white), ('3', Color.white), ('4', Color.white)]),
-    ('logi_lcd_color_set_text', [False, True], LcdType.COLOR, [('0', Color.white), ('1', Color.white), ('2', Color.white), ('3', Color.white), ('4', Color.white), ('5', Color.white), ('6', Color.white), ('7', Color.white), ('8', Color.white)])
+@mark.parametrize('c_func, lcd, list_txt', [
+    ('logi_lcd_mono_set_text', LcdType.MONO, [('0', Color.white), ('1', Color.white), ('2', Color.white), ('3', Color.white), ('4', Color.white)]),
+    ('logi_lcd_color_set_text', LcdType.COLOR, [('0', Color.white), ('1', Color.white), ('2', Color.white), ('3', Color.white), ('4', Color.white), ('5', Color.white), ('6', Color.white), ('7', Color.white), ('8', Color.white)])
 ], ids=['Mono', 'Color'])
-def test_update_text(c_func, effect, lcd, list_txt):
+def test_update_text(c_func, lcd, list_txt):
     from dcspy.sdk.lcd_sdk import LcdSdkManager
 
-    lcd_sdk = LcdSdkManager('test', LcdType.MONO)
+    lcd_sdk = LcdSdkManager('test', lcd)
 
-    with patch.object(lcd_sdk, 'logi_lcd_is_connected', side_effect=effect) as connected:
+    with patch.object(lcd_sdk, 'logi_lcd_is_connected', return_value=True) as connected:
         with patch.object(lcd_sdk, c_func, return_value=True) as set_text:
             with patch.object(lcd_sdk, 'logi_lcd_update', return_value=True):
                 lcd_sdk.update_text(list_txt)
-                connected.assert_called_with(lcd)
+                connected.assert_called_once_with(lcd)
                 if lcd == LcdType.MONO:
                     set_text.assert_has_calls([call(i, j[0]) for i, j in enumerate(list_txt)])
                 elif lcd == LcdType.COLOR:
                     set_text.assert_has_calls([call(i, j[0], rgb(j[1])) for i, j in enumerate(list_txt)])
 
 
-@mark.parametrize('c_funcs, effect, lcd, clear, text', [
-    (('logi_lcd_mono_set_background', 'logi_lcd_mono_set_text'), [True],
+@mark.parametrize('c_funcs, lcd, clear, text', [
+    (('logi_lcd_mono_set_background', 'logi_lcd_mono_set_text'),
      LcdType.MONO, [0] * LcdSize.MONO_WIDTH.value * LcdSize.MONO_HEIGHT.value,
      [call(0, ''), call(1, ''), call(2, ''), call(3, '')]),
-    (('logi_lcd_color_set_background', 'logi_lcd_color_set_text'), [False, True],
+    (('logi_lcd_color_set_background', 'logi_lcd_color_set_text'),
      LcdType.COLOR, [(0,) * 4] * LcdSize.COLOR_WIDTH.value * LcdSize.COLOR_HEIGHT.value,
      [call(0, ''), call(1, ''), call(2, ''), call(3, ''), call(4, ''), call(5, ''), call(6, ''), call(7, '')])
 ], ids=['Mono', 'Color'])
-def test_clear_display(c_funcs, effect, lcd, clear, text):
+def test_clear_display(c_funcs, lcd, clear, text):
     from dcspy.sdk.lcd_sdk import LcdSdkManager
 
-    lcd_sdk = LcdSdkManager('test', LcdType.MONO)
+    lcd_sdk = LcdSdkManager('test', lcd)
 
-    with patch.object(lcd_sdk, 'logi_lcd_is_connected', side_effect=effect) as connected, \
+    with patch.object(lcd_sdk, 'logi_lcd_is_connected') as connected, \
             patch.object(lcd_sdk, c_funcs[0], return_value=True) as set_background, \
             patch.object(lcd_sdk, c_funcs[1], return_value=True) as set_text, \
             patch.object(lcd_sdk, 'logi_lcd_update', return_value=True):
         lcd_sdk.clear_display(true_clear=True)
-        connected.assert_called_with(lcd)
+        connected.assert_not_called()
         set_background.assert_called_once_with(clear)
         set_text.assert_has_calls(text)
 
@@ -95,9 +95,11 @@ def test_update_text_no_lcd():
 
     lcd_sdk = LcdSdkManager('test', LcdType.MONO)
 
-    with patch.object(lcd_sdk, 'logi_lcd_is_connected', side_effect=[False, False]) as connected:
+    with patch.object(lcd_sdk, 'logi_lcd_is_connected', return_value=False) as connected, \
+            patch.object(lcd_sdk, 'logi_lcd_mono_set_text') as set_text:
         lcd_sdk.update_text([('0', Color.red), ('1', Color.green)])
-        connected.assert_has_calls([call(LcdType.MONO), call(LcdType.COLOR)])
+        connected.assert_called_once_with(LcdType.MONO)
+        set_text.assert_not_called()
 
 
 def test_update_display_no_lcd():
@@ -107,6 +109,25 @@ def test_update_display_no_lcd():
 
     lcd_sdk = LcdSdkManager('test', LcdType.COLOR)
 
-    with patch.object(lcd_sdk, 'logi_lcd_is_connected', side_effect=[False, False]) as connected:
+    with patch.object(lcd_sdk, 'logi_lcd_is_connected', return_value=False) as connected, \
+            patch.object(lcd_sdk, 'logi_lcd_color_set_background') as set_background:
         lcd_sdk.update_display(Image.new('1', (16, 4), 0))
-        connected.assert_has_calls([call(LcdType.MONO), call(LcdType.COLOR)])
+        connected.assert_called_once_with(LcdType.COLOR)
+        set_background.assert_not_called()
+
+
+def test_sdk_initialized_once_for_all_managers():
+    from dcspy.sdk.lcd_sdk import LcdSdkManager
+
+    with patch.object(LcdSdkManager, '_loaded', False), patch.object(LcdSdkManager, '_lcd_types', 0), \
+            patch('dcspy.sdk.lcd_sdk.load_dll') as load_dll, \
+            patch.object(LcdSdkManager, 'logi_lcd_init', return_value=True) as lcd_init, \
+            patch.object(LcdSdkManager, 'logi_lcd_shutdown') as lcd_shutdown:
+        mono = LcdSdkManager('test', LcdType.MONO)
+        LcdSdkManager('test', LcdType.MONO)
+        color = LcdSdkManager('test', LcdType.COLOR)
+        LcdSdkManager('test', LcdType.NONE)
+        load_dll.assert_called_once()
+        assert mono.lcd_dll is color.lcd_dll
+        assert lcd_init.call_args_list == [call(name='test', lcd_type=1), call(name='test', lcd_type=3)]
+        lcd_shutdown.assert_called_once_with()
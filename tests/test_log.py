@@ -0,0 +1,152 @@
+from unittest.mock import patch
+
+from dcspy.log import Tracer
+from dcspy.models import TraceEvent
+
+
+def test_tracer_ring_buffer():
+    tracer = Tracer(size=3)
+    assert tracer.dump() == []
+    for value in range(5):
+        tracer.record(TraceEvent.SET_BIOS, f'SEL_{value % 2}', value)
+    assert len(tracer) == 3
+    dump = tracer.dump()
+    assert [line.split(' ms ')[1] for line in dump] == ['SET_BIOS SEL_0: 2', 'SET_BIOS SEL_1: 3', 'SET_BIOS SEL_0: 4']
+    assert dump[-1].startswith('     0.000 ms')
+    tracer.clear()
+    assert len(tracer) == 0
+
+
+def test_tracer_keeps_raw_values():
+    tracer = Tracer()
+    tracer.record(TraceEvent.SEND_REQUEST, 'socket', b'TEST 1\n')
+    tracer.record(TraceEvent.KEY_EVENT, value=(1, 2, 1))
+    assert [line.split(' ms ')[1] for line in tracer.dump()] == ["SEND_REQUEST socket: b'TEST 1\\n'", 'KEY_EVENT : (1, 2, 1)']
+
+
+def test_tracer_formats_only_in_verbose():
+    from dcspy import log
+
+    tracer = Tracer()
+    with patch.object(log.LOG, 'debug') as log_debug:
+        tracer.record(TraceEvent.SET_BIOS, 'SEL', 1)
+        log_debug.assert_not_called()
+        tracer.verbose = True
+        tracer.record(TraceEvent.SET_BIOS, 'SEL', 2)
+    log_debug.assert_called_once_with('%s %s: %r', 'SET_BIOS', 'SEL', 2, stacklevel=2)
+
+
+def test_tracer_unique_selector_ids_from_threads():
+    from threading import Barrier, Thread
+
+    tracer = Tracer(size=4000)
+    barrier = Barrier(4)
+
+    def record(thread_id):
+        barrier.wait()
+        for value in range(500):
+            tracer.record(TraceEvent.SET_BIOS, f'SEL_{thread_id}_{value}', value)
+            if not value % 100:
+                tracer.dump()
+
+    threads = [Thread(target=record, args=(thread_id,)) for thread_id in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(tracer._selectors.values()) == list(range(2000))
+    assert len(tracer.dump()) == 2000
+
+
+def test_dropping_queue_handler():
+    from logging import INFO, WARNING, makeLogRecord
+    from queue import Queue
+
+    from dcspy.log import DroppingQueueHandler
+
+    handler = DroppingQueueHandler(queue=Queue(maxsize=2))
+    for no in range(4):
+        handler.handle(makeLogRecord({'msg': f'record {no}', 'levelno': INFO}))
+    assert handler.dropped == 2
+    assert [handler.queue.get_nowait().msg for _ in range(2)] == ['record 0', 'record 1']
+
+    handler.handle(makeLogRecord({'msg': 'record 4', 'levelno': INFO}))
+    dropped_record = handler.queue.get_nowait()
+    assert dropped_record.levelno == WARNING
+    assert dropped_record.getMessage() == 'Log queue full, 2 records dropped (total: 2)'
+    assert handler.queue.get_nowait().msg == 'record 4'
+
+
+def test_stop_logger_reports_dropped_records():
+    from logging import INFO, Handler, getLogger, makeLogRecord
+    from queue import Queue
+
+    from dcspy.log import DroppingQueueHandler, LogListener, stop_logger
+
+    class ListHandler(Handler):
+        def __init__(self):
+            super().__init__()
+            self.messages = []
+
+        def emit(self, record):
+            self.messages.append(record.getMessage())
+
+    logger = getLogger('dcspy_test_stop_logger')
+    records = Queue(maxsize=2)
+    list_hand = ListHandler()
+    queue_hand = DroppingQueueHandler(queue=records)
+    queue_hand.listener = LogListener(records, list_hand)
+    logger.addHandler(queue_hand)
+    for no in range(4):
+        queue_hand.handle(makeLogRecord({'msg': f'record {no}', 'levelno': INFO}))
+    queue_hand.listener.start()
+    stop_logger(logger=logger)
+    assert list_hand.messages == ['record 0', 'record 1', 'Log queue full, 2 records dropped (total: 2)']
+    stop_logger(logger=logger)
+    assert len(list_hand.messages) == 3
+    logger.removeHandler(queue_hand)
+
+
+def test_config_logger(tmp_path):
+    from logging import getLogger
+
+    from dcspy.log import DroppingQueueHandler, config_logger
+
+    logger = getLogger('dcspy_test_config_logger')
+    with patch('dcspy.log.gettempdir', return_value=tmp_path):
+        config_logger(logger=logger, verbose=False)
+    queue_hand, = logger.handlers
+    assert isinstance(queue_hand, DroppingQueueHandler)
+    logger.debug('not logged')
+    logger.info('logged by listener')
+    queue_hand.listener.stop()
+    log_file = (tmp_path / 'dcspy.log').read_text()
+    assert 'logged by listener' in log_file
+    assert 'not logged' not in log_file
+    for handler in queue_hand.listener.handlers:
+        handler.close()
+
+
+def test_add_and_remove_log_handler():
+    from logging import Handler, getLogger
+    from queue import Queue
+
+    from dcspy.log import DroppingQueueHandler, LogListener, add_log_handler, remove_log_handler
+
+    logger = getLogger('dcspy_test_add_handler')
+    handler = Handler()
+    add_log_handler(logger=logger, handler=handler)
+    assert logger.handlers == [handler]
+    remove_log_handler(logger=logger, handler=handler)
+    assert logger.handlers == []
+
+    queue_hand = DroppingQueueHandler(queue=Queue())
+    queue_hand.listener = LogListener(queue_hand.queue)
+    logger.addHandler(queue_hand)
+    add_log_handler(logger=logger, handler=handler)
+    add_log_handler(logger=logger, handler=handler)
+    assert queue_hand.listener.handlers == (handler,)
+    assert logger.handlers == [queue_hand]
+    remove_log_handler(logger=logger, handler=handler)
+    assert queue_hand.listener.handlers == ()
+    logger.removeHandler(queue_hand)
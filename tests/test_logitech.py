@@ -63,20 +63,83 @@ def test_keyboard_button_handle_lcdbutton(keyboard, request):
     keyboard.socket.sendto.assert_called_once_with(b'TEST 1\n', ('127.0.0.1', 7778))
 
 
-@mark.benchmark
-@mark.parametrize('key_idx, mode, key_down, mouse, calls', [
-    (2, 3, 1, 1, {'button': MouseButton(button=2), 'key_down': 1}),
-    (1, 2, 1, 0, {'button': Gkey(key=1, mode=2), 'key_down': 1}),
-    (4, 2, 0, 1, {'button': MouseButton(button=4), 'key_down': 0}),
-    (2, 1, 0, 0, {'button': Gkey(key=2, mode=1), 'key_down': 0}),
-])
-def test_keyboard_mono_gkey_callback_handler(key_idx, mode, key_down, mouse, calls, keyboard_mono):
+@mark.parametrize('debounce, sent', [(0.0, 2), (10.0, 1)], ids=['no debounce', 'debounce'])
+def test_keyboard_button_handle_debounce(debounce, sent, keyboard_mono):
     from dcspy.logitech import LogitechDevice
+    from dcspy.sdk.lcd_sdk import LcdSdkManager
+
+    keyboard_mono.lcd_button_debounce = debounce
+    effect = [True, False, False, False, False, True]
+    with patch.object(LcdSdkManager, 'logi_lcd_is_button_pressed', side_effect=effect), \
+            patch.object(LogitechDevice, '_send_request') as mock_send_request:
+        keyboard_mono.button_handle()
+        keyboard_mono.button_handle()
+        keyboard_mono.button_handle()
+    assert mock_send_request.call_count == sent
+
+
+def test_keyboard_button_handle_waits_for_lock(keyboard_mono):
+    from threading import Thread
 
-    with patch.object(LogitechDevice, '_send_request') as mock_send_request:
+    from dcspy.sdk.lcd_sdk import LcdSdkManager
+
+    with patch.object(LcdSdkManager, 'logi_lcd_is_button_pressed', return_value=True), \
+            patch.object(keyboard_mono.plane, 'button_command', wraps=keyboard_mono.plane.button_command) as button_command:
+        with keyboard_mono.lock:
+            buttons_thread = Thread(target=keyboard_mono.button_handle)
+            buttons_thread.start()
+            buttons_thread.join(timeout=0.1)
+            assert buttons_thread.is_alive()
+            button_command.assert_not_called()
+        buttons_thread.join(timeout=1)
+    button_command.assert_called_once()
+    keyboard_mono.socket.sendto.assert_called_once()
+
+
+@mark.benchmark
+@mark.parametrize('key_idx, mode, key_down, mouse, sent', [
+    (2, 3, 1, 1, b'MOUSE_2 1\n'),
+    (1, 2, 1, 0, b'GKEY_1_2 1\n'),
+    (4, 2, 0, 1, b'MOUSE_4 0\n'),
+    (2, 1, 0, 0, b'GKEY_2_1 0\n'),
+])
+def test_keyboard_mono_gkey_callback_handler(key_idx, mode, key_down, mouse, sent, keyboard_mono, tmp_path):
+    from dcspy.utils import KeyRequest
+
+    plane_yaml = tmp_path / 'plane.yaml'
+    plane_yaml.write_text('G1_M2: GKEY_1_2 PUSH_BUTTON\nG2_M1: GKEY_2_1 PUSH_BUTTON\nM_2: MOUSE_2 PUSH_BUTTON\nM_4: MOUSE_4 PUSH_BUTTON\n')
+    keyboard_mono.plane.key_req = KeyRequest(yaml_path=plane_yaml, get_bios_fn=int)
+    with patch('dcspy.logitech.Gkey') as gkey_model, \
+            patch('dcspy.logitech.MouseButton') as mouse_model:
+        gkey_model.code_of = Gkey.code_of
+        mouse_model.code_of = MouseButton.code_of
         keyboard_mono.gkey_callback_handler(key_idx, mode, key_down, mouse)
+        gkey_model.assert_not_called()
+        mouse_model.assert_not_called()
 
-    mock_send_request.assert_called_once_with(**calls)
+    keyboard_mono.socket.sendto.assert_called_once_with(sent, ('127.0.0.1', 7778))
+
+
+def test_keyboard_gkey_custom_request_macro(keyboard_mono, tmp_path):
+    from time import sleep
+
+    from dcspy.utils import KeyRequest
+
+    plane_yaml = tmp_path / 'plane.yaml'
+    plane_yaml.write_text('G1_M1: GKEY_1 CUSTOM GKEY_1 1|WAIT 0.05|GKEY_1 2|HOLD|GKEY_1 0\n')
+    keyboard_mono.plane.key_req = KeyRequest(yaml_path=plane_yaml, get_bios_fn=int)
+    with patch('dcspy.logitech.sleep') as blocking_sleep:
+        keyboard_mono.gkey_callback_handler(key_idx=1, mode=1, key_down=1, mouse=0)
+        keyboard_mono.gkey_callback_handler(key_idx=1, mode=1, key_down=0, mouse=0)
+    blocking_sleep.assert_not_called()
+    for _ in range(100):
+        if keyboard_mono.socket.sendto.call_count == 3:
+            break
+        sleep(0.01)
+    keyboard_mono.macros.stop()
+    assert [call.args for call in keyboard_mono.socket.sendto.call_args_list] == [(b'GKEY_1 1\n', ('127.0.0.1', 7778)),
+                                                                                 (b'GKEY_1 2\n', ('127.0.0.1', 7778)),
+                                                                                 (b'GKEY_1 0\n', ('127.0.0.1', 7778))]
 
 
 @mark.benchmark
@@ -182,6 +245,22 @@ def test_test_keyboard_mono_load_basic_plane(keyboard_mono):
     assert keyboard_mono.plane.bios_name == 'Bf-109K-4'
 
 
+def test_switch_stats(G13, test_dcs_bios, test_config_yaml):
+    with patch('dcspy.logitech.get_config_yaml_item', return_value=test_dcs_bios):
+        with patch('dcspy.aircraft.default_yaml', test_config_yaml):
+            G13.plane_name = 'F16C50'
+            G13.load_new_plane()
+            assert list(G13.switch_stats.phases) == ['clear', 'create', 'bios', 'subscribe', 'restore']
+            G13.unload_old_plane()
+            G13.plane_name = 'P47D30'
+            G13.bios_name = 'P-47D-30'
+            G13.load_new_plane()
+
+    assert G13.switch_stats.plane == 'P47D30'
+    assert list(G13.switch_stats.phases) == ['unload', 'create']
+    assert G13.switch_stats.total_ms > 0
+
+
 @mark.benchmark
 @mark.parametrize('model', [
     'FA18Chornet', 'F16C50', 'F4E45MC', 'F15ESE', 'Ka50', 'Ka503', 'Mi8MT', 'Mi24P', 'AH64DBLKII', 'A10C', 'A10C2', 'F14A135GR', 'F14B', 'AV8BNA',
@@ -236,23 +315,132 @@ def test_unload_plane(keyboard, models, test_dcs_bios, test_config_yaml, request
     keyboard = request.getfixturevalue(keyboard)
     with patch('dcspy.logitech.get_config_yaml_item', return_value=test_dcs_bios):
         with patch('dcspy.aircraft.default_yaml', test_config_yaml):
-            args_list = []
             keyboard.plane_name = models[0]
             keyboard.load_new_plane()
             assert isinstance(keyboard.plane, A10C)
-            for partial_obj in keyboard.parser.write_callbacks:
-                for callback in partial_obj.func.__self__.callbacks:
-                    args_list.extend([arg for arg in callback.args])
-            assert set(args_list) == set(keyboard.plane.bios_data.keys())
+            ctrl_names = set(keyboard.plane.bios_data.keys()) | set(keyboard.plane.key_req.cycles.ctrl_names)
+            assert {sub.callback.args[0] for sub in keyboard._plane_scope} == ctrl_names
+            subscriptions = list(keyboard._plane_scope)
 
             keyboard.unload_old_plane()
+            assert len(keyboard._plane_scope) == 0
+            assert not any(sub.active for sub in subscriptions)
+            assert list(keyboard.parser.buffers) == [keyboard.detection.key]
             assert len(keyboard.parser.write_callbacks) == 1
 
-            args_list = []
             keyboard.plane_name = models[1]
             keyboard.load_new_plane()
             assert isinstance(keyboard.plane, Ka50)
-            for partial_obj in keyboard.parser.write_callbacks:
-                for callback in partial_obj.func.__self__.callbacks:
-                    args_list.extend([arg for arg in callback.args])
-            assert set(args_list) == set(keyboard.plane.bios_data.keys())
+            ctrl_names = set(keyboard.plane.bios_data.keys()) | set(keyboard.plane.key_req.cycles.ctrl_names)
+            assert {sub.callback.args[0] for sub in keyboard._plane_scope} == ctrl_names
+
+
+def test_unload_plane_many_switches(G13, test_dcs_bios, test_config_yaml):
+    with patch('dcspy.logitech.get_config_yaml_item', return_value=test_dcs_bios):
+        with patch('dcspy.aircraft.default_yaml', test_config_yaml):
+            counts = set()
+            for plane_name in ['F16C50', 'FA18Chornet'] * 5:
+                G13.unload_old_plane()
+                G13.plane_name = plane_name
+                G13.load_new_plane()
+                counts.add((plane_name, len(G13.parser.buffers), len(G13.parser.write_callbacks), len(G13.parser.integers)))
+            G13.unload_old_plane()
+    assert len(counts) == 2
+    assert list(G13.parser.buffers) == [G13.detection.key]
+    assert len(G13.parser.integers) == 0
+
+
+def test_unload_plane_with_shared_parser(test_dcs_bios, test_config_yaml, sock):
+    from dcspy.aircraft import A10C, Ka50
+    from dcspy.dcsbios import ProtocolParser
+    from dcspy.logitech import LogitechDevice
+    from dcspy.models import G13, G19
+    from dcspy.sdk.key_sdk import GkeySdkManager
+
+    parser = ProtocolParser()
+    with patch.object(GkeySdkManager, 'logi_gkey_init', return_value=True) as gkey_init:
+        mono = LogitechDevice(parser=parser, sock=sock, model=G13)
+        color = LogitechDevice(parser=parser, sock=sock, model=G19, gkeys=False)
+    gkey_init.assert_called_once_with()
+    assert color.key_sdk is None
+    assert len(parser.write_callbacks) == 1
+
+    with patch('dcspy.logitech.get_config_yaml_item', return_value=test_dcs_bios):
+        with patch('dcspy.aircraft.default_yaml', test_config_yaml):
+            mono.plane_name = 'A10C'
+            mono.load_new_plane()
+            color.plane_name = 'Ka50'
+            color.load_new_plane()
+            assert isinstance(mono.plane, A10C)
+            assert isinstance(color.plane, Ka50)
+            callbacks_count = len(parser.write_callbacks)
+
+            mono.unload_old_plane()
+            assert 1 < len(parser.write_callbacks) < callbacks_count
+            for buffer in parser.buffers.values():
+                for callback in buffer.callbacks:
+                    assert callback.func.__name__ == 'detecting_plane' or callback.func.__self__ is color.plane
+            assert all(sub.buffer is parser.buffers[sub.key] for sub in color._plane_scope)
+
+            color.unload_old_plane()
+            assert len(parser.write_callbacks) == 1
+            assert len(parser.buffers) == 1
+
+
+@mark.parametrize('keyboard', ['G13', 'G19'])
+def test_restore_plane_state(keyboard, test_dcs_bios, test_config_yaml, request):
+    keyboard = request.getfixturevalue(keyboard)
+    with patch('dcspy.logitech.get_config_yaml_item', return_value=test_dcs_bios):
+        with patch('dcspy.aircraft.default_yaml', test_config_yaml):
+            keyboard.plane_name = 'A10C'
+            keyboard.load_new_plane()
+            keyboard.plane.bios_data['VHFAM_FREQ1'] = '12'
+            key = next(sub.key for sub in keyboard._plane_scope if sub.key[0] == 'IntegerBuffer')
+            keyboard.parser.buffers[key].shadow = 7
+            bios_data = dict(keyboard.plane.bios_data)
+
+            keyboard.unload_old_plane()
+            keyboard.plane_name = 'Ka50'
+            keyboard.load_new_plane()
+            assert key not in keyboard.parser.buffers or keyboard.parser.buffers[key].shadow != 7
+
+            keyboard.unload_old_plane()
+            keyboard.plane_name = 'A10C'
+            with patch.object(keyboard.lcd_sdk, 'update_display') as update_display:
+                keyboard.load_new_plane()
+            update_display.assert_called_once()
+            assert keyboard.plane.bios_data == bios_data
+            assert keyboard.parser.buffers[key].shadow == 7
+
+
+def test_cycle_buttons_follow_live_values(G13, test_dcs_bios, test_config_yaml):
+    from dcspy.models import KEY_DOWN, LcdButton
+
+    with patch('dcspy.logitech.get_config_yaml_item', return_value=test_dcs_bios):
+        with patch('dcspy.aircraft.default_yaml', test_config_yaml):
+            G13.plane_name = 'F16C50'
+            G13.load_new_plane()
+            cycles = G13.plane.key_req.cycles
+            subscriptions = {sub.callback.args[0]: sub for sub in G13._plane_scope if sub.callback.func == cycles.update}
+            assert set(subscriptions) == set(cycles.ctrl_names)
+            assert 'IFF_MASTER_KNB' not in G13.plane.bios_data
+
+            subscriptions['IFF_MASTER_KNB'].callback(3)
+            assert G13.plane.button_command(LcdButton.ONE).requests(key_down=KEY_DOWN) == (b'IFF_MASTER_KNB 4\n',)
+
+            G13.unload_old_plane()
+            G13.plane_name = 'A10C'
+            G13.load_new_plane()
+            G13.unload_old_plane()
+            G13.plane_name = 'F16C50'
+            G13.load_new_plane()
+            assert G13.plane.key_req.cycles.values['IFF_MASTER_KNB'] == 3
+            assert G13.plane.button_command(LcdButton.ONE).requests(key_down=KEY_DOWN) == (b'IFF_MASTER_KNB 4\n',)
+
+
+def test_restore_display_basic_plane(keyboard_mono):
+    with patch.object(keyboard_mono.lcd_sdk, 'clear_display') as clear_display, \
+            patch.object(keyboard_mono.lcd_sdk, 'update_display') as update_display:
+        keyboard_mono.restore_display()
+    clear_display.assert_called_once_with(True)
+    update_display.assert_not_called()
@@ -0,0 +1,110 @@
+from time import monotonic, sleep
+
+from pytest import fixture
+
+from dcspy.macro import MacroScheduler
+from dcspy.models import KEY_DOWN, KEY_UP, Macro, MacroStep
+
+
+@fixture()
+def sent():
+    """
+    Requests sent by scheduler with monotonic time of sending.
+
+    :return: list of tuples with request and time
+    """
+    return []
+
+
+@fixture()
+def scheduler(sent):
+    """
+    Macro scheduler with fine resolution, which records sent requests.
+
+    :return: MacroScheduler instance
+    """
+    macros = MacroScheduler(send=lambda request: sent.append((request, monotonic())), tick=0.005)
+    yield macros
+    macros.stop()
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    """
+    Wait until condition is met.
+
+    :param condition: callable without arguments
+    :param timeout: maximum time to wait in seconds
+    :return: True when condition was met
+    """
+    deadline = monotonic() + timeout
+    while not condition():
+        if monotonic() > deadline:
+            return False
+        sleep(0.005)
+    return True
+
+
+def test_macro_steps_with_delays(scheduler, sent):
+    start = monotonic()
+    assert scheduler.press(key=1, steps=Macro.from_request('A 1|WAIT 0.05|A 0 *2').press) is True
+    assert wait_for(lambda: len(sent) == 3)
+    assert [request for request, _ in sent] == [b'A 1\n', b'A 0\n', b'A 0\n']
+    assert sent[0][1] - start < 0.05
+    assert sent[1][1] - sent[0][1] >= 0.045
+    assert sent[2][1] - sent[1][1] >= 0.195
+    assert wait_for(lambda: scheduler.running == [])
+
+
+def test_macros_run_at_once(scheduler, sent):
+    steps = (MacroStep(request=b'A\n'), MacroStep(request=b'A\n', delay=0.1))
+    scheduler.press(key=1, steps=steps)
+    scheduler.press(key=2, steps=tuple(step.model_copy(update={'request': b'B\n'}) for step in steps))
+    assert wait_for(lambda: len(sent) == 4)
+    assert [request for request, _ in sent] == [b'A\n', b'B\n', b'A\n', b'B\n']
+    assert scheduler.is_alive()
+
+
+def test_macro_cancel_on_press(scheduler, sent):
+    steps = (MacroStep(request=b'A\n'), MacroStep(request=b'B\n', delay=0.2))
+    assert scheduler.press(key=1, steps=steps) is True
+    assert wait_for(lambda: len(sent) == 1)
+    assert scheduler.press(key=1, steps=steps) is False
+    assert scheduler.running == []
+    sleep(0.3)
+    assert [request for request, _ in sent] == [b'A\n']
+
+    assert scheduler.press(key=1, steps=steps) is True
+    assert wait_for(lambda: len(sent) == 3)
+
+
+def test_macro_hold_and_release(scheduler, sent):
+    macro = Macro.from_request('A 1|WAIT 0.1|A 2|HOLD|A 0')
+    scheduler.trigger(key=1, macro=macro, key_down=KEY_DOWN)
+    scheduler.trigger(key=1, macro=macro, key_down=KEY_UP)
+    assert wait_for(lambda: len(sent) == 3)
+    assert [request for request, _ in sent] == [b'A 1\n', b'A 2\n', b'A 0\n']
+    assert sent[2][1] - sent[1][1] >= 0.195
+
+    scheduler.trigger(key=1, macro=macro, key_down=KEY_UP)
+    assert wait_for(lambda: len(sent) == 4)
+    assert sent[3][0] == b'A 0\n'
+
+
+def test_macro_scheduler_stop(scheduler, sent):
+    scheduler.press(key=1, steps=(MacroStep(request=b'A\n'), MacroStep(request=b'B\n', delay=5.0)))
+    assert wait_for(lambda: len(sent) == 1)
+    scheduler.stop()
+    scheduler.join(timeout=1)
+    assert not scheduler.is_alive()
+    scheduler.press(key=2, steps=(MacroStep(request=b'C\n'),))
+    assert not scheduler.is_alive()
+    assert sent[0][0] == b'A\n'
+
+
+def test_macro_long_delay_wraps_wheel(sent):
+    scheduler = MacroScheduler(send=lambda request: sent.append((request, monotonic())), tick=0.005, slots=4)
+    start = monotonic()
+    scheduler.press(key=1, steps=(MacroStep(request=b'A\n', delay=0.1),))
+    assert wait_for(lambda: len(sent) == 1)
+    assert sent[0][1] - start >= 0.095
+    scheduler.stop()
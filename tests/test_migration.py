@@ -46,8 +46,15 @@ def test_generate_config():
         'gui_debug': False,
         'debug_font_size': 10,
         'device': 'G13',
+        'extra_devices': [],
+        'lcd_buttons_debounce': 50,
+        'lcd_buttons_rate': 50,
+        'multicast_iface': '0.0.0.0',
+        'multicast_loop': True,
+        'multicast_ttl': 1,
         'save_lcd': False,
         'show_gui': True,
+        'socket_rcvbuf': 0,
         'toolbar_area': 4,
         'toolbar_style': 0,
         'verbose': False,
@@ -354,6 +354,164 @@ def test_get_empty_ctrl(test_dcs_bios):
     assert bool(c) is False
 
 
+def test_ctrl_index(test_dcs_bios):
+    from dcspy.models import Control, DcsBiosPlaneData
+    from dcspy.utils import get_full_bios_for_plane
+
+    json_data = get_full_bios_for_plane(plane='A-10C', bios_dir=test_dcs_bios)
+    ctrl_index = json_data.ctrl_index
+    assert ctrl_index is not json_data.ctrl_index
+    assert ctrl_index == json_data.ctrl_index
+    assert len(ctrl_index) == sum(len(values) for values in json_data.root.values())
+    assert isinstance(ctrl_index['TACAN_MODE'], Control)
+    assert json_data.get_ctrl(ctrl_name='TACAN_MODE') is ctrl_index['TACAN_MODE']
+    with raises(TypeError):
+        ctrl_index['TACAN_MODE'] = Control.make_empty()  # type: ignore[index]
+    assert json_data == DcsBiosPlaneData.model_validate(json_data.model_dump())
+
+
+def test_plane_switch_stats():
+    from dcspy.models import PlaneSwitchStats
+
+    stats = PlaneSwitchStats(plane='F16C50', phases={'unload': 0.25, 'create': 1.5})
+    assert stats.total_ms == 1.75
+    assert str(stats) == 'F16C50 total: 1.75 ms (unload: 0.25 create: 1.50)'
+    assert PlaneSwitchStats().total_ms == 0
+
+
+def test_cockpit_store():
+    from dcspy.models import CockpitStore
+
+    store = CockpitStore({'TEXT': '', 'SWITCH': 0})
+    store['SWITCH'] = '2'
+    store['TEXT'] = 12
+    store['NEW'] = 1.5
+    assert store == {'TEXT': '12', 'SWITCH': 2, 'NEW': 1.5}
+    assert store.read('SWITCH', 0) == 2
+    assert store.read('TEXT', 0) == 12
+    assert store.read('TEXT') == '12'
+    assert store.read('NEW', 0) == 1
+    assert store.read('MISSING', 5) == 5
+    store['SWITCH'] = 'off'
+    assert store['SWITCH'] == 'off'
+    assert store.read('SWITCH', 0) == 0
+    del store['NEW']
+    assert 'NEW' not in store
+    assert len(store) == 2
+    with raises(KeyError):
+        del store['NEW']
+    assert repr(store) == "CockpitStore({'TEXT': '12', 'SWITCH': 'off'})"
+
+
+def test_cockpit_store_reader():
+    from dcspy.models import CockpitStore
+
+    store = CockpitStore({'TEXT': 'abc'})
+    text = store.reader('TEXT')
+    fuel = store.reader('FUEL', default=0)
+    assert text() == 'abc'
+    assert fuel() == 0
+    assert 'FUEL' not in store
+    assert list(store) == ['TEXT']
+    store['TEXT'] = 'xyz'
+    store['FUEL'] = '1234'
+    assert text() == 'xyz'
+    assert fuel() == 1234
+    assert dict(store) == {'TEXT': 'xyz', 'FUEL': 1234}
+
+
+def test_address_index():
+    from dcspy.models import BiosAddressIndex, OutputAddress
+
+    lamp = OutputAddress(ctrl_name='LAMP', address=0x1000, mask=0x2, shift_by=1)
+    switch = OutputAddress(ctrl_name='SWITCH', address=0x1000, mask=0xc, shift_by=2)
+    display = OutputAddress(ctrl_name='DISPLAY', address=0x1002, max_length=5)
+    index = BiosAddressIndex([switch, display, lamp])
+    assert len(index) == 3
+    assert repr(index) == 'BiosAddressIndex(outputs=3, words=4)'
+    assert index.addresses == [0x1000, 0x1002, 0x1004, 0x1006]
+    assert index.at(0x1000) == (lamp, switch)
+    assert index.at(0x1001) == (lamp, switch)
+    assert index.at(0x1006) == (display,)
+    assert index.at(0x1008) == ()
+    assert index.decode(address=0x1000, value=0b1010) == {'LAMP': 1, 'SWITCH': 2}
+    assert index.decode(address=0x1004, value=0xffff) == {}
+    assert index.overlapping(address=0x1004, count=2) == [display]
+    assert index.overlapping(address=0x0ffe, count=4) == [lamp, switch]
+    assert index.overlapping(address=0x1000, count=0x10) == [lamp, switch, display]
+    assert index.overlapping(address=0x1008) == []
+    assert BiosAddressIndex([]).overlapping(address=0x1000) == []
+
+
+def test_plane_data_address_index(test_dcs_bios):
+    from dcspy.utils import get_full_bios_for_plane
+
+    json_data = get_full_bios_for_plane(plane='A-10C', bios_dir=test_dcs_bios)
+    index = json_data.address_index
+    assert index is json_data.address_index
+    tacan_mode = json_data.get_ctrl(ctrl_name='TACAN_MODE').outputs[0]
+    assert [out.ctrl_name for out in index.at(tacan_mode.address)] == ['ILS_KHZ', 'ILS_MHZ', 'ILS_PWR', 'TACAN_MODE', 'TACAN_XY', 'UHF_PRESET_SEL']
+    assert index.decode(address=tacan_mode.address, value=0b0110)['TACAN_MODE'] == 3
+    assert 'CMSC_TXT_JMR' in [out.ctrl_name for out in index.overlapping(address=json_data.get_ctrl(ctrl_name='CMSC_TXT_JMR').outputs[0].address)]
+
+
+def test_lazy_plane_data(test_dcs_bios):
+    from dcspy.models import LazyDcsBiosPlaneData
+    from dcspy.utils import get_full_bios_for_plane
+
+    json_data = get_full_bios_for_plane(plane='A-10C', bios_dir=test_dcs_bios)
+    lazy_data = LazyDcsBiosPlaneData.from_raw_data(raw_data=json_data.model_dump())
+    assert len(lazy_data) == len(json_data.ctrl_index)
+    assert repr(lazy_data) == f'LazyDcsBiosPlaneData(controls={len(lazy_data)}, validated=0)'
+
+    ctrl = lazy_data.get_ctrl(ctrl_name='TACAN_MODE')
+    assert ctrl == json_data.get_ctrl(ctrl_name='TACAN_MODE')
+    assert lazy_data.get_ctrl(ctrl_name='TACAN_MODE') is ctrl
+    assert 'TACAN_MODE' not in lazy_data._raw
+    assert bool(lazy_data.get_ctrl(ctrl_name='WRONG_CTRL')) is False
+    assert len(lazy_data) == len(json_data.ctrl_index)
+    assert repr(lazy_data) == f'LazyDcsBiosPlaneData(controls={len(lazy_data)}, validated=1)'
+
+
+def test_lazy_plane_data_concurrent_access(test_dcs_bios):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from dcspy.models import LazyDcsBiosPlaneData
+    from dcspy.utils import get_full_bios_for_plane
+
+    json_data = get_full_bios_for_plane(plane='A-10C', bios_dir=test_dcs_bios)
+    names = list(json_data.ctrl_index)
+    lazy_data = LazyDcsBiosPlaneData.from_raw_data(raw_data=json_data.model_dump())
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: [lazy_data.get_ctrl(ctrl_name=name) for name in names], range(8)))
+    for ctrls in results:
+        assert [ctrl.identifier for ctrl in ctrls] == names
+        assert all(ctrl is lazy_data.get_ctrl(ctrl_name=name) for name, ctrl in zip(names, ctrls))
+
+
+def test_lazy_plane_data_retained_size(test_dcs_bios):
+    import gc
+    import tracemalloc
+
+    from dcspy.models import DcsBiosPlaneData, LazyDcsBiosPlaneData
+    from dcspy.utils import _get_json_files_for_plane, _merge_json_files
+
+    def retained_size(load):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            plane_data = load(_merge_json_files(json_files=_get_json_files_for_plane(plane='A-10C', bios_dir=test_dcs_bios)))
+            gc.collect()
+            return plane_data, tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    lazy_data, lazy_size = retained_size(load=lambda raw_data: LazyDcsBiosPlaneData.from_raw_data(raw_data=raw_data))
+    full_data, full_size = retained_size(load=lambda raw_data: DcsBiosPlaneData.model_validate(raw_data))
+    assert len(lazy_data) == len(full_data.ctrl_index)
+    assert lazy_size * 3 < full_size
+
+
 @mark.benchmark
 def test_get_inputs_for_plane(test_dcs_bios):
     from dcspy.utils import get_full_bios_for_plane
@@ -561,6 +719,125 @@ def test_request_model_properties(str_req, key, key_down, result):
     assert str(req) == f'{req.ctrl_name}: {str_req}'
 
 
+def test_key_codes_are_unique():
+    from dcspy.models import KEY_CODES, LOGITECH_MAX_GKEYS, LOGITECH_MAX_M_STATES, LOGITECH_MAX_MOUSE_BUTTONS, Gkey, MouseButton
+
+    codes = [key.code for key in Gkey.generate(key=LOGITECH_MAX_GKEYS, mode=LOGITECH_MAX_M_STATES)]
+    codes.extend(key.code for key in MouseButton.generate(button_range=(1, LOGITECH_MAX_MOUSE_BUTTONS)))
+    codes.extend(key.code for key in LcdButton)
+    assert len(set(codes)) == len(codes)
+    assert min(codes) == 0
+    assert max(codes) < KEY_CODES
+    assert Gkey(key=3, mode=2).code == Gkey.code_of(key=3, mode=2) == 9
+    assert MouseButton(button=4).code == MouseButton.code_of(button=4)
+
+
+@mark.parametrize('key, mode, valid', [
+    (1, 1, True),
+    (30, 4, True),
+    (0, 1, False),
+    (31, 1, False),
+    (2, 0, False),
+    (1, 5, False),
+], ids=['first', 'last', 'key zero', 'key above max', 'mode zero', 'mode above max'])
+def test_gkey_code_out_of_range(key, mode, valid):
+    from dcspy.models import KEY_CODES, MOUSE_CODE_BASE, NO_KEY_CODE, Gkey
+
+    code = Gkey.code_of(key=key, mode=mode)
+    assert (0 <= code < MOUSE_CODE_BASE) is valid
+    assert (code == NO_KEY_CODE) is not valid
+    assert code < KEY_CODES
+
+
+@mark.parametrize('button, valid', [
+    (1, True), (20, True), (0, False), (21, False), (22, False), (-1, False),
+], ids=['first', 'last', 'zero', 'above max', 'lcd range', 'negative'])
+def test_mouse_button_code_out_of_range(button, valid):
+    from dcspy.models import LCD_CODE_BASE, MOUSE_CODE_BASE, NO_KEY_CODE, MouseButton
+
+    code = MouseButton.code_of(button=button)
+    assert (MOUSE_CODE_BASE < code < LCD_CODE_BASE) is valid
+    assert (code == NO_KEY_CODE) is not valid
+
+
+@mark.parametrize('str_req, key, key_down, key_up', [
+    ('COM2 CUSTOM COM2 1|COM2 0|', 'G2_M2', (b'COM2 1\n', b'COM2 0\n'), ()),
+    ('RADIO_1 PUSH_BUTTON', 'G3_M3', (b'RADIO_1 1\n',), (b'RADIO_1 0\n',)),
+    ('RADIO_1 PUSH_BUTTON', 'LEFT', (b'RADIO_1 1\n', b'RADIO_1 0\n'), (b'RADIO_1 1\n', b'RADIO_1 0\n')),
+    ('MASTER_ARM 2', 'M_2', (b'MASTER_ARM 2\n',), ()),
+], ids=['custom', 'push button', 'lcd push button', 'regular'])
+def test_button_command(str_req, key, key_down, key_up):
+    from pydantic import ValidationError
+
+    from dcspy.models import ButtonCommand, RequestModel
+    from dcspy.utils import get_key_instance
+
+    req = RequestModel.from_request(request=str_req, get_bios_fn=int, key=get_key_instance(key))
+    command = ButtonCommand.from_request_model(req)
+    assert command.requests(key_down=KEY_DOWN) == key_down
+    assert command.requests(key_down=KEY_UP) == key_up
+    assert command.requests(key_down=KEY_DOWN) == tuple(payload for payload in req.bytes_requests(key_down=KEY_DOWN) if payload)
+    with raises(ValidationError):
+        command.key_down = ()
+
+
+def test_button_command_cycle():
+    from dcspy.models import ButtonCommand, RequestModel
+    from dcspy.utils import get_key_instance
+
+    req = RequestModel.from_request(request='COM1 CYCLE 1 3', get_bios_fn=lambda _: 2, key=get_key_instance('G1_M1'))
+    command = ButtonCommand.from_request_model(req)
+    assert command.cycle is req
+    assert command.requests(key_down=KEY_UP) == ()
+    assert [command.requests(key_down=KEY_DOWN) for _ in range(3)] == [(b'COM1 3\n',), (b'COM1 2\n',), (b'COM1 1\n',)]
+
+
+@mark.parametrize('request_str, hold, press, release', [
+    ('A 0|B 1|', True, ((b'A 0\n', 0.0), (b'B 1\n', 0.2)), ()),
+    ('A 0|WAIT 1|B 1 *2|', True, ((b'A 0\n', 0.0), (b'B 1\n', 1.0), (b'B 1\n', 0.2)), ()),
+    ('WAIT 0.5|WAIT 0.25|A 0', True, ((b'A 0\n', 0.75),), ()),
+    ('A 1|HOLD|WAIT 0.1|A 0|', True, ((b'A 1\n', 0.0),), ((b'A 0\n', 0.1),)),
+    ('A 1|HOLD|A 0|', False, ((b'A 1\n', 0.0), (b'A 0\n', 0.2)), ()),
+    ('A 1|WAIT x|A *0', True, ((b'A 1\n', 0.0), (b'WAIT x\n', 0.2), (b'A *0\n', 0.2)), ()),
+], ids=['default', 'wait and repeat', 'wait first', 'hold', 'hold ignored', 'no modifiers'])
+def test_macro_from_request(request_str, hold, press, release):
+    from dcspy.models import Macro
+
+    macro = Macro.from_request(request=request_str, hold=hold)
+    assert tuple((step.request, step.delay) for step in macro.press) == press
+    assert tuple((step.request, step.delay) for step in macro.release) == release
+
+
+def test_button_command_macro():
+    from dcspy.models import ButtonCommand, RequestModel
+    from dcspy.utils import get_key_instance
+
+    req = RequestModel.from_request(request='COM1 CUSTOM COM1 1 *2|HOLD|COM1 0', get_bios_fn=int, key=get_key_instance('G1_M1'))
+    command = ButtonCommand.from_request_model(req)
+    assert command.macro == req.macro
+    assert command.requests(key_down=KEY_DOWN) == (b'COM1 1\n', b'COM1 1\n')
+    assert command.requests(key_down=KEY_UP) == (b'COM1 0\n',)
+    assert req.bytes_requests(key_down=KEY_DOWN) == [b'COM1 1\n', b'COM1 1\n']
+
+
+def test_cycle_tracker():
+    from dcspy.models import CycleTracker, RequestModel
+    from dcspy.utils import get_key_instance
+
+    reqs = [RequestModel.from_request(request=request, get_bios_fn=lambda _: 0, key=get_key_instance(key))
+            for key, request in [('G1_M1', 'COM1 CYCLE 1 3'), ('G2_M1', 'COM1 CYCLE 1 3'), ('G3_M1', 'COM2 1')]]
+    tracker = CycleTracker(requests=reqs)
+    assert tracker.ctrl_names == ['COM1']
+
+    tracker.update(ctrl_name='COM1', value=2)
+    tracker.update(ctrl_name='COM2', value=1)
+    assert tracker.values == {'COM1': 2, 'COM2': 1}
+    assert [reqs[0].next_cycle_value(), reqs[1].next_cycle_value()] == [3, 3]
+
+    tracker.update(ctrl_name='COM1', value=1)
+    assert [reqs[0].next_cycle_value() for _ in range(3)] == [2, 3, 2]
+
+
 @mark.benchmark
 @mark.parametrize('key, key_down, result', [
     ('ONE', KEY_DOWN, [b'\n']),
@@ -138,3 +138,68 @@ def test_switch_between_cells(qtbot, test_config_yaml, switch_dcs_bios_path_in_c
         assert dcspy_gui.input_reqs['A-10C']['G6_M3'].request == 'ARC210_GPS CYCLE 1 1'
 
         qtbot.mouseClick(dcspy_gui.pb_close, Qt.LeftButton)
+
+
+@mark.qt6
+@mark.skipif(condition=platform != 'win32', reason='Run only on Windows')
+def test_log_handler_batches_records(qtbot):
+    from logging import INFO, makeLogRecord
+    from threading import Thread
+
+    from PySide6.QtWidgets import QTextEdit
+
+    from dcspy.qt_gui import QTextEditLogHandler
+
+    text_edit = QTextEdit()
+    qtbot.addWidget(text_edit)
+    handler = QTextEditLogHandler(text_widget=text_edit, max_lines=10, buffer_size=5)
+    threads = [Thread(target=handler.handle, args=(makeLogRecord({'msg': f'record {i}', 'levelno': INFO, 'levelname': 'INFO'}),)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert text_edit.toPlainText() == ''
+    assert handler.flush_to_widget() == 5
+    assert handler.flush_to_widget() == 0
+    assert text_edit.toPlainText().endswith('3 records dropped\n')
+
+    for i in range(20):
+        handler.handle(makeLogRecord({'msg': f'line {i}', 'levelno': INFO, 'levelname': 'INFO'}))
+        handler.flush_to_widget()
+    assert text_edit.document().blockCount() == 10
+
+
+@mark.qt6
+@mark.skipif(condition=platform != 'win32', reason='Run only on Windows')
+def test_stop_bios_watcher(test_dcs_bios):
+    from types import SimpleNamespace
+
+    from dcspy import qt_gui
+    from dcspy.watcher import BiosWatcher
+
+    bios_watcher = BiosWatcher(bios_dir=test_dcs_bios, callback=print, interval=0.05, polling=True)
+    bios_watcher.start()
+    dcspy_gui = SimpleNamespace(bios_watcher=bios_watcher)
+    qt_gui.DcsPyQtGui._stop_bios_watcher(dcspy_gui)
+    assert not bios_watcher.is_alive()
+    assert dcspy_gui.bios_watcher is None
+    qt_gui.DcsPyQtGui._stop_bios_watcher(dcspy_gui)
+
+
+@mark.qt6
+@mark.skipif(condition=platform != 'win32', reason='Run only on Windows')
+@mark.parametrize('extra_devices, expected', [
+    ([], []),
+    (['G19', 'G600'], ['G19', 'G600']),
+    (['G13', 'G19'], ['G19']),
+    ('G19', ['G19']),
+    (['G1', 'G600'], ['G600']),
+], ids=['empty', 'two devices', 'selected device skipped', 'single string', 'unknown device'])
+def test_extra_devices(extra_devices, expected):
+    from types import SimpleNamespace
+
+    from dcspy import qt_gui
+    from dcspy.models import G13
+
+    dcspy_gui = SimpleNamespace(config={'extra_devices': extra_devices}, device=G13)
+    assert [logi_dev.klass for logi_dev in qt_gui.DcsPyQtGui._extra_devices(dcspy_gui)] == expected
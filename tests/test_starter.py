@@ -7,10 +7,44 @@ from pytest import mark
 def test_load_new_plane_if_detected(g13_starter):
     from dcspy import starter
     with patch.object(starter, 'LogitechDevice') as lcd:
-        g13_starter._load_new_plane_if_detected(lcd)
+        g13_starter._load_new_plane_if_detected([lcd])
         lcd.load_new_plane.assert_called_once_with()
 
 
+def test_load_new_plane_if_detected_many_devices(g13_starter):
+    from unittest.mock import MagicMock, call
+
+    manager = MagicMock()
+    manager.dev1.plane_detected = True
+    manager.dev2.plane_detected = True
+    manager.dev3.plane_detected = False
+    for logi_device in (manager.dev1, manager.dev2, manager.dev3):
+        logi_device.plane_name = 'P47D30'
+    g13_starter._load_new_plane_if_detected([manager.dev1, manager.dev2, manager.dev3])
+    assert manager.mock_calls == [call.dev1.unload_old_plane(), call.dev2.unload_old_plane(), call.dev1.load_new_plane(), call.dev2.load_new_plane()]
+    assert g13_starter.CLEAN_WHILE_WAIT_FOR_DATA is True
+
+
+def test_process_datagram_for_many_devices(g13_starter):
+    from unittest.mock import MagicMock
+
+    logi_devices = [MagicMock(plane_detected=False), MagicMock(plane_detected=False)]
+    g13_starter.CLEAN_BEFORE_LOAD_PLANE = True
+    g13_starter._process_datagram(logi_devices=logi_devices, dcs_bios_resp=b'\x55\x55\x55\x55')
+    for logi_device in logi_devices:
+        logi_device.restore_display.assert_called_once_with()
+    assert g13_starter.parser.stats.datagrams == 1
+    assert g13_starter.parser.stats.frames == 1
+    assert g13_starter.CLEAN_WHILE_WAIT_FOR_DATA is True
+    for logi_device in logi_devices:
+        logi_device.lock.__enter__.assert_called_once()
+        logi_device.lock.__exit__.assert_called_once()
+    g13_starter._clear_on_disconnect(logi_devices=logi_devices, exp=OSError())
+    for logi_device in logi_devices:
+        logi_device.clear.assert_called_once_with(true_clear=True)
+    assert g13_starter.CLEAN_BEFORE_LOAD_PLANE is True
+
+
 @mark.parametrize('keyboard, dcspy_starter', [
     ('keyboard_mono', 'g13_starter'), ('keyboard_color', 'g19_starter')
 ], ids=['mono', 'color'])
@@ -43,6 +77,35 @@ def test_prepare_socket(g13_starter):
     assert sock.proto == 17
     assert sock.type in (2050, 2)
     assert sock.family == 2
+    sock.close()
+
+
+def test_prepare_socket_with_options(g13_starter):
+    cfg = {'socket_rcvbuf': 65536, 'multicast_iface': '0.0.0.0', 'multicast_ttl': 2, 'multicast_loop': False}
+    with patch('dcspy.starter.get_config_yaml_item', side_effect=lambda key, default: cfg[key]):
+        sock = g13_starter._prepare_socket()
+    assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF) >= 65536
+    assert sock.getsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL) == 2
+    assert sock.getsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP) == 0
+    sock.close()
+
+
+@mark.parametrize('size, actual, warning', [
+    (0, 8192, False),
+    (65536, 131072, False),
+    (1048576, 425984, True),
+], ids=['OS default', 'accepted', 'capped'])
+def test_set_receive_buffer(size, actual, warning, g13_starter):
+    from unittest.mock import MagicMock
+
+    from dcspy import starter
+
+    sock = MagicMock()
+    sock.getsockopt.return_value = actual
+    with patch.object(starter.LOG, 'warning') as log_warning:
+        g13_starter._set_receive_buffer(sock=sock, size=size)
+    assert sock.setsockopt.called is bool(size)
+    assert log_warning.called is warning
 
 
 @mark.slow
@@ -63,3 +126,116 @@ def test_run_dcs_with_bios_data(resources):
 
     send_bios_data(data_file=resources / 'dcs_bios_data.json')
     event.set()
+
+
+def test_log_stream_stats(g13_starter):
+    from dcspy import starter
+
+    g13_starter.parser.stats.add_datagram(size=100)
+    g13_starter._stats_time = 0
+    with patch.object(starter.LOG, 'info') as log_info:
+        g13_starter._log_stream_stats()
+        g13_starter._log_stream_stats()
+    log_info.assert_called_once()
+    assert 'datagrams: 1 ' in log_info.call_args.args[0]
+
+
+def test_stats_does_not_reset_rates(g13_starter):
+    g13_starter.parser.stats.add_datagram(size=100)
+    assert g13_starter.stats.datagrams_per_sec > 0
+    assert g13_starter.stats.datagrams_per_sec > 0
+    assert g13_starter.parser.stats.snapshot().datagrams_per_sec > 0
+    assert g13_starter.stats.datagrams_per_sec == 0
+
+
+def test_poll_lcd_buttons(g13_starter):
+    from unittest.mock import MagicMock
+
+    logi_device = MagicMock()
+    logi_device.button_handle.side_effect = lambda: g13_starter.event.set() if logi_device.button_handle.call_count == 3 else None
+    g13_starter._poll_lcd_buttons(logi_device=logi_device, rate=1000)
+    assert logi_device.button_handle.call_count == 3
+
+
+def test_start_lcd_buttons_thread_without_lcd():
+    from threading import Event
+    from unittest.mock import MagicMock
+
+    from dcspy.models import G600
+    from dcspy.starter import DCSpyStarter
+
+    assert DCSpyStarter(model=G600, event=Event())._start_lcd_buttons_thread(logi_device=MagicMock(model=G600)) is None
+
+
+def test_load_new_plane_if_detected_wait_for_bios(g13_starter):
+    from unittest.mock import MagicMock
+
+    logi_device = MagicMock(plane_detected=True, plane_name='A10C')
+    g13_starter.prefetcher = MagicMock()
+    g13_starter.prefetcher.is_ready.return_value = False
+    g13_starter._load_new_plane_if_detected([logi_device])
+    g13_starter.prefetcher.is_ready.assert_called_once_with(plane='A-10C')
+    logi_device.load_new_plane.assert_not_called()
+
+    g13_starter.prefetcher.is_ready.return_value = True
+    g13_starter._load_new_plane_if_detected([logi_device])
+    logi_device.unload_old_plane.assert_called_once_with()
+    logi_device.load_new_plane.assert_called_once_with()
+    g13_starter.prefetcher.plane_loaded.assert_called_once_with(plane='A-10C')
+
+
+def test_bios_prefetcher(test_dcs_bios):
+    from dcspy.starter import BiosPrefetcher
+
+    prefetcher = BiosPrefetcher(bios_dir=test_dcs_bios)
+    prefetcher.prefetch('Ka-50', '')
+    prefetcher._futures['Ka-50'].result(timeout=10)
+    assert prefetcher.is_ready(plane='Ka-50') is True
+    assert list(prefetcher._futures) == ['Ka-50']
+
+    with patch('dcspy.starter.get_last_plane', return_value='Ka-50'), \
+            patch('dcspy.starter.save_last_plane') as save_last_plane:
+        prefetcher._plane_loaded(plane='Ka-50')
+    save_last_plane.assert_not_called()
+    assert sorted(prefetcher._futures) == ['Ka-50', 'Ka-50_3']
+    prefetcher.shutdown()
+
+
+def test_bios_prefetcher_wrong_plane(tmp_path):
+    from dcspy.starter import BiosPrefetcher
+
+    prefetcher = BiosPrefetcher(bios_dir=tmp_path)
+    prefetcher.prefetch('Wrong')
+    assert prefetcher._futures['Wrong'].result(timeout=10) is None
+    prefetcher.shutdown()
+
+
+@mark.parametrize('frame_interval, total, warning', [
+    (0.0, 5.0, False),
+    (0.033, 5.0, False),
+    (0.033, 50.0, True),
+], ids=['no frames', 'fast', 'slow'])
+def test_check_switch_time(frame_interval, total, warning, g13_starter):
+    from dcspy import starter
+    from dcspy.models import PlaneSwitchStats
+
+    g13_starter.parser.stats.frame_interval = frame_interval
+    with patch.object(starter.LOG, 'warning') as log_warning:
+        g13_starter._check_switch_time(switch_stats=PlaneSwitchStats(plane='F16C50', phases={'create': total}))
+    assert log_warning.called is warning
+
+
+def test_run_main_loop_dumps_trace(g13_starter):
+    from unittest.mock import MagicMock
+
+    from pytest import raises
+
+    from dcspy import starter
+    from dcspy.models import TraceEvent
+
+    starter.TRACE.record(TraceEvent.SET_BIOS, 'DED_LINE_1', 'INS')
+    with patch.object(g13_starter, '_handle_connection', side_effect=ValueError), \
+            patch.object(starter.LOG, 'error') as log_error, \
+            raises(ValueError):
+        g13_starter._run_main_loop(logi_devices=[], sock=MagicMock(spec=socket.socket), ver_string='')
+    assert "SET_BIOS DED_LINE_1: 'INS'" in log_error.call_args.args[1]
@@ -7,7 +7,7 @@ from packaging import version
 from pytest import mark, raises
 
 from dcspy import utils
-from dcspy.models import DEFAULT_FONT_NAME, Color, LcdMode
+from dcspy.models import DEFAULT_FONT_NAME, Color, Gkey, LcdMode, MouseButton
 
 
 def test_check_ver_can_not_check():
@@ -90,6 +90,7 @@ def test_dummy_save_load_migrate(tmpdir):
     assert d_cfg == {
         'api_ver': '3.8.1',
         'device': 'G13',
+        'extra_devices': [],
         'save_lcd': False,
         'show_gui': True,
         'autostart': False,
@@ -118,6 +119,12 @@ def test_dummy_save_load_migrate(tmpdir):
         'gkeys_float': False,
         'gui_debug': False,
         'debug_font_size': 10,
+        'lcd_buttons_debounce': 50,
+        'lcd_buttons_rate': 50,
+        'multicast_iface': '0.0.0.0',
+        'multicast_loop': True,
+        'multicast_ttl': 1,
+        'socket_rcvbuf': 0,
     }
     with open(test_tmp_yaml, 'w+') as f:
         f.write('')
@@ -334,6 +341,164 @@ def test_get_full_bios_for_plane(plane_str, roots, values, test_dcs_bios):
     assert sum(len(values) for values in model.root.values()) == values
 
 
+def test_get_full_bios_for_plane_cache(test_dcs_bios, tmp_path):
+    from os import utime
+    from shutil import copy
+
+    json_dir = tmp_path / 'doc' / 'json'
+    json_dir.mkdir(parents=True)
+    for json_file in ('AircraftAliases', 'CommonData', 'A-10C'):
+        copy(test_dcs_bios / 'doc' / 'json' / f'{json_file}.json', json_dir)
+    cache_dir = tmp_path / 'cache'
+    full_bios = utils.get_full_bios_for_plane.__wrapped__
+
+    with patch.object(utils, 'get_bios_cache_dir', return_value=cache_dir):
+        model = full_bios(plane='A-10C', bios_dir=tmp_path)
+        assert (cache_dir / 'A-10C.json').is_file()
+
+        utime(json_dir / 'A-10C.json')
+        with patch.object(utils, '_merge_json_files') as merge:
+            assert full_bios(plane='A-10C', bios_dir=tmp_path) == model
+            lazy_data = utils.get_lazy_bios_for_plane.__wrapped__(plane='A-10C', bios_dir=tmp_path)
+        merge.assert_not_called()
+        assert lazy_data.get_ctrl(ctrl_name='TACAN_MODE') == model.get_ctrl(ctrl_name='TACAN_MODE')
+        with patch.object(utils, '_file_digest') as digest:
+            assert full_bios(plane='A-10C', bios_dir=tmp_path) == model
+        digest.assert_not_called()
+        assert [cache.name for cache in cache_dir.iterdir()] == ['A-10C.json']
+
+        (json_dir / 'A-10C.json').write_text('{}')
+        assert full_bios(plane='A-10C', bios_dir=tmp_path) != model
+
+
+def test_get_lazy_bios_for_plane(test_dcs_bios):
+    from dcspy.models import Control
+
+    with patch.object(Control, 'model_validate_json', wraps=Control.model_validate_json) as validate:
+        lazy_data = utils.get_lazy_bios_for_plane.__wrapped__(plane='A-10C', bios_dir=test_dcs_bios)
+        validate.assert_not_called()
+        assert lazy_data.get_ctrl(ctrl_name='TACAN_MODE').output.max_value == 4
+    validate.assert_called_once()
+
+
+def test_get_address_index_for_plane(test_dcs_bios):
+    index = utils.get_address_index_for_plane(plane='Ka-50', bios_dir=test_dcs_bios)
+    assert index is utils.get_address_index_for_plane(plane='Ka-50', bios_dir=test_dcs_bios)
+    assert len(index) >= len(utils.get_full_bios_for_plane(plane='Ka-50', bios_dir=test_dcs_bios).ctrl_index)
+
+
+def test_timed():
+    phases = {}
+    with utils.timed(phases, 'first'):
+        pass
+    with raises(ValueError), utils.timed(phases, 'second'):
+        raise ValueError('test')
+    assert list(phases) == ['first', 'second']
+    assert all(duration >= 0 for duration in phases.values())
+
+
+def test_versioned_bios_cache(tmp_path):
+    from os import utime
+
+    json_dir = tmp_path / 'doc' / 'json'
+    json_dir.mkdir(parents=True)
+    (json_dir / 'AircraftAliases.json').write_text('{"A": ["A"], "B": ["B"], "C": ["C"]}')
+    (json_dir / 'A.json').write_text('{}')
+    calls = []
+    cache = utils.VersionedBiosCache(maxsize=2, ttl=0)
+
+    @cache
+    def _load(plane: str, bios_dir: Path) -> str:
+        calls.append(plane)
+        return f'{plane}:{len(calls)}'
+
+    assert _load('A', bios_dir=tmp_path) == 'A:1'
+    assert _load(plane='A', bios_dir=tmp_path) == 'A:1'
+    assert cache.stats.hits == 1
+
+    utime(json_dir / 'A.json', ns=(1, 1))
+    assert _load(plane='A', bios_dir=tmp_path) == 'A:2'
+    (json_dir / 'B.json').write_text('{}')
+    assert _load(plane='A', bios_dir=tmp_path) == 'A:2'
+    (json_dir / 'AircraftAliases.json').write_text('{"A": ["A"], "B": ["B"], "C": ["C", "A"]}')
+    assert _load(plane='A', bios_dir=tmp_path) == 'A:3'
+    assert cache.stats.stale == 2
+
+    _load(plane='B', bios_dir=tmp_path)
+    _load(plane='C', bios_dir=tmp_path)
+    assert _load(plane='A', bios_dir=tmp_path) == 'A:6'
+    assert cache.stats.evictions == 2
+
+    cache.invalidate(bios_dir=tmp_path / 'other')
+    assert cache.stats.size == 2
+    cache.invalidate(bios_dir=tmp_path, plane='C')
+    assert cache.stats.size == 1
+    _load.cache_clear()
+    assert cache.stats.size == 0
+    assert str(cache.stats) == 'hits: 2 misses: 6 stale: 2 evictions: 2 size: 0/2'
+
+
+def test_versioned_bios_cache_fingerprint_ttl(tmp_path):
+    json_dir = tmp_path / 'doc' / 'json'
+    json_dir.mkdir(parents=True)
+    (json_dir / 'AircraftAliases.json').write_text('{"A": ["A"]}')
+    (json_dir / 'A.json').write_text('{}')
+    cache = utils.VersionedBiosCache(maxsize=2, ttl=60)
+
+    @cache
+    def _load(plane: str, bios_dir: Path) -> int:
+        return len((json_dir / 'A.json').read_text())
+
+    assert _load(plane='A', bios_dir=tmp_path) == 2
+    with patch.object(utils, 'get_bios_fingerprint') as fingerprint:
+        assert _load(plane='A', bios_dir=tmp_path) == 2
+    fingerprint.assert_not_called()
+
+    (json_dir / 'A.json').write_text('{ }')
+    assert _load(plane='A', bios_dir=tmp_path) == 2
+    cache.invalidate(bios_dir=tmp_path, plane='B')
+    assert _load(plane='A', bios_dir=tmp_path) == 3
+    assert cache.stats.hits == 2
+    assert cache.stats.stale == 1
+
+
+def test_get_bios_fingerprint(test_dcs_bios, tmp_path):
+    fingerprint = utils.get_bios_fingerprint(bios_dir=test_dcs_bios)
+    assert [name for name, _, _ in fingerprint] == ['AircraftAliases.json']
+    assert fingerprint == utils.get_bios_fingerprint(bios_dir=test_dcs_bios)
+    plane_fingerprint = utils.get_bios_fingerprint(bios_dir=test_dcs_bios, plane='A-10C')
+    assert [name for name, _, _ in plane_fingerprint] == ['AircraftAliases.json', 'CommonData.json', 'A-10C.json']
+    assert utils.get_bios_fingerprint(bios_dir=tmp_path) == ()
+
+
+def test_merge_json_files(tmp_path):
+    import json
+
+    json_files = []
+    for idx, sections in enumerate(({'A': 1, 'B': 1}, {'B': 2}, {'C': 3, 'A': 3})):
+        json_files.append(tmp_path / f'{idx}.json')
+        json_files[-1].write_text(json.dumps(sections))
+    assert utils._merge_json_files(json_files=json_files) == {'A': 3, 'B': 2, 'C': 3}
+    assert utils._merge_json_files(json_files=json_files[1:2]) == {'B': 2}
+    assert utils._merge_json_files(json_files=[]) == {}
+
+
+def test_load_bios_cache_broken_file(tmp_path):
+    import json
+
+    from dcspy.models import __version__
+
+    cache_file = tmp_path / 'A-10C.json'
+    cache_file.write_text('not a json')
+    assert utils._load_bios_cache(cache_file=cache_file, sources=[]) is None
+    assert utils._load_bios_cache(cache_file=tmp_path / 'missing.json', sources=[]) is None
+    for bios in ({'Section': {'CTRL': {'not': 'string'}}}, {'Section': ['CTRL']}, ['Section']):
+        cache_file.write_text(json.dumps({'version': __version__, 'sources': {}, 'bios': bios}))
+        assert utils._load_bios_cache(cache_file=cache_file, sources=[]) is None
+    cache_file.write_text(json.dumps({'version': __version__, 'sources': {}, 'bios': {'Section': {'CTRL': '{}'}}}))
+    assert utils._load_bios_cache(cache_file=cache_file, sources=[]) == {'Section': {'CTRL': '{}'}}
+
+
 def test_get_inputs_for_plane(test_dcs_bios):
     from dcspy.models import CTRL_LIST_SEPARATOR, ControlKeyData
     bios = utils.get_inputs_for_plane(plane='A-10C', bios_dir=test_dcs_bios)
@@ -436,6 +601,23 @@ def test_get_config_yaml_location():
     assert utils.get_config_yaml_location() == Path(environ.get('LOCALAPPDATA', '')) / 'dcspy'
 
 
+def test_get_cache_location(tmp_path):
+    with patch.dict(environ, {'LOCALAPPDATA': str(tmp_path)}):
+        assert utils.get_cache_location() == tmp_path / 'dcspy'
+    with patch.dict(environ, {'LOCALAPPDATA': '', 'XDG_CACHE_HOME': str(tmp_path / 'cache')}):
+        assert utils.get_cache_location() == tmp_path / 'cache' / 'dcspy'
+    with patch.dict(environ, {'LOCALAPPDATA': '', 'XDG_CACHE_HOME': ''}):
+        assert utils.get_cache_location() == Path.home() / '.cache' / 'dcspy'
+
+
+def test_last_plane(tmp_path):
+    with patch.object(utils, 'get_cache_location', return_value=tmp_path / 'dcspy'):
+        assert utils.get_last_plane() == ''
+        utils.save_last_plane(plane='F-16C_50')
+        assert utils.get_last_plane() == 'F-16C_50'
+        assert (tmp_path / 'dcspy' / 'last_plane').read_text() == 'F-16C_50'
+
+
 def test_replace_symbols():
     assert utils.replace_symbols('1q2w3e', (('1', '4'), ('w', 'W'))) == '4q2W3e'
 
@@ -467,9 +649,74 @@ def test_key_request_update_bios_data_and_set_req(test_config_yaml):
     key_req = utils.KeyRequest(yaml_path=test_config_yaml.parent / 'F-16C_50.yaml', get_bios_fn=get_bios_fn)
     key = utils.get_key_instance('G3_M1')
     req = 'MASTER_ARM_SW 1'
-    assert key_req.cycle_button_ctrl_name == {'IFF_MASTER_KNB': 0}
+    assert key_req.cycles.ctrl_names == ['IFF_MASTER_KNB']
     key_req.set_request(key, req)
     assert key_req.get_request(key).raw_request == req
+    assert key_req.get_command(key).requests(key_down=1) == (b'MASTER_ARM_SW 1\n',)
+    assert key_req.get_command_by_code(key.code).requests(key_down=1) == (b'MASTER_ARM_SW 1\n',)
+
+
+def test_key_request_commands(test_config_yaml):
+    key_req = utils.KeyRequest(yaml_path=test_config_yaml.parent / 'F-16C_50.yaml', get_bios_fn=int)
+    assert key_req.commands.keys() == key_req.buttons.keys()
+    assert key_req.get_command(utils.get_key_instance('G1_M1')).requests(key_down=1) == (b'ICP_COM1_BTN 1\n',)
+    assert key_req.get_command(utils.get_key_instance('G30_M3')).requests(key_down=1) == (b'\n',)
+    assert key_req.get_command(utils.get_key_instance('G30_M3')).requests(key_down=0) == ()
+
+    for key, command in key_req.commands.items():
+        assert key_req.get_command_by_code(key.code) is command
+    assert key_req.get_command_by_code(-1).requests(key_down=1) == (b'\n',)
+    assert key_req.get_command_by_code(10_000).requests(key_down=1) == (b'\n',)
+    for code in (Gkey.code_of(key=31, mode=1), Gkey.code_of(key=2, mode=0), MouseButton.code_of(button=21), MouseButton.code_of(button=22)):
+        assert key_req.get_command_by_code(code).requests(key_down=1) == (b'\n',)
+
+    key = utils.get_key_instance('G3_M1')
+    command = key_req.get_command(key)
+    key_req.set_request(key, key_req.get_request(key).raw_request)
+    assert key_req.get_command(key) is command
+
+
+def test_yaml_cache_key_bindings(tmp_path):
+    from os import utime
+
+    plane_yaml = tmp_path / 'plane.yaml'
+    plane_yaml.write_text('G1_M1: COM1 CYCLE 1 3\nG2_M1: COM2 1\nG3_M1: COM3 PUSH_BUTTON\nG4_M1:\n')
+    with patch.object(utils, 'load_yaml', wraps=utils.load_yaml) as load_yaml:
+        first = utils.KeyRequest(yaml_path=plane_yaml, get_bios_fn=lambda _: 1)
+        second = utils.KeyRequest(yaml_path=plane_yaml, get_bios_fn=lambda _: 2)
+        load_yaml.assert_called_once_with(full_path=plane_yaml)
+    bindings = utils.yaml_cache.bindings(yaml_path=plane_yaml)
+    assert list(bindings) == ['G1_M1', 'G2_M1', 'G3_M1']
+    assert first.get_command(utils.get_key_instance('G2_M1')) is second.get_command(utils.get_key_instance('G2_M1'))
+    assert first.get_command(utils.get_key_instance('G1_M1')).requests(key_down=1) == (b'COM1 2\n',)
+    assert second.get_command(utils.get_key_instance('G1_M1')).requests(key_down=1) == (b'COM1 3\n',)
+
+    first.set_request(utils.get_key_instance('G2_M1'), 'COM2 0')
+    assert second.get_request(utils.get_key_instance('G2_M1')).raw_request == 'COM2 1'
+    assert bindings['G2_M1'].model.raw_request == 'COM2 1'
+
+    plane_yaml.write_text('G1_M1: COM1 CYCLE 1 3\nG2_M1: COM2 2\n')
+    utime(plane_yaml, ns=(1, 1))
+    changed = utils.yaml_cache.bindings(yaml_path=plane_yaml)
+    assert changed['G1_M1'] is bindings['G1_M1']
+    assert changed['G2_M1'] is not bindings['G2_M1']
+    assert changed.keys() == {'G1_M1', 'G2_M1'}
+    assert utils.KeyRequest(yaml_path=plane_yaml, get_bios_fn=int).get_command(utils.get_key_instance('G2_M1')).requests(key_down=1) == (b'COM2 2\n',)
+
+
+def test_yaml_cache_load_and_save(tmp_path):
+    plane_yaml = tmp_path / 'plane.yaml'
+    with patch.object(utils, 'load_yaml', wraps=utils.load_yaml) as load_yaml:
+        utils.yaml_cache.save(data={'G1_M1': 'COM1 1'}, full_path=plane_yaml)
+        data = utils.yaml_cache.load(full_path=plane_yaml)
+        data['G2_M1'] = 'COM2 1'
+        assert utils.yaml_cache.load(full_path=plane_yaml) == {'G1_M1': 'COM1 1'}
+        load_yaml.assert_not_called()
+
+        utils.yaml_cache.invalidate(full_path=plane_yaml)
+        assert utils.yaml_cache.load(full_path=plane_yaml) == {'G1_M1': 'COM1 1'}
+        load_yaml.assert_called_once_with(full_path=plane_yaml)
+    assert utils.yaml_cache.bindings(yaml_path=tmp_path / 'missing' / 'plane.yaml') == {}
 
 
 @mark.slow
@@ -0,0 +1,127 @@
+import struct
+import sys
+from os import utime
+from shutil import copytree
+from threading import Event
+from unittest.mock import patch
+
+from pytest import fixture, mark
+
+from dcspy import watcher
+
+
+@fixture()
+def bios_copy(test_dcs_bios, tmp_path):
+    """
+    Copy of DCS-BIOS JSON files which can be modified.
+
+    :return: Path to DCS-BIOS
+    """
+    copytree(test_dcs_bios / 'doc' / 'json', tmp_path / 'DCS-BIOS' / 'doc' / 'json')
+    return tmp_path / 'DCS-BIOS'
+
+
+def test_parse_inotify_events():
+    buffer = struct.pack('iIII', 1, watcher.IN_CLOSE_WRITE, 0, 16) + b'A-10C.json'.ljust(16, b'\0')
+    buffer += struct.pack('iIII', 1, watcher.IN_DELETE, 0, 0)
+    assert watcher.InotifyBackend.parse_events(buffer) == ['A-10C.json', '']
+
+
+@mark.parametrize('changed, planes', [
+    ({'A-10C.json'}, {'A-10C', 'A-10C_2'}),
+    ({'F-16C_50.json', 'NotUsed.json'}, {'F-16C_50'}),
+    ({'NotUsed.json'}, set()),
+], ids=['A-10C', 'F-16C_50', 'not used'])
+def test_affected_planes(changed, planes, test_dcs_bios):
+    assert watcher.affected_planes(bios_dir=test_dcs_bios, changed_files=changed) == planes
+
+
+@mark.parametrize('changed', ['CommonData.json', 'AircraftAliases.json'])
+def test_affected_planes_all(changed, test_dcs_bios):
+    assert len(watcher.affected_planes(bios_dir=test_dcs_bios, changed_files={changed})) == 16
+
+
+def test_affected_planes_no_bios(tmp_path):
+    assert watcher.affected_planes(bios_dir=tmp_path, changed_files={'A-10C.json'}) == set()
+
+
+def test_polling_backend(bios_copy):
+    json_dir = bios_copy / 'doc' / 'json'
+    backend = watcher.PollingBackend(json_dir=json_dir, stop_event=Event())
+    assert backend.wait(timeout=0) == set()
+    utime(json_dir / 'A-10C.json', ns=(1, 1))
+    (json_dir / 'New.json').write_text('{}')
+    (json_dir / 'Ka-50.json').unlink()
+    assert backend.wait(timeout=0) == {'A-10C.json', 'New.json', 'Ka-50.json'}
+    assert backend.wait(timeout=0) == set()
+    backend.close()
+
+
+@mark.skipif(condition=not sys.platform.startswith('linux'), reason='Inotify only on Linux')
+def test_inotify_backend(bios_copy):
+    json_dir = bios_copy / 'doc' / 'json'
+    backend = watcher.InotifyBackend(json_dir=json_dir)
+    assert backend.wait(timeout=0) == set()
+    (json_dir / 'A-10C.json').write_text('{}')
+    (json_dir / 'notes.txt').write_text('')
+    assert backend.wait(timeout=1) == {'A-10C.json'}
+    backend.close()
+
+
+def test_inotify_backend_no_directory(tmp_path):
+    with patch.object(watcher.sys, 'platform', 'linux'):
+        bios_watcher = watcher.BiosWatcher(bios_dir=tmp_path, callback=print)
+        assert isinstance(bios_watcher._get_backend(), watcher.PollingBackend)
+
+
+@mark.parametrize('platform', ['win32', 'darwin'])
+def test_polling_backend_not_on_linux(platform, bios_copy):
+    with patch.object(watcher.sys, 'platform', platform), patch.object(watcher, 'InotifyBackend') as inotify:
+        bios_watcher = watcher.BiosWatcher(bios_dir=bios_copy, callback=print)
+        assert isinstance(bios_watcher._get_backend(), watcher.PollingBackend)
+    inotify.assert_not_called()
+
+
+def test_bios_watcher_rebuild(bios_copy):
+    from dcspy.utils import get_bios_cache_dir, get_full_bios_for_plane
+
+    get_full_bios_for_plane(plane='F-16C_50', bios_dir=bios_copy)
+    cache_file = get_bios_cache_dir() / 'F-16C_50.json'
+    utime(bios_copy / 'doc' / 'json' / 'F-16C_50.json', ns=(1, 1))
+    callback = []
+    bios_watcher = watcher.BiosWatcher(bios_dir=bios_copy, callback=callback.append)
+
+    with patch.object(watcher, 'get_full_bios_for_plane', wraps=get_full_bios_for_plane) as full_bios:
+        assert bios_watcher.rebuild(changed_files={'F-16C_50.json'}) == {'F-16C_50'}
+        full_bios.assert_called_once_with(plane='F-16C_50', bios_dir=bios_copy)
+    assert cache_file.is_file()
+    assert callback == [{'F-16C_50'}]
+
+
+def test_bios_watcher_rebuild_not_used(bios_copy):
+    callback = []
+    bios_watcher = watcher.BiosWatcher(bios_dir=bios_copy, callback=callback.append)
+    assert bios_watcher.rebuild(changed_files={'NotUsed.json'}) == set()
+    assert callback == []
+
+
+@mark.parametrize('polling', [True, False], ids=['polling', 'inotify'])
+def test_bios_watcher_thread(polling, bios_copy):
+    changed = Event()
+    planes = []
+
+    def _callback(affected: set[str]) -> None:
+        planes.append(affected)
+        changed.set()
+
+    bios_watcher = watcher.BiosWatcher(bios_dir=bios_copy, callback=_callback, interval=0.05, polling=polling)
+    with patch.object(watcher, 'BIOS_WATCHER_SETTLE', 0.05):
+        bios_watcher.start()
+        for _ in range(50):
+            (bios_copy / 'doc' / 'json' / 'F-15E.json').write_text('{}')
+            if changed.wait(timeout=0.1):
+                break
+        bios_watcher.stop()
+        bios_watcher.join(timeout=5)
+    assert not bios_watcher.is_alive()
+    assert planes[0] == {'F-15ESE'}